@@ -9,6 +9,10 @@ ALGORITHM = os.getenv("ALGORITHM", "HS256")
 RESET_PASSWORD_SECRET_KEY = os.getenv("BACKEND_API_RESET_SECRET", "super-secret-key")
 RESET_TOKEN_EXPIRE_MINUTES = os.getenv("TOKEN_RESET_EXPIRY", 15)
 RESET_TOKEN_LINK = os.getenv("RESET_TOKEN_LINK")
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", 2))
+PASSWORD_HASH_CONCURRENCY = int(os.getenv("PASSWORD_HASH_CONCURRENCY", 4))
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", 60))
+PRINCIPAL_CACHE_MAX_ENTRIES = int(os.getenv("PRINCIPAL_CACHE_MAX_ENTRIES", 1024))
 
 
 ROLE_HIERARCHY = {
@@ -4,6 +4,7 @@ from jose import jwt, JWTError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.config import SECRET_KEY, ALGORITHM, ROLE_HIERARCHY
+from app.auth.principal_cache import principal_cache
 from app.database.database import get_db
 from app.models.user import User
 from app.services.users import SqliteUsersService
@@ -27,9 +28,13 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
 
-    user = await SqliteUsersService().get_user_by_name(username, db)
+    cache_key = (username, payload.get("iat"))
+    user = principal_cache.get(cache_key)
     if user is None:
-        raise credentials_exception
+        user = await SqliteUsersService().get_user_by_name(username, db)
+        if user is None:
+            raise credentials_exception
+        principal_cache.set(cache_key, user)
 
     if user.role != role:
         raise credentials_exception
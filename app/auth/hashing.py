@@ -0,0 +1,93 @@
+import asyncio
+import time
+from typing import Optional
+
+from passlib.context import CryptContext
+
+from app.auth.config import PASSWORD_HASH_CONCURRENCY, PASSWORD_HASH_WORKERS
+from app.services.utility.workers import SpawnedProcessPool
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def _verify(plain_password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+class PasswordHasher(SpawnedProcessPool):
+    """
+    Runs bcrypt hashing and verification in a dedicated process pool.
+
+    Each bcrypt round costs ~200 ms of CPU, so running it inline in an ``async def`` handler stalls every other
+    request on the worker. Calls are capped at ``concurrency`` in flight; callers beyond that wait in a queue whose
+    depth is reported by :meth:`stats`.
+    """
+
+    def __init__(self, workers: int = PASSWORD_HASH_WORKERS, concurrency: int = PASSWORD_HASH_CONCURRENCY):
+        super().__init__(workers)
+        self.concurrency = concurrency
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.in_flight = 0
+        self.queued = 0
+        self.max_queued = 0
+        self.completed = 0
+        self.total_wait_seconds = 0.0
+        self.total_run_seconds = 0.0
+
+    async def hash(self, password: str) -> str:
+        return await self._submit(_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._submit(_verify, plain_password, hashed_password)
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "concurrency": self.concurrency,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "max_queued": self.max_queued,
+            "completed": self.completed,
+            "avg_wait_ms": self._average(self.total_wait_seconds),
+            "avg_run_ms": self._average(self.total_run_seconds),
+        }
+
+    async def _submit(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        semaphore = self._get_semaphore(loop)
+
+        queued_at = time.perf_counter()
+        self.queued += 1
+        self.max_queued = max(self.max_queued, self.queued)
+        try:
+            await semaphore.acquire()
+        finally:
+            self.queued -= 1
+
+        started_at = time.perf_counter()
+        self.total_wait_seconds += started_at - queued_at
+        self.in_flight += 1
+        try:
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            self.in_flight -= 1
+            self.completed += 1
+            self.total_run_seconds += time.perf_counter() - started_at
+            semaphore.release()
+
+    def _get_semaphore(self, loop: asyncio.AbstractEventLoop) -> asyncio.Semaphore:
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self._loop = loop
+        return self._semaphore
+
+    def _average(self, total_seconds: float) -> float:
+        return round(total_seconds * 1000 / self.completed, 3) if self.completed else 0.0
+
+
+password_hasher = PasswordHasher()
@@ -0,0 +1,68 @@
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from app.auth.config import PRINCIPAL_CACHE_MAX_ENTRIES, PRINCIPAL_CACHE_TTL_SECONDS
+from app.models.user import User
+
+PrincipalKey = Tuple[str, Optional[int]]
+
+
+class PrincipalCache:
+    """
+    In-process TTL/LRU cache of authenticated users keyed by the token's ``(sub, iat)``.
+
+    Entries are dropped on user update, delete and password change via :meth:`invalidate`. Invalidation only
+    reaches the current worker process, so the TTL bounds how stale another worker's entry can get.
+    """
+
+    def __init__(self, max_entries: int = PRINCIPAL_CACHE_MAX_ENTRIES, ttl_seconds: float = PRINCIPAL_CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[PrincipalKey, Tuple[float, User]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, key: PrincipalKey) -> Optional[User]:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: PrincipalKey, user: User) -> None:
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, user)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, username: str) -> None:
+        """Drop every cached token for ``username``."""
+        for key in [key for key in self._entries if key[0] == username]:
+            del self._entries[key]
+        self.invalidations += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+        }
+
+
+principal_cache = PrincipalCache()
@@ -1,9 +1,25 @@
+import os
 from functools import lru_cache
+from typing import Literal
 
+from pydantic import Field
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     uploads_directory: str = "uploads"
+    result_archive_cache_bytes: int = 2 * 1024 ** 3
+    upload_session_ttl_seconds: int = 24 * 60 * 60
+    frame_cache_bytes: int = 64 * 1024 ** 2
+    thumbnail_count: int = 8
+    thumbnail_width: int = 320
+    # what to do when an upload looks like a video already in the catalog: nothing, mark it, or refuse it
+    duplicate_policy: Literal["off", "flag", "reject"] = "flag"
+    duplicate_max_distance: float = 8.0
+    # hand video downloads to a front proxy after authorization: nginx X-Accel-Redirect or Apache/lighttpd X-Sendfile
+    download_offload: Literal["off", "x-accel-redirect", "x-sendfile"] = "off"
+    # internal nginx location aliased to the uploads directory
+    download_offload_prefix: str = "/protected-uploads"
+    analysis_workers: int = Field(default_factory=lambda: os.cpu_count() or 1)
 
 
 @lru_cache
@@ -27,4 +27,9 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
     async with Session() as session:
         yield session
 
+
+def get_sessionmaker() -> async_sessionmaker:
+    """Session factory for background work that outlives the request's own session."""
+    return Session
+
 SessionDep = Annotated[AsyncSession, Depends(get_db)]
\ No newline at end of file
@@ -0,0 +1,130 @@
+from datetime import datetime
+from typing import Callable, List, Optional, Tuple
+
+from sqlalchemy import String, bindparam, inspect, insert, null, select, text, type_coerce
+from sqlalchemy.engine import Connection
+
+from app.database.database import Base
+from app.database.tables.changes import ChangeLogEntry
+from app.database.tables.encoders import Encoders
+from app.database.tables.experiments import Experiment
+from app.database.tables.network import Network
+from app.database.tables.results import ExperimentResult
+from app.database.tables.schema_migrations import SchemaMigration
+from app.database.tables.videos import InputVideo
+from app.database.timestamps import UTCDateTime, utcnow
+
+# how InputVideo.createdDate was formatted before it was a timestamp
+LEGACY_VIDEO_DATE_FORMAT = "%m/%d/%Y, %H:%M:%S"
+CREATED_COLUMNS = ("created_at", "createdDate")
+UPDATED_COLUMNS = ("updated_at", "updatedDate")
+
+
+def sync_schema(connection: Connection) -> None:
+    """
+    Create missing tables and add any columns and indexes introduced after a table was first created, then apply
+    any data migrations this database has not had yet.
+
+    ``create_all`` leaves existing tables untouched, so columns and indexes added to a model later would otherwise
+    be missing from deployed databases. New columns are always added as nullable.
+    """
+    Base.metadata.create_all(connection)
+
+    inspector = inspect(connection)
+    preparer = connection.dialect.identifier_preparer
+    for table in Base.metadata.sorted_tables:
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            column_type = column.type.compile(dialect=connection.dialect)
+            connection.execute(text(f"ALTER TABLE {preparer.format_table(table)} "
+                                    f"ADD COLUMN {preparer.format_column(column)} {column_type}"))
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
+
+    apply_migrations(connection)
+
+
+def apply_migrations(connection: Connection) -> None:
+    """Run each migration in ``MIGRATIONS`` that is not yet recorded in ``schema_migrations``, in order."""
+    applied = set(connection.execute(select(SchemaMigration.name)).scalars())
+    for name, migrate in MIGRATIONS:
+        if name not in applied:
+            migrate(connection)
+            connection.execute(insert(SchemaMigration).values(name=name, applied_at=utcnow()))
+
+
+def backfill_timestamps(connection: Connection) -> None:
+    """
+    Rewrite every timestamp column in the canonical UTC form ``UTCDateTime`` reads, and start ``updated_at`` from
+    ``created_at`` where it has never been set.
+
+    Timestamps used to be written with ``datetime.now()``: as text in ``str(datetime)`` form for experiments, as
+    ``MM/DD/YYYY, HH:MM:SS`` text for videos and as naive datetimes elsewhere, all in the server's local time. Values
+    that cannot be parsed are cleared. On SQLite the old text columns hold the new values as they are; other
+    databases would also need the column types altered.
+    """
+    for table in Base.metadata.sorted_tables:
+        columns = [column for column in table.columns if isinstance(column.type, UTCDateTime)]
+        if not columns or table.name == SchemaMigration.__tablename__:
+            continue
+        primary_key, = table.primary_key.columns
+        created = next((column.name for column in columns if column.name in CREATED_COLUMNS), None)
+        updated = next((column.name for column in columns if column.name in UPDATED_COLUMNS), None)
+
+        rows = connection.execute(select(primary_key.label("pk"),
+                                         *(type_coerce(column, String).label(column.name) for column in columns)))
+        changes = []
+        for row in rows.mappings():
+            values = {column.name: _parse_legacy(row[column.name]) for column in columns}
+            if updated is not None and values[updated] is None and created is not None:
+                values[updated] = values[created]
+            if any(value is not None or row[name] is not None for name, value in values.items()):
+                changes.append({"pk_": row["pk"], **values})
+        if changes:
+            # every timestamp is in the SET clause, so none of them is replaced by its onupdate default
+            connection.execute(table.update().where(primary_key == bindparam("pk_")), changes)
+
+
+def seed_change_log(connection: Connection) -> None:
+    """
+    Log every entity that existed before the change log as inserted, so that reading the log from the start lists
+    everything and clients can build their copy from it alone.
+    """
+    now = utcnow()
+    sources = {
+        "experiment": select(Experiment.id, Experiment.owner_id),
+        "video": select(InputVideo.id, null()),
+        "network": select(Network.network_profile_id, null()),
+        "encoder": select(Encoders.id, null()),
+        "result": select(ExperimentResult.id, Experiment.owner_id).join(ExperimentResult.experiment),
+    }
+    for entity, query in sources.items():
+        rows = connection.execute(query.order_by(query.selected_columns[0])).all()
+        if rows:
+            connection.execute(insert(ChangeLogEntry), [
+                {"entity": entity, "entity_id": str(key), "operation": "insert", "owner_id": owner_id,
+                 "changed_at": now} for key, owner_id in rows])
+
+
+def _parse_legacy(value: Optional[str]) -> Optional[datetime]:
+    """A stored timestamp in any of the forms it was once written in, as an aware datetime; naive ones are local."""
+    if value is None:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        try:
+            parsed = datetime.strptime(value, LEGACY_VIDEO_DATE_FORMAT)
+        except ValueError:
+            return None
+    # astimezone() takes a naive datetime to be in the server's local time
+    return parsed.astimezone()
+
+
+# data migrations in the order they are applied; names are recorded, so never rename or reorder existing entries
+MIGRATIONS: List[Tuple[str, Callable[[Connection], None]]] = [
+    ("0001_utc_timestamps", backfill_timestamps),
+    ("0002_seed_change_log", seed_change_log),
+]
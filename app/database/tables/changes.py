@@ -0,0 +1,32 @@
+from sqlalchemy import Column, Index, Integer, String
+
+from app.database.database import Base
+from app.database.timestamps import UTCDateTime, utcnow
+
+
+class ChangeLogEntry(Base):
+    """
+    The latest insert, update or delete of an entity, in commit order, for clients that mirror lists incrementally.
+
+    Each entity has at most one entry: a new change replaces the previous one under a higher id, so the log grows
+    with the number of entities rather than the number of writes.
+
+    :id: Position in the log; ids are never reused, so a client's cursor stays valid as entries are replaced
+    :entity: Kind of entity: experiment, video, network, encoder or result
+    :entity_id: ID of the entity
+    :operation: insert, update or delete
+    :owner_id: Owner of the experiment the entity belongs to, for experiments and results
+    :changed_at: When the change was made
+    """
+    __tablename__ = "change_log"
+    __table_args__ = (
+        Index("ix_change_log_entity_entity_id", "entity", "entity_id", unique=True),
+        {"sqlite_autoincrement": True},
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    entity = Column(String, nullable=False)
+    entity_id = Column(String, nullable=False)
+    operation = Column(String, nullable=False)
+    owner_id = Column(Integer, index=True)
+    changed_at = Column(UTCDateTime, nullable=False, default=utcnow)
@@ -1,9 +1,10 @@
 from sqlalchemy import Column, Integer, String, Boolean
 
 from app.database.database import Base
+from app.database.timestamps import Timestamps
 
 
-class Encoders(Base):
+class Encoders(Timestamps, Base):
     __tablename__ = "encoders"
 
     id = Column(String, primary_key=True, index=True)
@@ -1,18 +1,25 @@
-from sqlalchemy import Column, Integer, String, JSON, Enum, ForeignKey
+from sqlalchemy import Column, Integer, String, JSON, Enum, ForeignKey, Index
 from sqlalchemy.orm import relationship
 
 from app.database.database import Base
+from app.database.timestamps import Timestamps, UTCDateTime, utcnow
 from app.models.experiment import ExperimentStatus
 
 
-class ExperimentSequence(Base):
+class ExperimentSequence(Timestamps, Base):
     """
     Individual sets/sequences of an experiment
     """
     __tablename__ = "experiment_sequences"
+    # network filters look up experiments by profile; the experiment id is in the index so no row is read
+    __table_args__ = (
+        Index("ix_experiment_sequences_topology_experiment", "network_topology_id", "parent_experiment_id"),
+        Index("ix_experiment_sequences_disruption_experiment", "network_disruption_profile_id",
+              "parent_experiment_id"),
+    )
 
     sequence_id = Column(Integer, primary_key=True, autoincrement=True)
-    parent_experiment_id = Column(Integer, ForeignKey('experiments.id'))
+    parent_experiment_id = Column(Integer, ForeignKey('experiments.id'), index=True)
     network_topology_id = Column(Integer, ForeignKey('network.network_profile_id'))
     network_disruption_profile_id = Column(Integer, ForeignKey('network.network_profile_id'))
     encoding_parameters = Column(JSON)
@@ -22,18 +29,25 @@ class ExperimentSequence(Base):
     experiment = relationship("Experiment", back_populates="sequences")
 
 
-class Experiment(Base):
+class Experiment(Timestamps, Base):
     """
     Experiment details
     """
     __tablename__ = "experiments"
+    # each filterable column is indexed together with the id, which keyset pagination orders and resumes by
+    __table_args__ = (
+        Index("ix_experiments_status_id", "status", "id"),
+        Index("ix_experiments_owner_id_id", "owner_id", "id"),
+        Index("ix_experiments_created_at_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     experiment_name = Column(String(50), unique=True, nullable=False, index=True)
     description = Column(String(250), nullable=False)
     owner_id = Column(Integer, ForeignKey('user.id'))
     status = Column(Enum(ExperimentStatus))
-    created_at = Column(String(250))
+    # indexed by ix_experiments_created_at_id rather than on its own
+    created_at = Column(UTCDateTime, default=utcnow)
 
     result_files = relationship("ExperimentResult", back_populates="experiment", cascade="all, delete-orphan", lazy="selectin")
     sequences = relationship("ExperimentSequence", back_populates="experiment")
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, ForeignKey, Integer, String
+
+from app.database.database import Base
+
+
+class FingerprintBand(Base):
+    """
+    One 16-bit band of a video's perceptual fingerprint, indexed so near-duplicates are found by equality lookups.
+
+    :id: Unique identifier
+    :video_id: Video the fingerprint belongs to
+    :key: The band's position in the fingerprint in the high bits and its value in the low 16 bits
+    """
+    __tablename__ = "video_fingerprint_bands"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    video_id = Column(String, ForeignKey("input_videos.id"), nullable=False, index=True)
+    key = Column(Integer, nullable=False, index=True)
@@ -0,0 +1,33 @@
+from sqlalchemy import Column, ForeignKey, Integer, JSON, String
+
+from app.database.database import Base
+from app.database.timestamps import Timestamps
+
+
+class FrameManifest(Timestamps, Base):
+    """
+    Per-frame MD5 checksums of a stored video or result video, for bit-exactness checks without rereading files.
+
+    :id: Unique identifier
+    :video_id: Input video the manifest describes, if it describes a video
+    :result_id: Experiment result file the manifest describes, if it describes a result
+    :width: Frame width the file was read with
+    :height: Frame height the file was read with
+    :chroma_format: Chroma subsampling the file was read with: 420, 422, 444 or mono
+    :bit_depth: Sample bit depth the file was read with
+    :frame_count: Number of frames
+    :md5: Hex MD5 of each frame's pixel data, in frame order
+    :created_at: When the manifest was computed
+    :updated_at: When the row was last changed
+    """
+    __tablename__ = "frame_manifests"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    video_id = Column(String, ForeignKey("input_videos.id"), index=True)
+    result_id = Column(Integer, ForeignKey("experiment_results.id"), index=True)
+    width = Column(Integer, nullable=False)
+    height = Column(Integer, nullable=False)
+    chroma_format = Column(String, nullable=False)
+    bit_depth = Column(Integer, nullable=False)
+    frame_count = Column(Integer, nullable=False)
+    md5 = Column(JSON, nullable=False)
@@ -2,9 +2,10 @@ from sqlalchemy import Column, Integer, String
 from sqlalchemy.orm import relationship
 
 from app.database.database import Base
+from app.database.timestamps import Timestamps
 
 
-class Network(Base):
+class Network(Timestamps, Base):
     __tablename__ = "network"
 
     network_profile_id = Column(Integer, primary_key=True, index=True, autoincrement=True)
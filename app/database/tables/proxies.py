@@ -0,0 +1,35 @@
+from sqlalchemy import Column, ForeignKey, Integer, String
+
+from app.database.database import Base
+from app.database.timestamps import Timestamps
+
+
+class ProxyJob(Timestamps, Base):
+    """
+    Background generation of a downscaled proxy of a stored video.
+
+    :id: Unique identifier
+    :video_id: Video the proxy is generated from
+    :scale: How many times smaller than the source the proxy is in each dimension
+    :bit_depth: Sample bit depth of the proxy
+    :status: PENDING, RUNNING, COMPLETE or ERROR
+    :frames_done: Number of frames written so far
+    :frame_count: Number of frames to write
+    :proxy_id: The proxy video, once the job has completed
+    :error: Why the job failed, when status is ERROR
+    :created_by: Username of whoever requested the proxy
+    :created_at: When the proxy was requested
+    :updated_at: When the job's status or progress last changed
+    """
+    __tablename__ = "proxy_jobs"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    video_id = Column(String, ForeignKey("input_videos.id"), nullable=False, index=True)
+    scale = Column(Integer, nullable=False)
+    bit_depth = Column(Integer, nullable=False)
+    status = Column(String, nullable=False)
+    frames_done = Column(Integer, nullable=False, default=0)
+    frame_count = Column(Integer)
+    proxy_id = Column(String, ForeignKey("input_videos.id"))
+    error = Column(String)
+    created_by = Column(String)
@@ -0,0 +1,42 @@
+from sqlalchemy import Column, Float, ForeignKey, Integer, JSON, String
+from sqlalchemy.orm import deferred
+
+from app.database.database import Base
+from app.database.timestamps import Timestamps
+
+
+class QualityMetric(Timestamps, Base):
+    """
+    PSNR and SSIM of a distorted video against a reference, computed on the server for an experiment.
+
+    :id: Unique identifier
+    :experiment_id: Experiment the comparison belongs to
+    :reference_video_id: Stored input video used as the reference
+    :distorted_video_id: Stored input video being measured, if the distorted side is a video
+    :distorted_result_id: Experiment result file being measured, if the distorted side is a result
+    :status: PENDING, RUNNING, COMPLETE or ERROR
+    :frame_count: Number of frames compared
+    :psnr_y: Mean luma PSNR in dB, with identical frames counted as 100 dB
+    :psnr_u: Mean Cb PSNR in dB
+    :psnr_v: Mean Cr PSNR in dB
+    :ssim: Mean luma SSIM
+    :per_frame: Per-frame values of each metric, keyed by metric name
+    :error: Why the computation failed, when status is ERROR
+    :created_at: When the computation was requested
+    :updated_at: When the job's status last changed
+    """
+    __tablename__ = "quality_metrics"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    experiment_id = Column(Integer, ForeignKey("experiments.id"), nullable=False, index=True)
+    reference_video_id = Column(String, ForeignKey("input_videos.id"), nullable=False)
+    distorted_video_id = Column(String, ForeignKey("input_videos.id"))
+    distorted_result_id = Column(Integer, ForeignKey("experiment_results.id"))
+    status = Column(String, nullable=False)
+    frame_count = Column(Integer)
+    psnr_y = Column(Float)
+    psnr_u = Column(Float)
+    psnr_v = Column(Float)
+    ssim = Column(Float)
+    per_frame = deferred(Column(JSON))
+    error = Column(String)
@@ -1,21 +1,28 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import BigInteger, Column, Integer, String, ForeignKey
 from sqlalchemy.orm import relationship
 
 from app.database.database import Base
+from app.database.timestamps import Timestamps
 
-class ExperimentResult(Base):
+class ExperimentResult(Timestamps, Base):
     """
     Location of result files for a given parent experiment.
 
     :id: Unique identifier
     :filename: Filename passed by the user and that which shall be returned
     :path: The path of where this file is stored on system (actual filename will have been modified to avoid conflict)
+    :size: Size of the stored file in bytes
+    :sha256: Hex SHA-256 digest of the stored file, which is also its key in the blob store
+    :created_at: When the result was uploaded
+    :updated_at: When the row was last changed
     """
     __tablename__ = "experiment_results"
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     filename = Column(String, nullable=False)
     path = Column(String)
+    size = Column(BigInteger)
+    sha256 = Column(String(64), index=True)
 
     experiment_id = Column(Integer, ForeignKey("experiments.id"), nullable=False)
     experiment = relationship("Experiment", back_populates="result_files")
\ No newline at end of file
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, String
+
+from app.database.database import Base
+from app.database.timestamps import UTCDateTime
+
+
+class SchemaMigration(Base):
+    """
+    A data migration that has been applied to this database, so it is never applied twice.
+
+    :name: Name of the migration
+    :applied_at: When it was applied
+    """
+    __tablename__ = "schema_migrations"
+
+    name = Column(String, primary_key=True)
+    applied_at = Column(UTCDateTime, nullable=False)
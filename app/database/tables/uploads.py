@@ -0,0 +1,28 @@
+from sqlalchemy import BigInteger, Column, JSON, String
+
+from app.database.database import Base
+from app.database.timestamps import Timestamps, UTCDateTime
+
+
+class UploadSession(Timestamps, Base):
+    """
+    In-progress resumable video upload.
+
+    :id: Unique identifier, reused as the id of the finished video
+    :path: Staging file beside the blob store that chunks are written to directly
+    :length: Total size of the upload in bytes, declared when the session is created
+    :offset: Number of bytes received so far
+    :video_metadata: Video fields supplied at creation, applied when the upload is finalized
+    :last_activity: When a chunk was last received; used to garbage-collect abandoned sessions
+    :created_at: When the session was created
+    :updated_at: When the row was last changed
+    """
+    __tablename__ = "upload_sessions"
+
+    id = Column(String, primary_key=True, index=True)
+    path = Column(String, nullable=False)
+    length = Column(BigInteger, nullable=False)
+    offset = Column(BigInteger, nullable=False, default=0)
+    video_metadata = Column(JSON)
+    created_by = Column(String)
+    last_activity = Column(UTCDateTime, index=True)
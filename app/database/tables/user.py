@@ -2,6 +2,7 @@ from sqlalchemy import Column, Integer, String, Enum
 import enum
 
 from app.database.database import Base
+from app.database.timestamps import Timestamps
 
 class UserRole(enum.Enum):
     pending = "pending"
@@ -10,7 +11,7 @@ class UserRole(enum.Enum):
     super_admin = "super_admin"
 
 
-class User(Base):
+class User(Timestamps, Base):
     __tablename__ = "user"
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
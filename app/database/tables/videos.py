@@ -1,6 +1,8 @@
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import BigInteger, Column, Float, ForeignKey, Integer, JSON, LargeBinary, String
+from sqlalchemy.orm import deferred
 
 from app.database.database import Base
+from app.database.timestamps import UTCDateTime, utcnow
 
 
 class InputVideo(Base):
@@ -10,6 +12,25 @@ class InputVideo(Base):
     :id: Unique identifier
     :filename: Filename passed by the user and that which shall be returned
     :path: The path of where this file is stored on system (actual filename will have been modified to avoid conflict)
+    :size: Size of the stored file in bytes
+    :sha256: Hex SHA-256 digest of the stored file, which is also its key in the blob store
+    :createdDate: When the video was added
+    :updatedDate: When the row was last changed
+    :frameCount: Number of frames, counted from the file when it was ingested
+    :chromaFormat: Chroma subsampling of the planar frames: 420, 422, 444 or mono
+    :frameOffset: Byte offset of the first frame's pixel data
+    :frameStride: Bytes between the start of consecutive frames, null when frame headers vary in length
+    :frameIndex: Byte offset of every frame's pixel data, only stored when there is no single stride
+    :analysisStatus: State of the background SI/TI analysis: PENDING, RUNNING, COMPLETE or ERROR
+    :siMax: Spatial information (ITU-T P.910), the maximum over all frames
+    :siMean: Mean spatial information over all frames
+    :tiMax: Temporal information (ITU-T P.910), the maximum over all frames
+    :tiMean: Mean temporal information over all frames
+    :siti: Per-frame SI and TI values, keyed "si" and "ti"
+    :parentId: For a downscaled proxy, the video it was generated from
+    :proxyScale: For a downscaled proxy, how many times smaller than its parent it is in each dimension
+    :fingerprint: Perceptual hash of sampled frames, used to spot the same sequence uploaded again
+    :duplicateOf: The catalog video this one was found to duplicate when it was uploaded
     """
     __tablename__ = "input_videos"
 
@@ -19,7 +40,26 @@ class InputVideo(Base):
     format = Column(String)
     frameRate = Column(Integer)
     resolution = Column(String)
-    createdDate = Column(String)
+    createdDate = Column(UTCDateTime, default=utcnow, index=True)
+    updatedDate = Column(UTCDateTime, default=utcnow, onupdate=utcnow, index=True)
     lastUpdatedBy = Column(String)
     description = Column(String)
     bitDepth = Column(Integer)
+    size = Column(BigInteger)
+    sha256 = Column(String(64), index=True)
+    frameCount = Column(Integer)
+    chromaFormat = Column(String)
+    frameOffset = Column(BigInteger)
+    frameStride = Column(BigInteger)
+    frameIndex = deferred(Column(JSON))
+    analysisStatus = Column(String)
+    siMax = Column(Float, index=True)
+    siMean = Column(Float)
+    tiMax = Column(Float, index=True)
+    tiMean = Column(Float)
+    siti = deferred(Column(JSON))
+    parentId = Column(String, ForeignKey("input_videos.id"), index=True)
+    proxyScale = Column(Integer)
+    fingerprint = deferred(Column(LargeBinary))
+    duplicateOf = Column(String)
+
@@ -0,0 +1,40 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, DateTime
+from sqlalchemy.types import TypeDecorator
+
+
+def utcnow() -> datetime:
+    """The current time as a timezone-aware UTC datetime."""
+    return datetime.now(timezone.utc)
+
+
+class UTCDateTime(TypeDecorator):
+    """
+    A timestamp that is always read back as a timezone-aware UTC datetime.
+
+    Values are stored as naive UTC, which keeps them in one canonical form that sorts and range-scans correctly on
+    SQLite where there is no timezone-aware type. Aware values are converted to UTC when written; naive values are
+    taken to be UTC already.
+    """
+    impl = DateTime
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is not None and value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
+    def process_result_value(self, value, dialect):
+        if value is not None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value
+
+
+class Timestamps:
+    """
+    Mixin adding indexed ``created_at`` and ``updated_at`` columns that are set on insert and, for ``updated_at``,
+    on every ORM or Core update that does not set it itself.
+    """
+    created_at = Column(UTCDateTime, default=utcnow, index=True)
+    updated_at = Column(UTCDateTime, default=utcnow, onupdate=utcnow, index=True)
@@ -2,14 +2,24 @@ from fastapi import FastAPI
 from fastapi.openapi.utils import get_openapi
 from starlette.middleware.cors import CORSMiddleware
 
-from app.database.database import engine, Base
+from app.auth.hashing import password_hasher
+from app.config.settings import get_settings
+from app.database.database import Session, engine
+from app.database.migrations import sync_schema
+from app.routers.blobs import router as blobs_router
+from app.routers.changes import router as changes_router
+from app.routers.diagnostics import router as diagnostics_router
 from app.routers.encoders import router as encoders_router
 from app.routers.experiments import router as experiments_router
+from app.routers.manifests import router as manifests_router
 from app.routers.networks import router as networks_router
+from app.routers.quality import router as quality_router
 from app.routers.results import router as results_router
 from app.routers.users import router as users_router
 from app.routers.videos import router as videos_router
 from app.routers.auth import router as auth_router
+from app.services.uploads import VideoUploadsService
+from app.services.utility.workers import analysis_pool
 
 app = FastAPI(title="IKlik Backend Services",
               description="API gateway for dataservices providing data access and management for IKlik services.",
@@ -26,12 +36,25 @@ app.include_router(results_router)
 app.include_router(users_router)
 app.include_router(videos_router)
 app.include_router(auth_router)
+app.include_router(diagnostics_router)
+app.include_router(blobs_router)
+app.include_router(quality_router)
+app.include_router(manifests_router)
+app.include_router(changes_router)
 
 
 @app.on_event("startup")
 async def on_startup():
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(sync_schema)
+    async with Session() as session:
+        await VideoUploadsService().collect_abandoned_uploads(session, get_settings())
+
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    password_hasher.shutdown()
+    analysis_pool.shutdown()
 
 # Custom OpenAPI schema to enable JWT auth in Swagger
 def custom_openapi():
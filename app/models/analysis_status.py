@@ -0,0 +1,9 @@
+from enum import Enum
+
+
+class AnalysisStatus(str, Enum):
+    """State of a background analysis job"""
+    PENDING = 'PENDING'
+    RUNNING = 'RUNNING'
+    COMPLETE = 'COMPLETE'
+    ERROR = 'ERROR'
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from enum import Enum
+from typing import Any, ClassVar, Dict, List, Optional
+
+from pydantic import BaseModel, Field, StrictInt, StrictStr
+
+
+class ChangeEntity(str, Enum):
+    """Kinds of entity the change feed reports"""
+    EXPERIMENT = 'experiment'
+    VIDEO = 'video'
+    NETWORK = 'network'
+    ENCODER = 'encoder'
+    RESULT = 'result'
+
+
+class ChangeOperation(str, Enum):
+    """What happened to an entity"""
+    INSERT = 'insert'
+    UPDATE = 'update'
+    DELETE = 'delete'
+
+
+class Change(BaseModel):
+    """
+    The latest change to one entity. Inserts and updates carry the entity as its own endpoint returns it; deletes
+    carry no data. A client that has not seen an insert may receive it as an update, so both are upserts.
+    """  # noqa: E501
+    seq: StrictInt = Field(description="Position of the change in the log")
+    entity: ChangeEntity
+    id: StrictStr = Field(description="ID of the entity")
+    operation: ChangeOperation
+    data: Optional[Dict[str, Any]] = None
+
+    __properties: ClassVar[List[str]] = ["seq", "entity", "id", "operation", "data"]
+    model_config = {"populate_by_name": True, "validate_assignment": True, "protected_namespaces": ()}
+
+
+class ChangeSet(BaseModel):
+    """
+    Changes after a cursor, oldest first. Pass ``cursor`` as ``since`` on the next poll; when ``hasMore`` is set,
+    poll again straight away.
+    """  # noqa: E501
+    changes: List[Change]
+    cursor: StrictStr
+    has_more: bool = Field(alias="hasMore")
+
+    __properties: ClassVar[List[str]] = ["changes", "cursor", "hasMore"]
+    model_config = {"populate_by_name": True, "validate_assignment": True, "protected_namespaces": ()}
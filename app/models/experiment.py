@@ -55,10 +55,12 @@ class Experiment(ExperimentInput):
     """  # noqa: E501
     id: Optional[int] = Field(alias="Id")
     created_at: Optional[datetime] = Field(default=None, alias="CreatedAt")
+    updated_at: Optional[datetime] = Field(default=None, alias="UpdatedAt")
     owner_id: int = Field(alias="OwnerId")
     sequences: List[ExperimentSequence] = Field(alias="Sequences")
 
-    __properties: ClassVar[List[str]] = ["Id", "ExperimentName", "Description", "Sequences", "CreatedAt", "OwnerId",
+    __properties: ClassVar[List[str]] = ["Id", "ExperimentName", "Description", "Sequences", "CreatedAt", "UpdatedAt",
+                                         "OwnerId",
                                          "Status", "Sequences"]
     model_config = {"populate_by_name": True, "validate_assignment": True, "protected_namespaces": (),
                     "from_attributes": True}
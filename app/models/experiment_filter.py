@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import ClassVar, List, Optional
+
+from pydantic import BaseModel, Field, StrictStr
+
+from app.models.experiment import ExperimentStatus
+
+
+class ExperimentFilter(BaseModel):
+    """
+    Query parameters narrowing an experiment listing. Every filter given must match. Times without an offset are UTC.
+    """  # noqa: E501
+    status: Optional[ExperimentStatus] = Field(default=None, description="Only experiments in this state")
+    owner_id: Optional[int] = Field(default=None, description="Only experiments owned by this user")
+    created_after: Optional[datetime] = Field(default=None, description="Only experiments created at or after this")
+    created_before: Optional[datetime] = Field(default=None, description="Only experiments created before this")
+    network_topology_id: Optional[int] = Field(default=None,
+                                               description="Only experiments with a sequence on this topology")
+    network_disruption_profile_id: Optional[int] = Field(
+        default=None, description="Only experiments with a sequence using this disruption profile")
+    name_prefix: Optional[StrictStr] = Field(default=None, description="Only experiments whose name starts with this")
+
+    __properties: ClassVar[List[str]] = ["status", "owner_id", "created_after", "created_before",
+                                         "network_topology_id", "network_disruption_profile_id", "name_prefix"]
+    model_config = {"protected_namespaces": ()}
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from typing import ClassVar, List, Optional
+
+from pydantic import BaseModel, Field, StrictInt, StrictStr, model_validator
+
+
+class ManifestAsset(BaseModel):
+    """
+    A stored input video or an experiment result video
+    """  # noqa: E501
+    video_id: Optional[StrictStr] = Field(default=None, alias="VideoId")
+    result_id: Optional[StrictInt] = Field(default=None, alias="ResultId")
+
+    __properties: ClassVar[List[str]] = ["VideoId", "ResultId"]
+    model_config = {"populate_by_name": True, "validate_assignment": True, "protected_namespaces": ()}
+
+    @model_validator(mode="after")
+    def one_source(self):
+        if (self.video_id is None) == (self.result_id is None):
+            raise ValueError("Exactly one of VideoId and ResultId is required")
+        return self
+
+
+class ManifestComparisonInput(BaseModel):
+    """
+    Two assets to compare frame by frame
+    """  # noqa: E501
+    first: ManifestAsset = Field(alias="First")
+    second: ManifestAsset = Field(alias="Second")
+
+    __properties: ClassVar[List[str]] = ["First", "Second"]
+    model_config = {"populate_by_name": True, "validate_assignment": True, "protected_namespaces": ()}
+
+
+class ManifestComparison(BaseModel):
+    """
+    Outcome of comparing the frame checksums of two assets
+    """  # noqa: E501
+    identical: bool = Field(alias="Identical")
+    first_mismatch: Optional[int] = Field(default=None, alias="FirstMismatch")
+    first_frame_count: int = Field(alias="FirstFrameCount")
+    second_frame_count: int = Field(alias="SecondFrameCount")
+    detail: Optional[StrictStr] = Field(default=None, alias="Detail")
+
+    __properties: ClassVar[List[str]] = ["Identical", "FirstMismatch", "FirstFrameCount", "SecondFrameCount",
+                                         "Detail"]
+    model_config = {"populate_by_name": True, "validate_assignment": True, "protected_namespaces": ()}
+
+
+class FrameManifest(BaseModel):
+    """
+    Per-frame MD5 checksums of a stored video
+    """  # noqa: E501
+    width: int = Field(alias="Width")
+    height: int = Field(alias="Height")
+    chroma_format: StrictStr = Field(alias="ChromaFormat")
+    bit_depth: int = Field(alias="BitDepth")
+    frame_count: int = Field(alias="FrameCount")
+    md5: List[StrictStr] = Field(alias="Md5")
+
+    __properties: ClassVar[List[str]] = ["Width", "Height", "ChromaFormat", "BitDepth", "FrameCount", "Md5"]
+    model_config = {"populate_by_name": True, "validate_assignment": True, "protected_namespaces": (),
+                    "from_attributes": True}
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import ClassVar, List, Literal, Optional
+
+from pydantic import BaseModel, Field, StrictInt, StrictStr
+
+from app.models.analysis_status import AnalysisStatus
+
+
+class ProxyInput(BaseModel):
+    """
+    Downscaling factor of a proxy and its bit depth, which defaults to the source's
+    """  # noqa: E501
+    scale: Literal[2, 4, 8] = 2
+    bitDepth: Optional[Literal[8, 10]] = Field(default=None, alias="bitDepth")
+
+    __properties: ClassVar[List[str]] = ["scale", "bitDepth"]
+    model_config = {"populate_by_name": True, "validate_assignment": True, "protected_namespaces": (), }
+
+
+class ProxyJob(BaseModel):
+    """
+    ProxyJob
+    """  # noqa: E501
+    id: StrictInt
+    videoId: StrictStr = Field(alias="videoId", validation_alias="video_id")
+    scale: StrictInt
+    bitDepth: StrictInt = Field(alias="bitDepth", validation_alias="bit_depth")
+    status: AnalysisStatus
+    framesDone: StrictInt = Field(alias="framesDone", validation_alias="frames_done")
+    frameCount: Optional[StrictInt] = Field(default=None, alias="frameCount", validation_alias="frame_count")
+    proxyId: Optional[StrictStr] = Field(default=None, alias="proxyId", validation_alias="proxy_id")
+    error: Optional[StrictStr] = None
+    createdAt: Optional[datetime] = Field(default=None, alias="createdAt", validation_alias="created_at")
+    updatedAt: Optional[datetime] = Field(default=None, alias="updatedAt", validation_alias="updated_at")
+
+    __properties: ClassVar[List[str]] = ["id", "videoId", "scale", "bitDepth", "status", "framesDone", "frameCount",
+                                         "proxyId", "error", "createdAt", "updatedAt"]
+    model_config = {"populate_by_name": True, "validate_assignment": True, "protected_namespaces": (),
+                    "from_attributes": True}
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import ClassVar, Dict, List, Optional
+
+from pydantic import BaseModel, Field, StrictInt, StrictStr, model_validator
+
+from app.models.analysis_status import AnalysisStatus
+
+
+class QualityMetricInput(BaseModel):
+    """
+    Videos to compare: a stored reference video and either a stored video or a result file of the experiment
+    """  # noqa: E501
+    reference_video_id: StrictStr = Field(alias="ReferenceVideoId")
+    distorted_video_id: Optional[StrictStr] = Field(default=None, alias="DistortedVideoId")
+    distorted_result_id: Optional[StrictInt] = Field(default=None, alias="DistortedResultId")
+
+    __properties: ClassVar[List[str]] = ["ReferenceVideoId", "DistortedVideoId", "DistortedResultId"]
+    model_config = {"populate_by_name": True, "validate_assignment": True, "protected_namespaces": (),
+                    "from_attributes": True}
+
+    @model_validator(mode="after")
+    def one_distorted_source(self):
+        if (self.distorted_video_id is None) == (self.distorted_result_id is None):
+            raise ValueError("Exactly one of DistortedVideoId and DistortedResultId is required")
+        return self
+
+
+class QualityMetric(BaseModel):
+    """
+    QualityMetric
+    """  # noqa: E501
+    id: int = Field(alias="Id")
+    experiment_id: int = Field(alias="ExperimentId")
+    reference_video_id: StrictStr = Field(alias="ReferenceVideoId")
+    distorted_video_id: Optional[StrictStr] = Field(default=None, alias="DistortedVideoId")
+    distorted_result_id: Optional[StrictInt] = Field(default=None, alias="DistortedResultId")
+    status: AnalysisStatus = Field(alias="Status")
+    frame_count: Optional[int] = Field(default=None, alias="FrameCount")
+    psnr_y: Optional[float] = Field(default=None, alias="PsnrY")
+    psnr_u: Optional[float] = Field(default=None, alias="PsnrU")
+    psnr_v: Optional[float] = Field(default=None, alias="PsnrV")
+    ssim: Optional[float] = Field(default=None, alias="Ssim")
+    error: Optional[StrictStr] = Field(default=None, alias="Error")
+    created_at: Optional[datetime] = Field(default=None, alias="CreatedAt")
+    updated_at: Optional[datetime] = Field(default=None, alias="UpdatedAt")
+
+    __properties: ClassVar[List[str]] = ["Id", "ExperimentId", "ReferenceVideoId", "DistortedVideoId",
+                                         "DistortedResultId", "Status", "FrameCount", "PsnrY", "PsnrU", "PsnrV",
+                                         "Ssim", "Error", "CreatedAt", "UpdatedAt"]
+    model_config = {"populate_by_name": True, "validate_assignment": True, "protected_namespaces": (),
+                    "from_attributes": True}
+
+
+class QualityMetricDetail(QualityMetric):
+    """
+    QualityMetric with the per-frame values of each metric
+    """  # noqa: E501
+    per_frame: Optional[Dict[str, List[float]]] = Field(default=None, alias="PerFrame")
+
+    __properties: ClassVar[List[str]] = ["Id", "ExperimentId", "ReferenceVideoId", "DistortedVideoId",
+                                         "DistortedResultId", "Status", "FrameCount", "PsnrY", "PsnrU", "PsnrV",
+                                         "Ssim", "Error", "CreatedAt", "UpdatedAt", "PerFrame"]
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import ClassVar, List, Optional
+
+from pydantic import BaseModel, Field, StrictInt, StrictStr
+
+
+class ResultFile(BaseModel):
+    """
+    A result file recorded against an experiment
+    """  # noqa: E501
+    id: StrictInt = Field(alias="Id")
+    experiment_id: StrictInt = Field(alias="ExperimentId")
+    filename: StrictStr = Field(alias="Filename")
+    size: Optional[StrictInt] = Field(default=None, alias="Size")
+    sha256: Optional[StrictStr] = Field(default=None, alias="Sha256")
+    created_at: Optional[datetime] = Field(default=None, alias="CreatedAt")
+
+    __properties: ClassVar[List[str]] = ["Id", "ExperimentId", "Filename", "Size", "Sha256", "CreatedAt"]
+    model_config = {"populate_by_name": True, "validate_assignment": True, "protected_namespaces": (),
+                    "from_attributes": True}
@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+from typing import ClassVar, List
+
+from pydantic import BaseModel, Field, StrictStr
+
+
+class ResultByHashInput(BaseModel):
+    """
+    Result file the server already stores, identified by its SHA-256 digest
+    """  # noqa: E501
+    filename: StrictStr
+    sha256: StrictStr = Field(pattern=r"^[0-9a-f]{64}$")
+
+    __properties: ClassVar[List[str]] = ["filename", "sha256"]
+    model_config = {"populate_by_name": True, "validate_assignment": True, "protected_namespaces": (), }
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from typing import ClassVar, List
+
+from pydantic import BaseModel, Field, StrictInt, StrictStr
+
+from app.models.video_input import VideoInput
+
+
+class UploadSessionInput(VideoInput):
+    """
+    Metadata for a resumable video upload. ``length`` is the total size of the file in bytes.
+    """  # noqa: E501
+    length: StrictInt = Field(ge=0)
+
+    __properties: ClassVar[List[str]] = ["title", "format", "frameRate", "resolution", "description", "bitDepth",
+                                         "chromaFormat", "length"]
+
+
+class UploadSession(BaseModel):
+    """
+    UploadSession
+    """  # noqa: E501
+    id: StrictStr
+    length: StrictInt
+    offset: StrictInt
+
+    __properties: ClassVar[List[str]] = ["id", "length", "offset"]
+    model_config = {"populate_by_name": True, "validate_assignment": True, "protected_namespaces": (),
+                    "from_attributes": True}
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import json
 import pprint
+from datetime import datetime
 from typing import Any, ClassVar, Dict, List, Optional, Tuple, Union
 
 from pydantic import BaseModel, Field, StrictInt, StrictStr
@@ -24,10 +25,28 @@ class Video(BaseModel):
     format: Optional[StrictStr] = None
     frameRate: Optional[StrictInt] = Field(default=None, alias="frameRate")
     resolution: Optional[StrictStr] = None
-    createdDate: Optional[StrictStr] = Field(default=None, alias="createdDate")
+    createdDate: Optional[datetime] = Field(default=None, alias="createdDate")
+    updatedDate: Optional[datetime] = Field(default=None, alias="updatedDate")
     lastUpdatedBy: Optional[StrictStr] = Field(default=None, alias="lastUpdatedBy")
+    size: Optional[StrictInt] = None
+    sha256: Optional[StrictStr] = None
+    frameCount: Optional[StrictInt] = Field(default=None, alias="frameCount")
+    chromaFormat: Optional[StrictStr] = Field(default=None, alias="chromaFormat")
+    frameOffset: Optional[StrictInt] = Field(default=None, alias="frameOffset")
+    frameStride: Optional[StrictInt] = Field(default=None, alias="frameStride")
+    analysisStatus: Optional[StrictStr] = Field(default=None, alias="analysisStatus")
+    siMax: Optional[float] = Field(default=None, alias="siMax")
+    siMean: Optional[float] = Field(default=None, alias="siMean")
+    tiMax: Optional[float] = Field(default=None, alias="tiMax")
+    tiMean: Optional[float] = Field(default=None, alias="tiMean")
+    parentId: Optional[StrictStr] = Field(default=None, alias="parentId")
+    proxyScale: Optional[StrictInt] = Field(default=None, alias="proxyScale")
+    duplicateOf: Optional[StrictStr] = Field(default=None, alias="duplicateOf")
     __properties: ClassVar[List[str]] = ["id", "title", "description", "bitDepth", "path", "format", "frameRate", "resolution",
-                                         "createdDate", "lastUpdatedBy"]
+                                         "createdDate", "updatedDate", "lastUpdatedBy", "size", "sha256", "frameCount", "chromaFormat",
+                                         "frameOffset", "frameStride", "analysisStatus", "siMax", "siMean", "tiMax",
+                                         "tiMean", "parentId", "proxyScale",
+                                         "duplicateOf"]
 
     model_config = {"populate_by_name": True, "validate_assignment": True, "protected_namespaces": (), }
 
@@ -71,5 +90,13 @@ class Video(BaseModel):
                                    "description": obj.get("description"), "bitDepth": obj.get("bitDepth"), "path": obj.get("path"),
                                    "format": obj.get("format"),
                                    "frameRate": obj.get("frameRate"), "resolution": obj.get("resolution"),
-                                   "createdDate": obj.get("createdDate"), "lastUpdatedBy": obj.get("lastUpdatedBy")})
+                                   "createdDate": obj.get("createdDate"), "updatedDate": obj.get("updatedDate"),
+                                   "lastUpdatedBy": obj.get("lastUpdatedBy"),
+                                   "size": obj.get("size"), "sha256": obj.get("sha256"),
+                                   "frameCount": obj.get("frameCount"), "chromaFormat": obj.get("chromaFormat"),
+                                   "frameOffset": obj.get("frameOffset"), "frameStride": obj.get("frameStride"),
+                                   "analysisStatus": obj.get("analysisStatus"), "siMax": obj.get("siMax"),
+                                   "siMean": obj.get("siMean"), "tiMax": obj.get("tiMax"),
+                                   "tiMean": obj.get("tiMean"), "parentId": obj.get("parentId"),
+                                   "proxyScale": obj.get("proxyScale"), "duplicateOf": obj.get("duplicateOf")})
         return _obj
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from typing import ClassVar, List, Optional
+
+from pydantic import BaseModel, Field, StrictStr
+
+from app.models.analysis_status import AnalysisStatus
+
+
+class VideoAnalysis(BaseModel):
+    """
+    Spatial and temporal information (ITU-T P.910) of a video, overall and per frame. The first frame has no TI.
+    """  # noqa: E501
+    id: StrictStr
+    analysisStatus: Optional[AnalysisStatus] = Field(default=None, alias="analysisStatus")
+    siMax: Optional[float] = Field(default=None, alias="siMax")
+    siMean: Optional[float] = Field(default=None, alias="siMean")
+    tiMax: Optional[float] = Field(default=None, alias="tiMax")
+    tiMean: Optional[float] = Field(default=None, alias="tiMean")
+    si: List[float] = Field(default_factory=list)
+    ti: List[float] = Field(default_factory=list)
+    __properties: ClassVar[List[str]] = ["id", "analysisStatus", "siMax", "siMean", "tiMax", "tiMean", "si", "ti"]
+
+    model_config = {"populate_by_name": True, "validate_assignment": True, "protected_namespaces": (), }
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from typing import ClassVar, List, Optional
+
+from pydantic import BaseModel, Field, StrictInt, StrictStr
+
+
+class VideoInput(BaseModel):
+    """
+    Video metadata supplied by the uploader
+    """  # noqa: E501
+    title: Optional[StrictStr] = None
+    format: Optional[StrictStr] = None
+    frameRate: Optional[StrictInt] = Field(default=None, alias="frameRate")
+    resolution: Optional[StrictStr] = None
+    description: Optional[StrictStr] = None
+    bitDepth: Optional[StrictInt] = None
+    chromaFormat: Optional[StrictStr] = Field(default=None, alias="chromaFormat")
+
+    __properties: ClassVar[List[str]] = ["title", "format", "frameRate", "resolution", "description", "bitDepth",
+                                         "chromaFormat"]
+    model_config = {"populate_by_name": True, "validate_assignment": True, "protected_namespaces": (), }
+
+
+class VideoByHashInput(VideoInput):
+    """
+    Video metadata for content the server already stores, identified by its SHA-256 digest
+    """  # noqa: E501
+    sha256: StrictStr = Field(pattern=r"^[0-9a-f]{64}$")
+
+    __properties: ClassVar[List[str]] = ["title", "format", "frameRate", "resolution", "description", "bitDepth",
+                                         "chromaFormat", "sha256"]
@@ -100,7 +100,7 @@ async def reset_password(
     except HTTPException:
         raise HTTPException(status_code=404, detail="User not found")
 
-    hashed_password = auth_service.get_password_hash(data.new_password)
+    hashed_password = await auth_service.get_password_hash(data.new_password)
     await user_service.update_password(email=email, hashed_password=hashed_password, db=db)
 
     return {"message": "Password has been reset successfully"}
\ No newline at end of file
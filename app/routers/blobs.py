@@ -0,0 +1,24 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.params import Depends, Path
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.responses import Response
+
+from app.auth.dependencies import user_dependency
+from app.config.settings import Settings, get_settings
+from app.database.database import get_db
+from app.models.user import User
+from app.services.blobs import BlobsService
+
+router = APIRouter()
+
+
+@router.head("/blobs/{sha256}", responses={200: {"description": "Content is stored"},
+                                           404: {"description": "Content is not stored, or not readable by the caller"}},
+             tags=["blobs"], summary="Check whether content is already stored")
+async def head_blob(sha256: str = Path(..., pattern=r"^[0-9a-f]{64}$", description="Hex SHA-256 of the content"),
+                    db: AsyncSession = Depends(get_db), settings: Settings = Depends(get_settings),
+                    current_user: User = Depends(user_dependency)) -> Response:
+    """Lets clients skip uploading a body the server already has, using the by-hash create endpoints instead."""
+    if not await BlobsService().blob_exists(sha256, db, settings, current_user):
+        raise HTTPException(status_code=404, detail="Blob not found")
+    return Response(headers={"Cache-Control": "no-store"})
@@ -0,0 +1,30 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from pydantic import StrictStr
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth.dependencies import user_dependency
+from app.database.database import get_db
+from app.models.change import ChangeSet
+from app.models.user import User
+from app.services.changes import ChangesService
+from app.services.utility.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+
+router = APIRouter()
+
+
+@router.get("/changes", responses={200: {"model": ChangeSet, "description": "Successful operation"},
+                                   400: {"description": "Invalid cursor"}},
+            tags=["changes"], summary="List changes since a cursor.", response_model_by_alias=True)
+async def get_changes(since: Optional[StrictStr] = Query(None, description="Cursor returned by the previous poll; "
+                                                                           "omit it to list every entity"),
+                      limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE,
+                                         description="Most changes to return"),
+                      db: AsyncSession = Depends(get_db),
+                      current_user: User = Depends(user_dependency)) -> ChangeSet:
+    """
+    Experiments, videos, networks, encoders and result files inserted, updated or deleted since ``since``, in commit
+    order with only the latest change to each, so a client can keep a local copy without listing everything again.
+    """
+    return await ChangesService().get_changes(since, current_user, db, limit)
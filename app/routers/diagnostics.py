@@ -0,0 +1,19 @@
+from fastapi import APIRouter
+from fastapi.params import Depends
+
+from app.auth.dependencies import super_admin_dependency
+from app.auth.hashing import password_hasher
+from app.auth.principal_cache import principal_cache
+from app.models.user import User
+from app.services.utility.frame_cache import frame_cache
+from app.services.utility.workers import analysis_pool
+
+router = APIRouter()
+
+
+@router.get("/diagnostics", responses={200: {"description": "Runtime counters for this worker process"}},
+            tags=["diagnostics"], summary="Retrieve runtime diagnostics", response_model_by_alias=True, )
+async def get_diagnostics(current_user: User = Depends(super_admin_dependency)) -> dict:
+    """Runtime counters for this worker process (Super User access required)."""
+    return {"password_hashing": password_hasher.stats(), "principal_cache": principal_cache.stats(),
+            "frame_cache": frame_cache.stats(), "analysis_pool": analysis_pool.stats()}
@@ -1,6 +1,6 @@
 from typing import List, Optional
 
-from fastapi import APIRouter, Body, Path, Depends
+from fastapi import APIRouter, Body, Path, Depends, Query, Request, Response
 from pydantic import Field, StrictStr
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.responses import JSONResponse
@@ -13,6 +13,7 @@ from app.models.encoder_input import EncoderInput
 from app.models.error import Error
 from app.models.user import User
 from app.services.encoders import EncodersService
+from app.services.utility.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, set_page_headers
 
 router = APIRouter()
 
@@ -51,10 +52,16 @@ async def get_encoder(id: StrictStr = Path(..., description=""), db: AsyncSessio
 @router.get("/infrastructure/encoders", responses={200: {"model": List[Encoder], "description": "A list of encoders"},
                                                    404: {"model": Error, "description": "No encoders found"}},
             tags=["encoders"], summary="Retrieve encoder list", response_model_by_alias=True, )
-async def get_encoders(db: AsyncSession = Depends(get_db),
+async def get_encoders(request: Request, response: Response,
+                       cursor: Optional[StrictStr] = Query(None, description="Cursor from the previous page's "
+                                                                             "X-Next-Cursor header"),
+                       limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Page size"),
+                       db: AsyncSession = Depends(get_db),
                        current_user: User = Depends(user_dependency)) -> List[Encoder]:
-    """Fetch a list of all encoders."""
-    return await EncodersService().get_encoders(db)
+    """Fetch a page of encoders."""
+    page = await EncodersService().get_encoders(db, cursor, limit)
+    set_page_headers(page, request, response)
+    return page.items
 
 
 @router.put("/infrastructure/encoders/{id}",
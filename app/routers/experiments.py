@@ -1,18 +1,21 @@
 from typing import Optional, List
 
 from fastapi import APIRouter
-from fastapi import Body
-from fastapi.params import Depends, Path
+from fastapi import Body, Request, Response
+from fastapi.params import Depends, Path, Query
 from pydantic import Field, StrictStr
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.responses import JSONResponse
 from typing_extensions import Annotated
 
 from app.auth.dependencies import require_minimum_role, user_dependency, super_admin_dependency
+from app.config.settings import Settings, get_settings
 from app.database.database import get_db
 from app.models.experiment import Experiment, ExperimentInput, ExperimentUpdateInput
+from app.models.experiment_filter import ExperimentFilter
 from app.models.user import User
-from app.services.experiments import ExperimentsService
+from app.services.experiments import ExperimentFieldset, ExperimentsService
+from app.services.utility.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, set_page_headers
 
 router = APIRouter()
 
@@ -35,22 +38,28 @@ async def create_experiment(current_user: User = Depends(user_dependency), exper
 async def delete_experiment(current_user: User = Depends(super_admin_dependency), experiment_id: Annotated[
     StrictStr, Field(description="ID to uniquely identify an experiment.")] = Path(...,
                                                                                    description="ID to uniquely identify an experiment."),
-                            db: AsyncSession = Depends(get_db)) -> JSONResponse:
+                            db: AsyncSession = Depends(get_db),
+                            settings: Settings = Depends(get_settings)) -> JSONResponse:
     """Delete an experiment."""
-    return await ExperimentsService().delete_experiment(experiment_id, current_user.id, db)
+    return await ExperimentsService().delete_experiment(experiment_id, current_user.id, db, settings)
 
 
 @router.get("/experiments/{experiment_id}",
             responses={200: {"model": Experiment, "description": "Successful operation"},
                        404: {"description": "Experiment not found"}}, tags=["experiments"],
-            summary="Get experiment by ID.", response_model_by_alias=True, )
+            summary="Get experiment by ID.", response_model_by_alias=True, response_model=None)
 async def get_experiment(current_user: User = Depends(user_dependency), experiment_id: Annotated[
     StrictStr, Field(description="ID to uniquely identify an experiment.")] = Path(...,
                                                                                    description="ID to uniquely identify an experiment."),
+                         fields: Optional[StrictStr] = Query(None, description="Comma-separated fields to return, "
+                                                                               "e.g. ExperimentName,status"),
+                         include: Optional[StrictStr] = Query(None, description="Comma-separated relationships to "
+                                                                                "expand, e.g. Sequences.NetworkTopology"),
                          db: AsyncSession = Depends(get_db)) -> Experiment:
-    """Get full details of an experiment by its unique ID."""
+    """Get full details of an experiment by its unique ID, or only the fields and relationships asked for."""
     return await ExperimentsService().get_experiment(experiment_id, db,
-                                                     user_id=current_user.id if current_user.role == "user" else None)
+                                                     user_id=current_user.id if current_user.role == "user" else None,
+                                                     fieldset=ExperimentFieldset.parse(fields, include))
 
 
 @router.get(
@@ -63,17 +72,35 @@ async def get_experiment(current_user: User = Depends(user_dependency), experime
     tags=["experiments"],
     summary="List experiments.",
     response_model_by_alias=True,
-    response_model=List[Experiment],
+    response_model=None,
 )
 async def get_experiments(
+    request: Request,
+    response: Response,
+    cursor: Optional[StrictStr] = Query(None, description="Cursor from the previous page's X-Next-Cursor header"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Page size"),
+    fields: Optional[StrictStr] = Query(None, description="Comma-separated fields to return, e.g. "
+                                                          "ExperimentName,status,CreatedAt"),
+    include: Optional[StrictStr] = Query(None, description="Comma-separated relationships to expand: Sequences, "
+                                                           "Sequences.NetworkTopology, "
+                                                           "Sequences.NetworkDisruptionProfile"),
+    sort: Optional[StrictStr] = Query(None, description="Key to sort by, prefix with - to reverse (e.g. -CreatedAt)"),
+    filters: ExperimentFilter = Depends(),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(user_dependency),
 ) -> List[Experiment]:
-    """List experiments for a given user."""
-    
+    """
+    List experiments for a given user, a page at a time in ID order unless sorted otherwise. Filters are applied in
+    the database. Without ``fields`` or ``include`` every experiment comes with its sequences and their network
+    profiles; with either, only what is named is queried.
+    """
+    fieldset = ExperimentFieldset.parse(fields, include)
     if current_user.role == "user":
-        return await ExperimentsService().get_experiments(current_user.id, db)
-    return await ExperimentsService().get_all_experiments(db)
+        page = await ExperimentsService().get_experiments(current_user.id, db, cursor, limit, fieldset, filters, sort)
+    else:
+        page = await ExperimentsService().get_all_experiments(db, cursor, limit, fieldset, filters, sort)
+    set_page_headers(page, request, response)
+    return page.items
 
 
 @router.put("/experiments/{experiment_id}", responses={200: {"description": "successful operation"}, 400: {
@@ -0,0 +1,26 @@
+from fastapi import APIRouter, Body
+from fastapi.params import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth.dependencies import user_dependency
+from app.database.database import get_db
+from app.models.frame_manifest import ManifestComparison, ManifestComparisonInput
+from app.models.user import User
+from app.services.manifests import ManifestsService
+
+router = APIRouter(prefix="/manifests")
+
+
+@router.post("/compare",
+             responses={200: {"model": ManifestComparison, "description": "Comparison outcome"},
+                        400: {"description": "Asset is not a video, or the frame layout is unknown"},
+                        403: {"description": "Not authorized"}, 404: {"description": "Video or result not found"},
+                        422: {"description": "Validation exception"}},
+             tags=["videos", "results"], summary="Check two videos or result videos for bit-exactness.",
+             response_model_by_alias=True, )
+async def compare_manifests(comparison: ManifestComparisonInput = Body(..., description="Assets to compare"),
+                            db: AsyncSession = Depends(get_db),
+                            current_user: User = Depends(user_dependency)) -> ManifestComparison:
+    """Compare per-frame MD5 checksums and report the first frame that differs. A raw YUV result is read with the
+    frame layout of the asset it is compared with."""
+    return await ManifestsService().compare(comparison, current_user, db)
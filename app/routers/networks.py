@@ -1,6 +1,6 @@
 from typing import List, Optional
 
-from fastapi import APIRouter, Body, Path, Depends
+from fastapi import APIRouter, Body, Path, Depends, Query, Request, Response
 from pydantic import Field, StrictStr
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing_extensions import Annotated
@@ -12,6 +12,7 @@ from app.models.info import Info
 from app.models.network import Network, NetworkInput
 from app.models.user import User
 from app.services.networks import NetworksService
+from app.services.utility.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, set_page_headers
 
 router = APIRouter()
 
@@ -67,7 +68,13 @@ async def get_network(
 @router.get("/infrastructure/networks", responses={200: {"model": List[Network], "description": "A list of networks"}},
             tags=["networks"], summary="Retrieve networks list", response_model_by_alias=True)
 async def get_networks(
+    request: Request,
+    response: Response,
+    cursor: Optional[StrictStr] = Query(None, description="Cursor from the previous page's X-Next-Cursor header"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Page size"),
     current_user: User = Depends(user_dependency),
     db: AsyncSession = Depends(get_db)
 ) -> List[Network]:
-    return await NetworksService().get_networks(db)
+    page = await NetworksService().get_networks(db, cursor, limit)
+    set_page_headers(page, request, response)
+    return page.items
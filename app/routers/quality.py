@@ -0,0 +1,55 @@
+from typing import List
+
+from fastapi import APIRouter, BackgroundTasks, Body
+from fastapi.params import Depends, Path
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.auth.dependencies import user_dependency
+from app.database.database import get_db, get_sessionmaker
+from app.models.quality_metric import QualityMetric, QualityMetricDetail, QualityMetricInput
+from app.models.user import User
+from app.services.quality import QualityService
+
+router = APIRouter(prefix="/experiments")
+
+
+@router.post("/{experiment_id}/quality", status_code=202,
+             responses={202: {"description": "Comparison queued"}, 403: {"description": "Not authorized"},
+                        404: {"description": "Experiment, video or result file not found"},
+                        422: {"description": "Validation exception"}},
+             tags=["experiments", "quality"], summary="Compute PSNR and SSIM of a video against a reference.",
+             response_model_by_alias=True, )
+async def create_quality_metric(background_tasks: BackgroundTasks, current_user: User = Depends(user_dependency),
+                                experiment_id: int = Path(..., description="ID to uniquely identify an experiment."),
+                                metric_input: QualityMetricInput = Body(None, description="Videos to compare"),
+                                db: AsyncSession = Depends(get_db),
+                                sessionmaker: async_sessionmaker = Depends(get_sessionmaker)) -> QualityMetric:
+    """Queue a comparison of a stored video or result file against a reference video. Poll the returned metric
+    until its status is COMPLETE or ERROR."""
+    return await QualityService().create_metric(experiment_id, metric_input, current_user, db, sessionmaker,
+                                                background_tasks)
+
+
+@router.get("/{experiment_id}/quality",
+            responses={200: {"description": "Successful operation"}, 403: {"description": "Not authorized"},
+                       404: {"description": "Experiment not found"}},
+            tags=["experiments", "quality"], summary="List quality metrics of an experiment.",
+            response_model_by_alias=True, )
+async def get_quality_metrics(current_user: User = Depends(user_dependency),
+                              experiment_id: int = Path(..., description="ID to uniquely identify an experiment."),
+                              db: AsyncSession = Depends(get_db)) -> List[QualityMetric]:
+    """Summary values of every comparison run for the experiment."""
+    return await QualityService().get_metrics(experiment_id, current_user, db)
+
+
+@router.get("/{experiment_id}/quality/{metric_id}",
+            responses={200: {"description": "Successful operation"}, 403: {"description": "Not authorized"},
+                       404: {"description": "Experiment or metric not found"}},
+            tags=["experiments", "quality"], summary="Get a quality metric with per-frame values.",
+            response_model_by_alias=True, )
+async def get_quality_metric(current_user: User = Depends(user_dependency),
+                             experiment_id: int = Path(..., description="ID to uniquely identify an experiment."),
+                             metric_id: int = Path(..., description="ID of the quality metric."),
+                             db: AsyncSession = Depends(get_db)) -> QualityMetricDetail:
+    """Summary and per-frame values of one comparison."""
+    return await QualityService().get_metric(experiment_id, metric_id, current_user, db)
@@ -1,13 +1,16 @@
-from fastapi import APIRouter, HTTPException, UploadFile
-from fastapi.params import File, Depends, Path
-from sqlalchemy.ext.asyncio import AsyncSession
-from starlette.responses import StreamingResponse
+from typing import Optional
+
+from fastapi import APIRouter, BackgroundTasks, Body, HTTPException, Request, UploadFile
+from fastapi.params import File, Depends, Header, Path
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from starlette.responses import Response
 
 from app.auth.dependencies import require_minimum_role, user_dependency
 from app.config.settings import Settings
 from app.config.settings import get_settings
-from app.database.database import get_db
+from app.database.database import get_db, get_sessionmaker
 from app.models.info import Info
+from app.models.result_input import ResultByHashInput
 from app.models.user import User
 from app.services.results import ResultsService
 
@@ -15,26 +18,70 @@ router = APIRouter(prefix="/experiments")
 
 
 @router.get("/{experiment_id}/results",
-            responses={200: {"description": "Successful operation"}, 400: {"description": "Invalid status value"}},
+            responses={200: {"description": "Successful operation"}, 304: {"description": "Archive not modified"},
+                       400: {"description": "Invalid status value"}},
             tags=["experiments", "results"], summary="Get results for an experiment.", response_model_by_alias=True, )
 async def get_experiment_results(current_user: User = Depends(user_dependency),
                                  experiment_id: int = Path(..., description="ID to uniquely identify an experiment."),
-                                 db: AsyncSession = Depends(get_db)) -> StreamingResponse:
+                                 db: AsyncSession = Depends(get_db), settings: Settings = Depends(get_settings),
+                                 if_none_match: Optional[str] = Header(None)) -> Response:
     """Get list of files to download for results."""
     if not ResultsService.subclasses:
         raise HTTPException(status_code=501, detail="Not implemented")
-    return await ResultsService.subclasses[0]().get_experiment_results(experiment_id, current_user, db)
+    return await ResultsService.subclasses[0]().get_experiment_results(experiment_id, current_user, db, settings,
+                                                                       if_none_match)
 
 
 @router.post("/{experiment_id}/results",
              responses={200: {"description": "Successful operation"}, 422: {"description": "Validation exception"}},
              tags=["experiments", "results"], summary="Upload results for an experiment.",
              response_model_by_alias=True, )
-async def upload_results(current_user: User = Depends(user_dependency),
+async def upload_results(background_tasks: BackgroundTasks, current_user: User = Depends(user_dependency),
                          experiment_id: int = Path(..., description="ID to uniquely identify an experiment."),
                          file: UploadFile = File(...), db: AsyncSession = Depends(get_db),
-                         settings: Settings = Depends(get_settings)) -> Info:
+                         settings: Settings = Depends(get_settings),
+                         sessionmaker: async_sessionmaker = Depends(get_sessionmaker)) -> Info:
     """This can only be done by the logged-in user."""
     if not ResultsService.subclasses:
         raise HTTPException(status_code=501, detail="Not implemented")
-    return await ResultsService.subclasses[0]().upload_result(experiment_id, file, db, settings, current_user)
+    return await ResultsService.subclasses[0]().upload_result(experiment_id, file, db, settings, current_user,
+                                                              sessionmaker, background_tasks)
+
+
+@router.put("/{experiment_id}/results/{filename}",
+            responses={200: {"description": "Successful operation"}, 400: {"description": "Invalid or duplicate filename"},
+                       422: {"description": "Validation exception"}},
+            tags=["experiments", "results"], summary="Upload a result file as a raw request body.",
+            response_model_by_alias=True, openapi_extra={
+                "requestBody": {"required": True,
+                                "content": {"application/octet-stream": {"schema": {"type": "string",
+                                                                                    "format": "binary"}}}}})
+async def upload_results_raw(request: Request, background_tasks: BackgroundTasks,
+                             current_user: User = Depends(user_dependency),
+                             experiment_id: int = Path(..., description="ID to uniquely identify an experiment."),
+                             filename: str = Path(..., description="Name to store the result file under."),
+                             db: AsyncSession = Depends(get_db), settings: Settings = Depends(get_settings),
+                             sessionmaker: async_sessionmaker = Depends(get_sessionmaker)) -> Info:
+    """Streams the body straight to storage without multipart parsing or spooling."""
+    if not ResultsService.subclasses:
+        raise HTTPException(status_code=501, detail="Not implemented")
+    return await ResultsService.subclasses[0]().store_result(experiment_id, filename, request.stream(), db, settings,
+                                                             current_user, sessionmaker, background_tasks)
+
+
+@router.post("/{experiment_id}/results/by-hash",
+             responses={200: {"description": "Successful operation"}, 400: {"description": "Invalid or duplicate filename"},
+                        404: {"description": "Content not stored, upload the file instead"}},
+             tags=["experiments", "results"], summary="Record a result file from already stored content.",
+             response_model_by_alias=True, )
+async def upload_results_by_hash(background_tasks: BackgroundTasks, current_user: User = Depends(user_dependency),
+                                 experiment_id: int = Path(..., description="ID to uniquely identify an experiment."),
+                                 result_input: ResultByHashInput = Body(..., description="Filename and SHA-256"),
+                                 db: AsyncSession = Depends(get_db), settings: Settings = Depends(get_settings),
+                                 sessionmaker: async_sessionmaker = Depends(get_sessionmaker)) -> Info:
+    """Skips the body transfer when the server already stores content with the same SHA-256."""
+    if not ResultsService.subclasses:
+        raise HTTPException(status_code=501, detail="Not implemented")
+    return await ResultsService.subclasses[0]().store_result_by_hash(experiment_id, result_input.filename,
+                                                                     result_input.sha256, db, settings, current_user,
+                                                                     sessionmaker, background_tasks)
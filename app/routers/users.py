@@ -1,6 +1,6 @@
 from typing import List, Optional
 
-from fastapi import APIRouter, Body, HTTPException, Path, Depends, Query
+from fastapi import APIRouter, Body, HTTPException, Path, Depends, Query, Request, Response
 from pydantic import StrictStr
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing_extensions import Annotated
@@ -12,6 +12,7 @@ from app.models.error import Error
 from app.models.user import User
 from app.models.user_input import UserInput
 from app.services.users import UsersService
+from app.services.utility.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, set_page_headers
 
 router = APIRouter(tags=["users"])
 
@@ -55,9 +56,13 @@ async def create_user(
     response_model_by_alias=True,
 )
 async def get_all_users(
+    request: Request,
+    response: Response,
     current_user: User = Depends(user_dependency),
     db: AsyncSession = Depends(get_db),
     roles: Optional[List[str]] = Query(default=None, description="Filter users by roles"),
+    cursor: Optional[StrictStr] = Query(None, description="Cursor from the previous page's X-Next-Cursor header"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Page size"),
 ) -> List[User]:
     if not UsersService.subclasses:
         raise HTTPException(status_code=501, detail="Not implemented")
@@ -69,7 +74,9 @@ async def get_all_users(
         user = await service.get_user_by_name(current_user.username, db)
         return [user] if user else []
 
-    return await service.get_all_users(db, roles=roles)
+    page = await service.get_all_users(db, roles=roles, cursor=cursor, limit=limit)
+    set_page_headers(page, request, response)
+    return page.items
 
 
 @router.get(
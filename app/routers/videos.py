@@ -1,22 +1,42 @@
 from typing import List, Optional
 
 from fastapi import APIRouter
-from fastapi import Form, UploadFile
-from fastapi.params import Depends, Path, File
+from fastapi import BackgroundTasks, Body, Form, Request, Response, UploadFile
+from fastapi.params import Depends, Header, Path, File, Query
 from pydantic import StrictStr
-from sqlalchemy.ext.asyncio import AsyncSession
-from starlette.responses import JSONResponse, FileResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from starlette.responses import JSONResponse, FileResponse, StreamingResponse
 
 from app.auth.dependencies import require_minimum_role, super_admin_dependency, user_dependency
-from app.database.database import get_db
+from app.config.settings import Settings, get_settings
+from app.database.database import get_db, get_sessionmaker
 from app.models.error import Error
+from app.models.upload_session import UploadSession, UploadSessionInput
 from app.models.user import User
+from app.models.frame_manifest import FrameManifest
+from app.models.proxy import ProxyInput, ProxyJob
 from app.models.video import Video
+from app.models.video_analysis import VideoAnalysis
+from app.models.video_input import VideoByHashInput
+from app.services.manifests import ManifestsService
+from app.services.proxies import ProxiesService
+from app.services.thumbnails import ThumbnailsService
+from app.services.uploads import VideoUploadsService
+from app.services.video_analysis import VideoAnalysisService
 from app.services.videos import VideosService
+from app.services.utility.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, set_page_headers
 
 router = APIRouter()
 
 
+def _queue_ingest_jobs(background_tasks: BackgroundTasks, video: Video, sessionmaker: async_sessionmaker,
+                       settings: Settings) -> None:
+    """Analyse, preview and checksum a newly stored video once the response has been sent."""
+    background_tasks.add_task(VideoAnalysisService().analyze_video, video.id, sessionmaker)
+    background_tasks.add_task(ThumbnailsService().generate_thumbnails, video.id, sessionmaker, settings)
+    background_tasks.add_task(ManifestsService().build_video_manifest, video.id, sessionmaker)
+
+
 @router.post("/infrastructure/videos", responses={200: {"model": Video, "description": "Video created successfully"},
                                                   400: {"model": Error, "description": "Invalid video upload data"},
                                                   415: {"model": Error,
@@ -24,37 +44,306 @@ router = APIRouter()
                                                   422: {"model": Error, "description": "Video file validation error."},
                                                   500: {"model": Error, "description": "Unexpected error"}, },
              tags=["videos"], summary="Create video", response_model_by_alias=True, )
-async def create_video(video_file: UploadFile = File(..., description="Video file to upload"),
+async def create_video(background_tasks: BackgroundTasks, video_file: UploadFile = File(..., description="Video file to upload"),
                        title: Optional[StrictStr] = Form(None), format: Optional[StrictStr] = Form(None),
                        frameRate: Optional[int] = Form(None), resolution: Optional[StrictStr] = Form(None), description: Optional[StrictStr] = Form(None), bitDepth: Optional[int] = Form(None),
-                       db: AsyncSession = Depends(get_db),
+                       chromaFormat: Optional[StrictStr] = Form(None),
+                       db: AsyncSession = Depends(get_db), settings: Settings = Depends(get_settings),
+                       sessionmaker: async_sessionmaker = Depends(get_sessionmaker),
                        current_user: User = Depends(user_dependency)) -> Video:
     """Upload a new video to the infrastructure portal (Super User access required)."""
-    return await VideosService().create_video(video_file, title, format, frameRate, resolution, description, bitDepth, current_user, db)
+    video = await VideosService().create_video(video_file, title, format, frameRate, resolution, description, bitDepth, current_user, db,
+                                               settings, chromaFormat)
+    _queue_ingest_jobs(background_tasks, video, sessionmaker, settings)
+    return video
+
+
+@router.put("/infrastructure/videos", responses={200: {"model": Video, "description": "Video created successfully"},
+                                                 400: {"model": Error, "description": "Invalid video upload data"},
+                                                 422: {"model": Error, "description": "Video file validation error."},
+                                                 500: {"model": Error, "description": "Unexpected error"}, },
+            tags=["videos"], summary="Create video from a raw request body", response_model_by_alias=True,
+            openapi_extra={"requestBody": {"required": True, "content": {
+                "application/octet-stream": {"schema": {"type": "string", "format": "binary"}}}}})
+async def create_video_raw(request: Request, background_tasks: BackgroundTasks,
+                           title: Optional[StrictStr] = Query(None), format: Optional[StrictStr] = Query(None),
+                           frameRate: Optional[int] = Query(None), resolution: Optional[StrictStr] = Query(None),
+                           description: Optional[StrictStr] = Query(None), bitDepth: Optional[int] = Query(None),
+                           chromaFormat: Optional[StrictStr] = Query(None),
+                           db: AsyncSession = Depends(get_db), settings: Settings = Depends(get_settings),
+                           sessionmaker: async_sessionmaker = Depends(get_sessionmaker),
+                           current_user: User = Depends(user_dependency)) -> Video:
+    """Upload a new video sent as the raw request body, with its metadata in query parameters."""
+    video = await VideosService().create_video_from_stream(request.stream(), title, format, frameRate, resolution,
+                                                           description, bitDepth, current_user, db, settings,
+                                                           chromaFormat)
+    _queue_ingest_jobs(background_tasks, video, sessionmaker, settings)
+    return video
+
+
+@router.post("/infrastructure/videos/by-hash",
+             responses={200: {"model": Video, "description": "Video created from stored content"},
+                        400: {"model": Error, "description": "Invalid video metadata"},
+                        404: {"model": Error, "description": "Content not stored, upload the file instead"}},
+             tags=["videos"], summary="Create video from already stored content", response_model_by_alias=True, )
+async def create_video_by_hash(background_tasks: BackgroundTasks,
+                               video_input: VideoByHashInput = Body(..., description="Video metadata and SHA-256"),
+                               db: AsyncSession = Depends(get_db), settings: Settings = Depends(get_settings),
+                               sessionmaker: async_sessionmaker = Depends(get_sessionmaker),
+                               current_user: User = Depends(user_dependency)) -> Video:
+    """Create a video without sending its body when the server already stores content with the same SHA-256."""
+    video = await VideosService().create_video_by_hash(video_input, current_user, db, settings)
+    _queue_ingest_jobs(background_tasks, video, sessionmaker, settings)
+    return video
 
 
 @router.delete("/infrastructure/videos/{id}", responses={200: {"model": Video, "description": "Video deleted"},
                                                          404: {"model": Error, "description": "Video not found"}},
                tags=["videos"], summary="Delete video", response_model_by_alias=True, )
 async def delete_video(id: StrictStr = Path(..., description=""), db: AsyncSession = Depends(get_db),
+                       settings: Settings = Depends(get_settings),
                        current_user: User = Depends(super_admin_dependency)) -> JSONResponse:
     """Delete a specific video by ID (Super User access required)."""
-    return await VideosService().delete_video(id, db)
+    return await VideosService().delete_video(id, db, settings)
 
 
 @router.get("/infrastructure/videos/{id}", responses={200: {"model": Video, "description": "Video details"},
                                                       404: {"model": Error, "description": "Video not found"}},
             tags=["videos"], summary="Retrieve video", response_model_by_alias=True, response_class=FileResponse)
-async def get_video(id: StrictStr = Path(..., description=""), db: AsyncSession = Depends(get_db),
+async def get_video(id: StrictStr = Path(..., description=""),
+                    format: Optional[StrictStr] = Query(None, pattern="^(y4m|yuv)$",
+                                                        description="Convert to this format, defaults to the stored one"),
+                    db: AsyncSession = Depends(get_db),
+                    settings: Settings = Depends(get_settings),
                     current_user: User = Depends(user_dependency)) -> FileResponse:
-    """Fetch a specific video by ID."""
-    return await VideosService().get_video(id, db)
+    """Fetch a specific video by ID. Byte ranges are supported for partial and parallel downloads."""
+    return await VideosService().get_video(id, db, format, settings)
+
+
+@router.get("/infrastructure/videos/{id}/frames/{n}",
+            responses={200: {"content": {"image/png": {}, "image/jpeg": {}}, "description": "Rendered frame"},
+                       404: {"model": Error, "description": "Video or frame not found"}},
+            tags=["videos"], summary="Retrieve a single video frame as an image", response_class=Response)
+async def get_video_frame(id: StrictStr = Path(..., description=""),
+                          n: int = Path(..., ge=0, description="Zero-based frame number"),
+                          format: StrictStr = Query("png", pattern="^(png|jpeg)$", description="Image format"),
+                          db: AsyncSession = Depends(get_db),
+                          current_user: User = Depends(user_dependency)) -> Response:
+    """Preview one frame without downloading the video."""
+    return await VideosService().get_video_frame(id, n, format, db)
+
+
+@router.get("/infrastructure/videos/{id}/thumbnails/{n}",
+            responses={200: {"content": {"image/jpeg": {}}, "description": "Thumbnail image"},
+                       404: {"model": Error, "description": "Video or thumbnail not found"}},
+            tags=["videos"], summary="Retrieve a video thumbnail", response_class=FileResponse)
+async def get_video_thumbnail(id: StrictStr = Path(..., description=""),
+                              n: int = Path(..., ge=0, description="Thumbnail number, in frame order"),
+                              db: AsyncSession = Depends(get_db), settings: Settings = Depends(get_settings),
+                              current_user: User = Depends(user_dependency)) -> FileResponse:
+    """Downscaled JPEG of one of a few evenly spaced frames of the video."""
+    return await ThumbnailsService().get_thumbnail(id, n, db, settings)
+
+
+@router.get("/infrastructure/videos/{id}/contact-sheet",
+            responses={200: {"content": {"image/jpeg": {}}, "description": "Contact sheet image"},
+                       404: {"model": Error, "description": "Video not found"}},
+            tags=["videos"], summary="Retrieve a contact sheet of video thumbnails", response_class=FileResponse)
+async def get_video_contact_sheet(id: StrictStr = Path(..., description=""), db: AsyncSession = Depends(get_db),
+                                  settings: Settings = Depends(get_settings),
+                                  current_user: User = Depends(user_dependency)) -> FileResponse:
+    """All of the video's thumbnails tiled into one JPEG."""
+    return await ThumbnailsService().get_contact_sheet(id, db, settings)
+
+
+@router.get("/infrastructure/videos/{id}/manifest",
+            responses={200: {"model": FrameManifest, "description": "Per-frame MD5 checksums"},
+                       404: {"model": Error, "description": "Video not found"}},
+            tags=["videos"], summary="Retrieve per-frame checksums of a video", response_model_by_alias=True, )
+async def get_video_manifest(id: StrictStr = Path(..., description=""), db: AsyncSession = Depends(get_db),
+                             current_user: User = Depends(user_dependency)) -> FrameManifest:
+    """MD5 of each frame's pixel data, computed when the video was stored."""
+    return await ManifestsService().get_video_manifest(id, db)
+
+
+@router.post("/infrastructure/videos/{id}/proxies", status_code=202,
+             responses={202: {"model": ProxyJob, "description": "Proxy generation queued"},
+                        400: {"model": Error, "description": "Invalid proxy settings"},
+                        404: {"model": Error, "description": "Video not found"}},
+             tags=["videos"], summary="Generate a downscaled proxy of a video", response_model_by_alias=True, )
+async def create_video_proxy(background_tasks: BackgroundTasks, id: StrictStr = Path(..., description=""),
+                             proxy_input: ProxyInput = Body(ProxyInput(), description="Scale and bit depth"),
+                             db: AsyncSession = Depends(get_db), settings: Settings = Depends(get_settings),
+                             sessionmaker: async_sessionmaker = Depends(get_sessionmaker),
+                             current_user: User = Depends(user_dependency)) -> ProxyJob:
+    """Queue generation of a 1/2, 1/4 or 1/8 size Y4M proxy, optionally reduced to 8-bit. Poll the returned job
+    for progress; once complete the proxy is listed under the video's proxies."""
+    return await ProxiesService().create_proxy_job(id, proxy_input, current_user, db, sessionmaker, settings,
+                                                   background_tasks)
+
+
+@router.get("/infrastructure/videos/{id}/proxies",
+            responses={200: {"model": List[Video], "description": "Proxies of the video"},
+                       404: {"model": Error, "description": "Video not found"}},
+            tags=["videos"], summary="List the downscaled proxies of a video", response_model_by_alias=True, )
+async def get_video_proxies(id: StrictStr = Path(..., description=""), db: AsyncSession = Depends(get_db),
+                            current_user: User = Depends(user_dependency)) -> List[Video]:
+    """Proxies generated from the video, smallest scale factor first."""
+    return await ProxiesService().get_proxies(id, db)
+
+
+@router.get("/infrastructure/videos/{id}/proxies/jobs/{job_id}",
+            responses={200: {"model": ProxyJob, "description": "Proxy job progress"},
+                       404: {"model": Error, "description": "Proxy job not found"}},
+            tags=["videos"], summary="Retrieve the progress of a proxy job", response_model_by_alias=True, )
+async def get_video_proxy_job(id: StrictStr = Path(..., description=""),
+                              job_id: int = Path(..., description="ID of the proxy job"),
+                              db: AsyncSession = Depends(get_db),
+                              current_user: User = Depends(user_dependency)) -> ProxyJob:
+    """Status and number of frames written so far."""
+    return await ProxiesService().get_proxy_job(id, job_id, db)
+
+
+@router.get("/infrastructure/videos/{id}/clip",
+            responses={200: {"content": {"video/x-yuv4mpeg": {}, "application/octet-stream": {}},
+                             "description": "Frames of the video as Y4M or raw YUV"},
+                       400: {"model": Error, "description": "Invalid frame range"},
+                       404: {"model": Error, "description": "Video not found"}},
+            tags=["videos"], summary="Retrieve a range of video frames", response_class=StreamingResponse)
+async def get_video_clip(id: StrictStr = Path(..., description=""),
+                         start: int = Query(0, ge=0, description="First frame, zero-based"),
+                         end: Optional[int] = Query(None, ge=1, description="Frame to stop before, defaults to the end"),
+                         step: int = Query(1, ge=1, description="Take every step-th frame"),
+                         format: Optional[StrictStr] = Query(None, pattern="^(y4m|yuv)$",
+                                                             description="Output format, defaults to the stored one"),
+                         db: AsyncSession = Depends(get_db),
+                         current_user: User = Depends(user_dependency)) -> StreamingResponse:
+    """Stream part of a video without downloading all of it or writing a copy on the server."""
+    return await VideosService().get_video_clip(id, start, end, step, format, db)
 
 
 @router.get("/infrastructure/videos", responses={200: {"model": List[Video], "description": "A list of videos"},
                                                  404: {"description": "No videos found"}}, tags=["videos"],
             summary="Retrieve videos list", response_model_by_alias=True, )
-async def get_videos(db: AsyncSession = Depends(get_db), current_user: User = Depends(user_dependency)) -> \
+async def get_videos(request: Request, response: Response,
+                     minSi: Optional[float] = Query(None, description="Only videos with at least this SI"),
+                     maxSi: Optional[float] = Query(None, description="Only videos with at most this SI"),
+                     minTi: Optional[float] = Query(None, description="Only videos with at least this TI"),
+                     maxTi: Optional[float] = Query(None, description="Only videos with at most this TI"),
+                     sort: Optional[StrictStr] = Query(None, description="Column to sort by, prefix with - to reverse "
+                                                                         "(e.g. -siMax)"),
+                     cursor: Optional[StrictStr] = Query(None, description="Cursor from the previous page's "
+                                                                           "X-Next-Cursor header"),
+                     limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Page size"),
+                     db: AsyncSession = Depends(get_db), current_user: User = Depends(user_dependency)) -> \
         List[Video]:
-    """Fetch a list of all available videos."""
-    return await VideosService().get_videos(db)
+    """Fetch a page of available videos. SI and TI filters apply to the P.910 values, the maxima over frames,
+    and leave out videos whose analysis has not finished. Pass the X-Next-Cursor header back with the same filters
+    and sort to get the next page."""
+    page = await VideosService().get_videos(db, minSi, maxSi, minTi, maxTi, sort, cursor, limit)
+    set_page_headers(page, request, response)
+    return page.items
+
+
+@router.get("/infrastructure/videos/{id}/analysis",
+            responses={200: {"model": VideoAnalysis, "description": "SI/TI of the video"},
+                       404: {"model": Error, "description": "Video not found"}},
+            tags=["videos"], summary="Retrieve spatial and temporal information of a video",
+            response_model_by_alias=True, )
+async def get_video_analysis(id: StrictStr = Path(..., description=""), db: AsyncSession = Depends(get_db),
+                             current_user: User = Depends(user_dependency)) -> VideoAnalysis:
+    """Summary and per-frame SI/TI, computed in the background when the video was stored."""
+    return await VideoAnalysisService().get_analysis(id, db)
+
+
+@router.post("/infrastructure/videos/{id}/analysis", status_code=202,
+             responses={202: {"description": "Analysis queued"},
+                        404: {"model": Error, "description": "Video not found"}},
+             tags=["videos"], summary="Recompute spatial and temporal information of a video")
+async def analyze_video(background_tasks: BackgroundTasks, id: StrictStr = Path(..., description=""),
+                        db: AsyncSession = Depends(get_db), sessionmaker: async_sessionmaker = Depends(get_sessionmaker),
+                        current_user: User = Depends(super_admin_dependency)) -> JSONResponse:
+    """Queue SI/TI analysis, for videos stored before it was introduced or whose analysis failed (Super User access
+    required)."""
+    return await VideoAnalysisService().queue_analysis(id, db, sessionmaker, background_tasks)
+
+
+@router.post("/infrastructure/videos/uploads", status_code=201,
+             responses={201: {"model": UploadSession, "description": "Upload session created"},
+                        400: {"model": Error, "description": "Invalid video metadata"}},
+             tags=["videos"], summary="Start resumable video upload", response_model_by_alias=True, )
+async def create_video_upload(response: Response,
+                              upload_input: UploadSessionInput = Body(..., description="Video metadata and total length"),
+                              db: AsyncSession = Depends(get_db), settings: Settings = Depends(get_settings),
+                              current_user: User = Depends(user_dependency)) -> UploadSession:
+    """Start a resumable upload. Send the file with PATCH requests, then complete it to create the video."""
+    session = await VideoUploadsService().create_upload(upload_input, current_user, db, settings)
+    response.headers["Location"] = f"/infrastructure/videos/uploads/{session.id}"
+    response.headers["Upload-Offset"] = str(session.offset)
+    return session
+
+
+@router.head("/infrastructure/videos/uploads/{upload_id}",
+             responses={200: {"description": "Current offset in the Upload-Offset header"},
+                        404: {"model": Error, "description": "Upload not found"}},
+             tags=["videos"], summary="Query resumable upload offset")
+async def head_video_upload(upload_id: StrictStr = Path(..., description=""), db: AsyncSession = Depends(get_db),
+                            current_user: User = Depends(user_dependency)) -> Response:
+    """Report how many bytes of the upload have been received."""
+    session = await VideoUploadsService().get_upload(upload_id, current_user, db)
+    return Response(headers={"Upload-Offset": str(session.offset), "Upload-Length": str(session.length),
+                             "Cache-Control": "no-store"})
+
+
+@router.get("/infrastructure/videos/uploads/{upload_id}",
+            responses={200: {"model": UploadSession, "description": "Upload session"},
+                       404: {"model": Error, "description": "Upload not found"}},
+            tags=["videos"], summary="Retrieve resumable upload", response_model_by_alias=True, )
+async def get_video_upload(upload_id: StrictStr = Path(..., description=""), db: AsyncSession = Depends(get_db),
+                           current_user: User = Depends(user_dependency)) -> UploadSession:
+    """Fetch the state of a resumable upload."""
+    return await VideoUploadsService().get_upload(upload_id, current_user, db)
+
+
+@router.patch("/infrastructure/videos/uploads/{upload_id}", status_code=204,
+              responses={204: {"description": "Chunk stored, new offset in the Upload-Offset header"},
+                         404: {"model": Error, "description": "Upload not found"},
+                         409: {"model": Error, "description": "Upload-Offset does not match the received bytes"},
+                         413: {"model": Error, "description": "Chunk exceeds the declared upload length"},
+                         423: {"model": Error, "description": "Another request is writing to the upload"}},
+              tags=["videos"], summary="Upload a chunk of a resumable video upload")
+async def patch_video_upload(request: Request, upload_id: StrictStr = Path(..., description=""),
+                             upload_offset: int = Header(..., ge=0, description="Byte offset of this chunk"),
+                             db: AsyncSession = Depends(get_db),
+                             current_user: User = Depends(user_dependency)) -> Response:
+    """Append the raw request body to the upload at Upload-Offset."""
+    session = await VideoUploadsService().append_chunk(upload_id, upload_offset, request.stream(), current_user, db)
+    return Response(status_code=204, headers={"Upload-Offset": str(session.offset)})
+
+
+@router.post("/infrastructure/videos/uploads/{upload_id}/complete",
+             responses={200: {"model": Video, "description": "Video created successfully"},
+                        404: {"model": Error, "description": "Upload not found"},
+                        409: {"model": Error, "description": "Upload incomplete"},
+                        422: {"model": Error, "description": "Video file validation error."},
+                        423: {"model": Error, "description": "Another request is writing to the upload"}},
+             tags=["videos"], summary="Complete resumable video upload", response_model_by_alias=True, )
+async def complete_video_upload(background_tasks: BackgroundTasks, upload_id: StrictStr = Path(..., description=""),
+                                db: AsyncSession = Depends(get_db), settings: Settings = Depends(get_settings),
+                                sessionmaker: async_sessionmaker = Depends(get_sessionmaker),
+                                current_user: User = Depends(user_dependency)) -> Video:
+    """Create the video from a fully received upload."""
+    video = await VideoUploadsService().complete_upload(upload_id, current_user, db, settings)
+    _queue_ingest_jobs(background_tasks, video, sessionmaker, settings)
+    return video
+
+
+@router.delete("/infrastructure/videos/uploads/{upload_id}", status_code=204,
+               responses={204: {"description": "Upload cancelled"},
+                          404: {"model": Error, "description": "Upload not found"}},
+               tags=["videos"], summary="Cancel resumable video upload")
+async def delete_video_upload(upload_id: StrictStr = Path(..., description=""), db: AsyncSession = Depends(get_db),
+                              current_user: User = Depends(user_dependency)) -> Response:
+    """Cancel a resumable upload and discard the received bytes."""
+    await VideoUploadsService().delete_upload(upload_id, current_user, db)
+    return Response(status_code=204)
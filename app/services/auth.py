@@ -3,16 +3,15 @@ from typing import ClassVar, Tuple, Optional
 
 from jose import jwt, JWTError
 from fastapi import HTTPException, status
-from passlib.context import CryptContext
 
 from app.auth.config import ALGORITHM, SECRET_KEY, RESET_TOKEN_EXPIRE_MINUTES, RESET_PASSWORD_SECRET_KEY
+from app.auth.hashing import password_hasher
 from app.models.login_request import LoginRequest
 from app.models.login_response import LoginResponse
 from app.models.user import User
 from app.services.users import SqliteUsersService
 
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
 class BaseAuthApi:
@@ -22,11 +21,11 @@ class BaseAuthApi:
         super().__init_subclass__(**kwargs)
         BaseAuthApi.subclasses += (cls,)
 
-    def verify_password(self, plain_password: str, hashed_password: str) -> bool:
-        return pwd_context.verify(plain_password, hashed_password)
+    async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        return await password_hasher.verify(plain_password, hashed_password)
 
-    def get_password_hash(self, password: str) -> str:
-        return pwd_context.hash(password)
+    async def get_password_hash(self, password: str) -> str:
+        return await password_hasher.hash(password)
 
     def create_access_token(self, data: dict, expires_delta: Optional[timedelta] = None) -> str:
         to_encode = data.copy()
@@ -42,7 +41,7 @@ class AuthService(BaseAuthApi):
     async def login_user(self, login_request: LoginRequest, db) -> LoginResponse:
         """Authenticate a user with username and password."""
         user: Optional[User] = await SqliteUsersService().get_user_by_name(login_request.username, db)
-        if not user or not self.verify_password(login_request.password, user.password):
+        if not user or not await self.verify_password(login_request.password, user.password):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid username or password"
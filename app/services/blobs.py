@@ -0,0 +1,53 @@
+import logging
+from typing import Iterable
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config.settings import Settings
+from app.database.tables.experiments import Experiment
+from app.database.tables.results import ExperimentResult
+from app.database.tables.videos import InputVideo
+from app.models.user import User
+from app.services.utility.blobs import BlobStore
+
+logger = logging.getLogger(__name__)
+
+
+class BlobsService:
+    """
+    Reference counting for the content-addressed blob store.
+
+    A blob is referenced by every ``InputVideo`` and ``ExperimentResult`` row carrying its digest. Counts are
+    derived from those rows rather than stored, so they can never drift from the data.
+    """
+
+    async def reference_count(self, sha256: str, db: AsyncSession) -> int:
+        videos = await db.scalar(select(func.count()).select_from(InputVideo).where(InputVideo.sha256 == sha256))
+        results = await db.scalar(
+            select(func.count()).select_from(ExperimentResult).where(ExperimentResult.sha256 == sha256))
+        return videos + results
+
+    async def blob_exists(self, sha256: str, db: AsyncSession, settings: Settings, current_user: User) -> bool:
+        """
+        Whether the blob is stored and ``current_user`` could already read it: catalog videos are readable by everyone,
+        results only by their experiment's owner and admins. Content the user cannot read is reported as missing, so
+        the digest cannot be used to learn of, or attach, somebody else's files.
+        """
+        return BlobStore.for_settings(settings).exists(sha256) and await self._readable_by(sha256, current_user, db)
+
+    async def _readable_by(self, sha256: str, current_user: User, db: AsyncSession) -> bool:
+        if await db.scalar(select(InputVideo.id).where(InputVideo.sha256 == sha256).limit(1)) is not None:
+            return True
+        query = select(ExperimentResult.id).where(ExperimentResult.sha256 == sha256)
+        if current_user.role not in ('admin', 'super_admin'):
+            query = query.join(ExperimentResult.experiment).where(Experiment.owner_id == current_user.id)
+        return await db.scalar(query.limit(1)) is not None
+
+    async def release_blobs(self, digests: Iterable[str], db: AsyncSession, settings: Settings) -> None:
+        """Remove the blobs for ``digests`` that are no longer referenced. Call after the deleting commit."""
+        store = BlobStore.for_settings(settings)
+        for sha256 in set(filter(None, digests)):
+            if await self.reference_count(sha256, db) == 0:
+                logger.info(f"Removing unreferenced blob: {sha256}")
+                store.remove(sha256)
@@ -0,0 +1,108 @@
+from typing import Any, ClassVar, Dict, List, Optional, Tuple, Union
+
+from fastapi import HTTPException
+from pydantic import BaseModel
+from sqlalchemy import delete, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import lazyload, selectinload
+
+from app.database.tables.changes import ChangeLogEntry
+from app.database.tables.encoders import Encoders as EncoderTable
+from app.database.tables.experiments import Experiment as ExperimentTable, ExperimentSequence
+from app.database.tables.network import Network as NetworkTable
+from app.database.tables.results import ExperimentResult
+from app.database.tables.videos import InputVideo
+from app.models.change import Change, ChangeEntity, ChangeOperation, ChangeSet
+from app.models.encoder import Encoder
+from app.models.experiment import Experiment
+from app.models.network import Network
+from app.models.result_file import ResultFile
+from app.models.user import User
+from app.models.video import Video
+from app.services.utility.pagination import DEFAULT_PAGE_SIZE
+
+# how each kind of entity is looked up and which model it is returned as, the same as its own endpoints return it
+SOURCES = {
+    ChangeEntity.EXPERIMENT: (ExperimentTable.id, lambda: select(ExperimentTable).options(
+        lazyload(ExperimentTable.result_files),
+        selectinload(ExperimentTable.sequences).selectinload(ExperimentSequence.network_topology),
+        selectinload(ExperimentTable.sequences).selectinload(ExperimentSequence.network_disruption_profile)),
+                              Experiment),
+    ChangeEntity.VIDEO: (InputVideo.id, lambda: select(InputVideo), Video),
+    ChangeEntity.NETWORK: (NetworkTable.network_profile_id, lambda: select(NetworkTable), Network),
+    ChangeEntity.ENCODER: (EncoderTable.id, lambda: select(EncoderTable), Encoder),
+    ChangeEntity.RESULT: (ExperimentResult.id, lambda: select(ExperimentResult), ResultFile),
+}
+
+
+class ChangesService:
+    """
+    A log of inserted, updated and deleted entities that clients poll with a cursor to keep a local copy of the
+    experiment, video, network, encoder and result lists without downloading them again.
+    """
+    subclasses: ClassVar[Tuple] = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        ChangesService.subclasses = ChangesService.subclasses + (cls,)
+
+    async def record(self, entity: ChangeEntity, entity_id: Union[int, str], operation: ChangeOperation,
+                     db: AsyncSession, owner_id: Optional[int] = None) -> None:
+        """
+        Log a change in the caller's transaction, so it is committed with the write it describes. The entity's
+        previous entry is replaced: clients only need its latest state.
+        """
+        await db.execute(delete(ChangeLogEntry).where(ChangeLogEntry.entity == entity.value,
+                                                      ChangeLogEntry.entity_id == str(entity_id)))
+        db.add(ChangeLogEntry(entity=entity.value, entity_id=str(entity_id), operation=operation.value,
+                              owner_id=owner_id))
+
+    async def get_changes(self, since: Optional[str], current_user: User, db: AsyncSession,
+                          limit: int = DEFAULT_PAGE_SIZE) -> ChangeSet:
+        """
+        Changes committed after ``since``, oldest first, each entity with its current state. Without a cursor the
+        log is read from the start, which lists every entity. Users only see changes to their own experiments.
+        """
+        position = self._parse_cursor(since)
+        query = select(ChangeLogEntry).where(ChangeLogEntry.id > position)
+        if current_user.role == "user":
+            query = query.where(or_(ChangeLogEntry.owner_id.is_(None), ChangeLogEntry.owner_id == current_user.id))
+        result = await db.execute(query.order_by(ChangeLogEntry.id).limit(limit + 1))
+        entries = list(result.scalars().all())
+        has_more = len(entries) > limit
+        entries = entries[:limit]
+
+        data = await self._load(entries, db)
+        changes = []
+        for entry in entries:
+            key = (entry.entity, entry.entity_id)
+            if entry.operation != ChangeOperation.DELETE.value and key not in data:
+                # deleted since this entry was read; its delete is further along the log
+                continue
+            changes.append(Change(seq=entry.id, entity=entry.entity, id=entry.entity_id, operation=entry.operation,
+                                  data=data.get(key)))
+        return ChangeSet(changes=changes, cursor=str(entries[-1].id if entries else position), has_more=has_more)
+
+    async def _load(self, entries: List[ChangeLogEntry], db: AsyncSession) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """The current state of every inserted or updated entity in ``entries``, one query per kind of entity."""
+        wanted: Dict[ChangeEntity, List[str]] = {}
+        for entry in entries:
+            if entry.operation != ChangeOperation.DELETE.value:
+                wanted.setdefault(ChangeEntity(entry.entity), []).append(entry.entity_id)
+
+        data = {}
+        for entity, ids in wanted.items():
+            column, query, model = SOURCES[entity]
+            result = await db.execute(query().where(column.in_([column.type.python_type(i) for i in ids])))
+            for row in result.scalars().all():
+                item: BaseModel = model.model_validate(row, from_attributes=True)
+                data[(entity.value, str(getattr(row, column.key)))] = item.model_dump(mode="json", by_alias=True)
+        return data
+
+    @staticmethod
+    def _parse_cursor(since: Optional[str]) -> int:
+        if since is None:
+            return 0
+        if not since.isdigit():
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        return int(since)
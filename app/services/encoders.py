@@ -1,7 +1,7 @@
 import json
 import uuid
 from typing import ClassVar, Tuple
-from typing import List, Optional
+from typing import Optional
 
 from fastapi import HTTPException
 from pydantic import Field, StrictInt
@@ -11,8 +11,11 @@ from starlette.responses import JSONResponse
 from typing_extensions import Annotated
 
 from app.database.tables.encoders import Encoders as encoder_table
+from app.models.change import ChangeEntity, ChangeOperation
 from app.models.encoder import Encoder
 from app.models.encoder_input import EncoderInput
+from app.services.changes import ChangesService
+from app.services.utility.pagination import DEFAULT_PAGE_SIZE, Page, paginate
 
 
 class EncodersService:
@@ -46,6 +49,7 @@ class EncodersService:
 
         db_obj = encoder_table(**data)
         db.add(db_obj)
+        await ChangesService().record(ChangeEntity.ENCODER, db_obj.id, ChangeOperation.INSERT, db)
         await db.commit()
         await db.refresh(db_obj)
         return JSONResponse(status_code=200, content={"message": "Encoder created successfully"})
@@ -59,6 +63,7 @@ class EncodersService:
             raise HTTPException(status_code=404, detail="Encoder not found")
 
         await db.delete(encoder_info)
+        await ChangesService().record(ChangeEntity.ENCODER, encoder_info.id, ChangeOperation.DELETE, db)
         await db.commit()
         return JSONResponse(status_code=200, content={"message": "Encoder deleted"})
 
@@ -72,15 +77,9 @@ class EncodersService:
 
         return encoder
 
-    async def get_encoders(self, db) -> List[Encoder]:
-        """Fetch a list of all encoders."""
-        db_obj = await db.execute(select(encoder_table))
-        all_encoders = db_obj.scalars()
-
-        if not all_encoders:
-            return []
-
-        return all_encoders
+    async def get_encoders(self, db, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE) -> Page:
+        """Fetch a page of encoders, ordered by ID."""
+        return await paginate(select(encoder_table), ((encoder_table.id, False),), cursor, limit, db, "encoders")
 
     async def update_encoder(self, id: StrictStr, db, encoder_input: Annotated[
         Optional[EncoderInput], Field(description="Encoder object to be added to the store")], ) -> JSONResponse:
@@ -103,6 +102,7 @@ class EncodersService:
             setattr(encoder, key, value)
 
         # Step 4: Commit changes
+        await ChangesService().record(ChangeEntity.ENCODER, encoder.id, ChangeOperation.UPDATE, db)
         await db.commit()
         await db.refresh(encoder)
 
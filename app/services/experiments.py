@@ -1,20 +1,105 @@
-from datetime import datetime
-from typing import Optional, ClassVar, Tuple, List
+from typing import Any, Dict, Optional, ClassVar, Tuple, List, Union
 
 from fastapi import HTTPException
-from pydantic import Field, StrictStr
+from pydantic import Field, StrictStr, TypeAdapter
 from sqlalchemy import delete
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy.orm import joinedload, lazyload, noload, selectinload
 from starlette.responses import JSONResponse
 from typing_extensions import Annotated
 
 from sqlalchemy.exc import IntegrityError
+from app.config.settings import Settings
 from app.database.tables.experiments import Experiment as ExperimentTable, ExperimentSequence
+from app.database.tables.manifests import FrameManifest
+from app.database.tables.quality import QualityMetric
 from app.models.experiment import Experiment, ExperimentStatus, ExperimentInput, ExperimentUpdateInput
-from app.models.experiment_sequence import ExperimentSequenceInput
+from app.models.change import ChangeEntity, ChangeOperation
+from app.models.experiment_filter import ExperimentFilter
+from app.models.experiment_sequence import ExperimentSequence as ExperimentSequenceModel, ExperimentSequenceInput
+from app.services.blobs import BlobsService
+from app.services.changes import ChangesService
 from app.services.users import UsersService
+from app.services.utility.archive_cache import ArchiveCache
+from app.services.utility.pagination import DEFAULT_PAGE_SIZE, Page, paginate
+
+# keys the experiment list may be sorted by, ascending or with a leading "-" for descending
+SORT_FIELDS = {"Id": ExperimentTable.id, "ExperimentName": ExperimentTable.experiment_name,
+               "status": ExperimentTable.status, "CreatedAt": ExperimentTable.created_at,
+               "UpdatedAt": ExperimentTable.updated_at, "OwnerId": ExperimentTable.owner_id}
+
+
+class ExperimentFieldset:
+    """
+    The parts of an experiment a client asked for. ``fields`` lists top-level attributes by their JSON names and
+    ``include`` the relationships to expand: ``Sequences``, ``Sequences.NetworkTopology`` and
+    ``Sequences.NetworkDisruptionProfile``. Naming ``Sequences`` in ``fields`` includes them too.
+
+    Only the chosen columns are selected and only included relationships are loaded. ``Id`` is always returned.
+    """
+    FIELDS = {"Id": "id", "ExperimentName": "experiment_name", "Description": "description", "status": "status",
+              "CreatedAt": "created_at", "UpdatedAt": "updated_at", "OwnerId": "owner_id"}
+    NETWORKS = {"NetworkTopology": "network_topology", "NetworkDisruptionProfile": "network_disruption_profile"}
+    _ADAPTERS = {name: TypeAdapter(Experiment.model_fields[attribute].annotation)
+                 for name, attribute in FIELDS.items()}
+
+    def __init__(self, fields: List[str], sequences: bool, networks: List[str]):
+        self.fields = fields
+        self.sequences = sequences
+        self.networks = networks
+
+    @classmethod
+    def parse(cls, fields: Optional[str], include: Optional[str]) -> Optional["ExperimentFieldset"]:
+        """None when neither parameter is given, which keeps the full experiment with every relationship."""
+        if fields is None and include is None:
+            return None
+        names = {name.lower(): name for name in cls.FIELDS}
+        requested = cls._split(fields) if fields is not None else list(cls.FIELDS)
+        includes = cls._split(include)
+        if "sequences" in (name.lower() for name in requested):
+            requested = [name for name in requested if name.lower() != "sequences"]
+            includes.append("Sequences")
+
+        unknown = [name for name in requested if name.lower() not in names]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields {', '.join(unknown)}; experiments have "
+                                                        f"{', '.join([*cls.FIELDS, 'Sequences'])}")
+        networks = []
+        for name in includes:
+            relation, _, network = name.partition(".")
+            if relation.lower() != "sequences" or (network and network not in cls.NETWORKS):
+                raise HTTPException(status_code=400, detail=f"Cannot include {name}; experiments can include "
+                                                            f"Sequences, Sequences.NetworkTopology and "
+                                                            f"Sequences.NetworkDisruptionProfile")
+            if network:
+                networks.append(cls.NETWORKS[network])
+        selected = {"Id", *(names[name.lower()] for name in requested)}
+        return cls([name for name in cls.FIELDS if name in selected], bool(includes), networks)
+
+    @staticmethod
+    def _split(names: Optional[str]) -> List[str]:
+        return [name.strip() for name in (names or "").split(",") if name.strip()]
+
+    def query(self, *sort_columns):
+        # the owner is always selected, for the access check, and the sort columns for the cursor, even when they are
+        # not returned
+        attributes = {self.FIELDS[name] for name in self.fields} | {"owner_id"} | {c.key for c in sort_columns}
+        return select(*(getattr(ExperimentTable, attribute) for attribute in self.FIELDS.values()
+                        if attribute in attributes))
+
+    def sequence_options(self) -> list:
+        return [selectinload(getattr(ExperimentSequence, attribute)) if attribute in self.networks
+                else noload(getattr(ExperimentSequence, attribute)) for attribute in self.NETWORKS.values()]
+
+    def dump(self, row, sequences: List[ExperimentSequence]) -> Dict[str, Any]:
+        experiment = {name: self._ADAPTERS[name].dump_python(
+            self._ADAPTERS[name].validate_python(getattr(row, self.FIELDS[name])), mode="json") for name in self.fields}
+        if self.sequences:
+            excluded = {attribute for attribute in self.NETWORKS.values() if attribute not in self.networks}
+            experiment["Sequences"] = [ExperimentSequenceModel.model_validate(sequence).model_dump(
+                by_alias=True, mode="json", exclude=excluded) for sequence in sequences]
+        return experiment
 
 
 class ExperimentsService:
@@ -33,65 +118,131 @@ class ExperimentsService:
         existing = result.scalars().first()
         if existing:
             raise HTTPException(status_code=400, detail="Experiment name already exists")
-        # Create and save experiment
+        # Create and save the experiment with its nested sequences, in the same transaction as its change
         experiment = ExperimentTable(
             **{**experiment_input.model_dump(), "owner_id": user_id, "status": ExperimentStatus.PENDING,
-               "created_at": datetime.now(), "sequences": []})
+               "sequences": [ExperimentSequence(**sequence.model_dump()) for sequence in experiment_input.sequences]})
         db.add(experiment)
-        await db.commit()
-        await db.refresh(experiment)
-
-        # Create nested sequences
-        for sequence in experiment_input.sequences:
-            db_sequence = ExperimentSequence(**{**sequence.model_dump(), "parent_experiment_id": experiment.id})
-            db.add(db_sequence)
+        await db.flush()
+        await ChangesService().record(ChangeEntity.EXPERIMENT, experiment.id, ChangeOperation.INSERT, db,
+                                      owner_id=experiment.owner_id)
         await db.commit()
 
         return Experiment.model_validate(await self.get_experiment(experiment.id, db))
 
     async def delete_experiment(self, experiment_id: Annotated[
-        StrictStr, Field(description="ID to uniquely identify an experiment.")], user_id: int, db: AsyncSession) -> JSONResponse:
+        StrictStr, Field(description="ID to uniquely identify an experiment.")], user_id: int, db: AsyncSession,
+                                settings: Settings) -> JSONResponse:
         db_experiment = await self._get_experiment_for_update(experiment_id, user_id, db)
+        digests = [result.sha256 for result in db_experiment.result_files]
 
+        await db.execute(delete(QualityMetric).where(QualityMetric.experiment_id == db_experiment.id))
+        await db.execute(delete(FrameManifest).where(
+            FrameManifest.result_id.in_([result.id for result in db_experiment.result_files])))
         await db.delete(db_experiment)
+        changes = ChangesService()
+        for result in db_experiment.result_files:
+            await changes.record(ChangeEntity.RESULT, result.id, ChangeOperation.DELETE, db,
+                                 owner_id=db_experiment.owner_id)
+        await changes.record(ChangeEntity.EXPERIMENT, db_experiment.id, ChangeOperation.DELETE, db,
+                             owner_id=db_experiment.owner_id)
         await db.commit()
+        await BlobsService().release_blobs(digests, db, settings)
+        ArchiveCache.for_settings(settings).invalidate(db_experiment.id)
         return JSONResponse(status_code=200, content={"message": "Experiment deleted"})
 
     async def get_experiment(self, experiment_id: Annotated[
         StrictStr, Field(description="ID to uniquely identify an experiment.")], db: AsyncSession,
-                             user_id: Optional[int] = None) -> Experiment:
-        result = await db.execute(select(ExperimentTable).options(
-            selectinload(ExperimentTable.sequences).selectinload(ExperimentSequence.network_topology),
-            selectinload(ExperimentTable.sequences).selectinload(ExperimentSequence.network_disruption_profile)).where(
-            ExperimentTable.id == experiment_id))
-        db_obj = result.scalars().first()
+                             user_id: Optional[int] = None,
+                             fieldset: Optional[ExperimentFieldset] = None) -> Union[Experiment, Dict[str, Any]]:
+        """The full experiment, or only the parts in ``fieldset`` as a JSON-ready dict."""
+        query = self._experiments_query() if fieldset is None else fieldset.query()
+        result = await db.execute(query.where(ExperimentTable.id == experiment_id))
+        db_obj = result.scalars().first() if fieldset is None else result.first()
         if not db_obj:
             raise HTTPException(status_code=404, detail="Experiment not found")
 
         if user_id and db_obj.owner_id != user_id:
             raise HTTPException(status_code=403, detail="Not authorized to access this experiment")
 
+        if fieldset is not None:
+            return (await self._dump_fieldset([db_obj], fieldset, db))[0]
         return Experiment.model_validate(db_obj, from_attributes=True)
 
     async def get_experiments(self, user_id: Annotated[StrictStr, Field(description="ID to uniquely identify a user.")],
-                              db: AsyncSession) -> List[Experiment]:
-        result = await db.execute(select(ExperimentTable).options(
-            selectinload(ExperimentTable.sequences).selectinload(ExperimentSequence.network_topology),
-            selectinload(ExperimentTable.sequences).selectinload(ExperimentSequence.network_disruption_profile)).where(
-            ExperimentTable.owner_id == user_id))
-        db_objs = result.unique().scalars().all()
+                              db: AsyncSession, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE,
+                              fieldset: Optional[ExperimentFieldset] = None,
+                              filters: Optional[ExperimentFilter] = None, sort: Optional[str] = None) -> Page:
+        criteria = [ExperimentTable.owner_id == user_id, *self._filter_criteria(filters)]
+        return await self._get_experiments_page(criteria, sort, cursor, limit, fieldset, db)
 
-        if not db_objs:
-            return []
+    async def get_all_experiments(self, db: AsyncSession, cursor: Optional[str] = None,
+                                  limit: int = DEFAULT_PAGE_SIZE, fieldset: Optional[ExperimentFieldset] = None,
+                                  filters: Optional[ExperimentFilter] = None, sort: Optional[str] = None) -> Page:
+        return await self._get_experiments_page(self._filter_criteria(filters), sort, cursor, limit, fieldset, db)
 
-        return [Experiment.model_validate(obj) for obj in db_objs]
+    @staticmethod
+    def _filter_criteria(filters: Optional[ExperimentFilter]) -> list:
+        """
+        WHERE clauses for the filters given, each answerable from an index: the column indexes on experiments, and
+        for network profiles the experiment ids read from the sequence indexes.
+        """
+        if filters is None:
+            return []
+        criteria = []
+        if filters.status is not None:
+            criteria.append(ExperimentTable.status == filters.status)
+        if filters.owner_id is not None:
+            criteria.append(ExperimentTable.owner_id == filters.owner_id)
+        if filters.created_after is not None:
+            criteria.append(ExperimentTable.created_at >= filters.created_after)
+        if filters.created_before is not None:
+            criteria.append(ExperimentTable.created_at < filters.created_before)
+        for column, profile_id in ((ExperimentSequence.network_topology_id, filters.network_topology_id),
+                                   (ExperimentSequence.network_disruption_profile_id,
+                                    filters.network_disruption_profile_id)):
+            if profile_id is not None:
+                criteria.append(ExperimentTable.id.in_(
+                    select(ExperimentSequence.parent_experiment_id).where(column == profile_id)))
+        if filters.name_prefix:
+            # a range rather than LIKE, which SQLite only serves from an index when LIKE is case sensitive
+            prefix = filters.name_prefix
+            criteria.append(ExperimentTable.experiment_name >= prefix)
+            criteria.append(ExperimentTable.experiment_name < prefix[:-1] + chr(ord(prefix[-1]) + 1))
+        return criteria
 
-    async def get_all_experiments(self, db: AsyncSession) -> list[Experiment]:
-        result = await db.execute(select(ExperimentTable).options(
+    @staticmethod
+    def _experiments_query():
+        # result files are not part of the model, so their eager load is skipped
+        return select(ExperimentTable).options(
+            lazyload(ExperimentTable.result_files),
             selectinload(ExperimentTable.sequences).selectinload(ExperimentSequence.network_topology),
-            selectinload(ExperimentTable.sequences).selectinload(ExperimentSequence.network_disruption_profile)))
-        experiments = result.unique().scalars().all()
-        return [Experiment.model_validate(exp) for exp in experiments]
+            selectinload(ExperimentTable.sequences).selectinload(ExperimentSequence.network_disruption_profile))
+
+    async def _get_experiments_page(self, criteria: list, sort: Optional[str], cursor: Optional[str], limit: int,
+                                    fieldset: Optional[ExperimentFieldset], db: AsyncSession) -> Page:
+        """A page of full experiments, or of dicts holding only the fieldset's parts."""
+        keys = ((ExperimentTable.id, bool(sort) and sort == "-Id"),)
+        if sort and sort.removeprefix("-") != "Id":
+            if sort.removeprefix("-") not in SORT_FIELDS:
+                raise HTTPException(status_code=400, detail=f"Experiments can be sorted by: {', '.join(SORT_FIELDS)}")
+            keys = ((SORT_FIELDS[sort.removeprefix("-")], sort.startswith("-")),) + keys
+
+        query = self._experiments_query() if fieldset is None else fieldset.query(*(column for column, _ in keys))
+        page = await paginate(query.where(*criteria), keys, cursor, limit, db, f"experiments:{sort or ''}")
+        if fieldset is not None:
+            return Page(await self._dump_fieldset(page.items, fieldset, db), page.next_cursor)
+        return Page([Experiment.model_validate(obj) for obj in page.items], page.next_cursor)
+
+    async def _dump_fieldset(self, rows, fieldset: ExperimentFieldset, db: AsyncSession) -> List[Dict[str, Any]]:
+        sequences = {row.id: [] for row in rows}
+        if fieldset.sequences and rows:
+            result = await db.execute(select(ExperimentSequence).options(*fieldset.sequence_options())
+                                      .where(ExperimentSequence.parent_experiment_id.in_(sequences))
+                                      .order_by(ExperimentSequence.sequence_id))
+            for sequence in result.scalars():
+                sequences[sequence.parent_experiment_id].append(sequence)
+        return [fieldset.dump(row, sequences[row.id]) for row in rows]
 
     async def update_experiment(self, user_id: int, experiment_id: str, experiment_input: ExperimentUpdateInput,
                                 db: AsyncSession) -> Experiment:
@@ -103,6 +254,8 @@ class ExperimentsService:
 
         await self._handle_add_sequences(experiment_input.add_sequences, experiment.id, db)
         await self._handle_remove_sequences(experiment_input.remove_sequence_ids, experiment.id, db)
+        await ChangesService().record(ChangeEntity.EXPERIMENT, experiment.id, ChangeOperation.UPDATE, db,
+                                      owner_id=experiment.owner_id)
 
         try:
             await db.commit()
@@ -0,0 +1,78 @@
+import asyncio
+from pathlib import Path
+from typing import ClassVar, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import bindparam, delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config.settings import Settings
+from app.database.tables.fingerprints import FingerprintBand
+from app.database.tables.videos import InputVideo
+from app.models.change import ChangeEntity, ChangeOperation
+from app.services.changes import ChangesService
+from app.services.utility.fingerprint import band_keys, distance, video_fingerprint
+from app.services.utility.video_probe import VideoProbe
+
+# a near-duplicate shares a dozen or more bands, while unrelated videos collide on one by chance as the catalog grows
+MIN_SHARED_BANDS = 2
+# built once: an expanding parameter keeps the statement's compiled form cached across lookups
+_CANDIDATES = select(InputVideo.id, InputVideo.fingerprint).where(InputVideo.id.in_(
+    select(FingerprintBand.video_id).where(FingerprintBand.key.in_(bindparam("keys", expanding=True)))
+    .group_by(FingerprintBand.video_id).having(func.count() >= MIN_SHARED_BANDS)))
+
+
+class FingerprintsService:
+    """
+    Perceptual fingerprints of catalog videos, for spotting the same sequence uploaded again under another title,
+    format or resolution, which byte-level hashes cannot do.
+    """
+    subclasses: ClassVar[Tuple] = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        FingerprintsService.subclasses = FingerprintsService.subclasses + (cls,)
+
+    async def check_duplicates(self, path, probe: VideoProbe, db: AsyncSession,
+                               settings: Settings) -> Tuple[bytes, Optional[str]]:
+        """
+        Fingerprint a newly stored video and look for it in the catalog. Returns the fingerprint and the closest
+        duplicate, or raises 409 if duplicates are rejected.
+        """
+        fingerprint = await asyncio.to_thread(video_fingerprint, Path(path), probe)
+        if not fingerprint or settings.duplicate_policy == "off":
+            return fingerprint, None
+
+        duplicate = await self.find_duplicate(fingerprint, db, settings.duplicate_max_distance)
+        if duplicate and settings.duplicate_policy == "reject":
+            raise HTTPException(status_code=409, detail=f"Video duplicates existing video {duplicate}")
+        return fingerprint, duplicate
+
+    async def find_duplicate(self, fingerprint: bytes, db: AsyncSession, max_distance: float) -> Optional[str]:
+        """
+        The closest video within ``max_distance``. Candidates are the videos sharing a few bands, found through the
+        band index, and only their fingerprints are compared bit by bit.
+        """
+        result = await db.execute(_CANDIDATES, {"keys": band_keys(fingerprint)})
+
+        closest, closest_distance = None, max_distance
+        for video_id, candidate in result:
+            candidate_distance = distance(fingerprint, candidate)
+            if candidate_distance <= closest_distance:
+                closest, closest_distance = video_id, candidate_distance
+        return closest
+
+    def index(self, video_id: str, fingerprint: bytes, db: AsyncSession) -> None:
+        """Add a video's bands to the index, committed with the video."""
+        db.add_all(FingerprintBand(video_id=video_id, key=key) for key in band_keys(fingerprint))
+
+    async def remove(self, video_id: str, db: AsyncSession) -> None:
+        """Drop a video's bands and stop other videos pointing at it as their duplicate, in the caller's transaction."""
+        await db.execute(delete(FingerprintBand).where(FingerprintBand.video_id == video_id))
+        duplicates = (await db.scalars(select(InputVideo.id).where(InputVideo.duplicateOf == video_id))).all()
+        if not duplicates:
+            return
+        await db.execute(update(InputVideo).where(InputVideo.id.in_(duplicates)).values(duplicateOf=None))
+        changes = ChangesService()
+        for duplicate in duplicates:
+            await changes.record(ChangeEntity.VIDEO, duplicate, ChangeOperation.UPDATE, db)
@@ -0,0 +1,169 @@
+import asyncio
+import logging
+from pathlib import Path
+from typing import ClassVar, Optional, Tuple, Union
+
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.database.tables.experiments import Experiment
+from app.database.tables.manifests import FrameManifest as frame_manifest_table
+from app.database.tables.results import ExperimentResult
+from app.database.tables.videos import InputVideo
+from app.models.frame_manifest import FrameManifest, ManifestAsset, ManifestComparison, ManifestComparisonInput
+from app.models.user import User
+from app.services.utility.frame_manifest import first_mismatch, frame_md5s
+from app.services.utility.video_probe import ProbeError, VideoProbe, probe_video
+from app.services.videos import VideosService
+
+logger = logging.getLogger(__name__)
+
+Asset = Union[InputVideo, ExperimentResult]
+
+
+class ManifestsService:
+    """
+    Per-frame MD5 manifests of stored videos and result videos, computed once so that two assets can be checked for
+    bit-exactness by comparing checksums instead of the files.
+    """
+    subclasses: ClassVar[Tuple] = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        ManifestsService.subclasses = ManifestsService.subclasses + (cls,)
+
+    async def build_video_manifest(self, video_id: str, sessionmaker: async_sessionmaker) -> None:
+        """Background job: compute the manifest of a newly stored video."""
+        async with sessionmaker() as db:
+            video = await db.get(InputVideo, video_id)
+            if not video:
+                return
+            try:
+                await self._video_manifest(video, db)
+            except Exception:
+                logger.exception(f"Computing the frame manifest of video {video_id} failed")
+
+    async def build_result_manifest(self, result_id: int, sessionmaker: async_sessionmaker) -> None:
+        """Background job: compute the manifest of a newly stored Y4M result. Raw YUV results carry no layout, so wait
+        for a comparison to supply one, and other files are not videos at all."""
+        async with sessionmaker() as db:
+            result = await db.get(ExperimentResult, result_id)
+            if not result or self._result_format(result) != "y4m":
+                return
+            try:
+                await self._result_manifest(result, None, db)
+            except HTTPException:
+                logger.info(f"Result {result.filename} is not a valid y4m video, no frame manifest recorded")
+            except Exception:
+                logger.exception(f"Computing the frame manifest of result {result_id} failed")
+
+    async def get_video_manifest(self, video_id: str, db: AsyncSession) -> FrameManifest:
+        video = await db.get(InputVideo, video_id)
+        if not video:
+            raise HTTPException(status_code=404, detail="Video not found")
+        return FrameManifest.model_validate(await self._video_manifest(video, db))
+
+    async def compare(self, comparison: ManifestComparisonInput, current_user: User,
+                      db: AsyncSession) -> ManifestComparison:
+        """Report the first frame at which two assets differ, using only their stored checksums."""
+        assets = [await self._get_asset(comparison.first, current_user, db),
+                  await self._get_asset(comparison.second, current_user, db)]
+        intrinsic = [self._has_layout(asset) for asset in assets]
+        if not any(intrinsic):
+            raise HTTPException(status_code=400,
+                                detail="Cannot compare two raw YUV results, their frame layout is unknown")
+
+        # assets that describe their own layout first, so a raw YUV result can be read with its counterpart's
+        manifests = [None, None]
+        for i in sorted(range(2), key=lambda i: not intrinsic[i]):
+            manifests[i] = await self._manifest(assets[i], manifests[1 - i], db)
+        first, second = manifests
+
+        counts = {"first_frame_count": first.frame_count, "second_frame_count": second.frame_count}
+        if self._layout(first) != self._layout(second):
+            return ManifestComparison(identical=False, first_mismatch=0, **counts,
+                                      detail=f"Frame layouts differ: {self._describe(first)} and "
+                                             f"{self._describe(second)}")
+        mismatch = first_mismatch(first.md5, second.md5)
+        return ManifestComparison(identical=mismatch is None, first_mismatch=mismatch, **counts)
+
+    async def _manifest(self, asset: Asset, counterpart: Optional[frame_manifest_table],
+                        db: AsyncSession) -> frame_manifest_table:
+        if isinstance(asset, InputVideo):
+            return await self._video_manifest(asset, db)
+        return await self._result_manifest(asset, counterpart, db)
+
+    async def _video_manifest(self, video: InputVideo, db: AsyncSession) -> frame_manifest_table:
+        manifest = (await db.execute(select(frame_manifest_table)
+                                     .where(frame_manifest_table.video_id == video.id))).scalars().first()
+        if manifest:
+            return manifest
+        videos = VideosService()
+        layout = await videos.frame_layout(video, db)
+        return await self._store(Path(videos.video_file_path(video)), layout, db, video_id=video.id)
+
+    async def _result_manifest(self, result: ExperimentResult, counterpart: Optional[frame_manifest_table],
+                               db: AsyncSession) -> frame_manifest_table:
+        """A result's manifest; raw YUV is read with the counterpart's layout, so may have one per layout."""
+        format = self._result_format(result)
+        query = select(frame_manifest_table).where(frame_manifest_table.result_id == result.id)
+        if format == "yuv":
+            width, height, chroma_format, bit_depth = self._layout(counterpart)
+            query = query.where(frame_manifest_table.width == width, frame_manifest_table.height == height,
+                                frame_manifest_table.chroma_format == chroma_format,
+                                frame_manifest_table.bit_depth == bit_depth)
+        manifest = (await db.execute(query)).scalars().first()
+        if manifest:
+            return manifest
+
+        try:
+            if format == "y4m":
+                layout = await asyncio.to_thread(probe_video, Path(result.path), "y4m")
+            else:
+                layout = await asyncio.to_thread(probe_video, Path(result.path), "yuv", f"{width}x{height}",
+                                                 chroma_format, bit_depth)
+        except ProbeError as e:
+            raise HTTPException(status_code=422, detail=f"Result {result.filename} is not a valid {format} video: {e}")
+        return await self._store(Path(result.path), layout, db, result_id=result.id)
+
+    async def _store(self, path: Path, layout: VideoProbe, db: AsyncSession, **asset) -> frame_manifest_table:
+        md5 = await asyncio.to_thread(frame_md5s, path, layout)
+        manifest = frame_manifest_table(**asset, width=layout.width, height=layout.height,
+                                        chroma_format=layout.chromaFormat, bit_depth=layout.bitDepth,
+                                        frame_count=len(md5), md5=md5)
+        db.add(manifest)
+        await db.commit()
+        return manifest
+
+    async def _get_asset(self, asset: ManifestAsset, current_user: User, db: AsyncSession) -> Asset:
+        if asset.video_id is not None:
+            video = await db.get(InputVideo, asset.video_id)
+            if not video:
+                raise HTTPException(status_code=404, detail=f"Video {asset.video_id} not found")
+            return video
+
+        result = await db.get(ExperimentResult, asset.result_id)
+        if not result:
+            raise HTTPException(status_code=404, detail=f"Result {asset.result_id} not found")
+        experiment = await db.get(Experiment, result.experiment_id)
+        if current_user.id != experiment.owner_id and current_user.role not in ('admin', 'super_admin'):
+            raise HTTPException(status_code=403, detail="You are not authorized to access this resource")
+        if self._result_format(result) not in ("y4m", "yuv"):
+            raise HTTPException(status_code=400, detail=f"Result {result.filename} is not a .y4m or .yuv video")
+        return result
+
+    def _has_layout(self, asset: Asset) -> bool:
+        return isinstance(asset, InputVideo) or self._result_format(asset) == "y4m"
+
+    @staticmethod
+    def _result_format(result: ExperimentResult) -> str:
+        return Path(result.filename).suffix.lstrip(".").lower()
+
+    @staticmethod
+    def _layout(manifest: frame_manifest_table) -> Tuple[int, int, str, int]:
+        return manifest.width, manifest.height, manifest.chroma_format, manifest.bit_depth
+
+    @staticmethod
+    def _describe(manifest: frame_manifest_table) -> str:
+        return f"{manifest.width}x{manifest.height} {manifest.chroma_format} {manifest.bit_depth}-bit"
@@ -1,4 +1,4 @@
-from typing import ClassVar, Tuple, List
+from typing import ClassVar, Tuple
 from typing import Optional
 
 from fastapi import HTTPException
@@ -9,8 +9,11 @@ from starlette import status
 from typing_extensions import Annotated
 
 from app.database.tables.network import Network as NetworkTable
+from app.models.change import ChangeEntity, ChangeOperation
 from app.models.info import Info
 from app.models.network import Network, NetworkInput
+from app.services.changes import ChangesService
+from app.services.utility.pagination import DEFAULT_PAGE_SIZE, Page, paginate
 
 
 class NetworksService:
@@ -22,6 +25,8 @@ class NetworksService:
     ) -> Network:
         db_network = NetworkTable(**network_input.model_dump(by_alias=False))
         db.add(db_network)
+        await db.flush()
+        await ChangesService().record(ChangeEntity.NETWORK, db_network.network_profile_id, ChangeOperation.INSERT, db)
         await db.commit()
         await db.refresh(db_network)
         return Network.model_validate(db_network, from_attributes=True)
@@ -35,6 +40,7 @@ class NetworksService:
         db_network = await self._get_db_network(id, db)
         for key, value in network_input.model_dump(by_alias=False).items():
             setattr(db_network, key, value)
+        await ChangesService().record(ChangeEntity.NETWORK, db_network.network_profile_id, ChangeOperation.UPDATE, db)
         await db.commit()
         await db.refresh(db_network)
         return Network.model_validate(db_network, from_attributes=True)
@@ -42,6 +48,7 @@ class NetworksService:
     async def delete_network(self, id: StrictStr, db: AsyncSession) -> Info:
         db_network = await self._get_db_network(id, db)
         await db.delete(db_network)
+        await ChangesService().record(ChangeEntity.NETWORK, db_network.network_profile_id, ChangeOperation.DELETE, db)
         await db.commit()
         return Info(message="Network deleted successfully")
 
@@ -49,9 +56,11 @@ class NetworksService:
         db_network = await self._get_db_network(id, db)
         return Network.model_validate(db_network, from_attributes=True)
 
-    async def get_networks(self, db: AsyncSession) -> List[Network]:
-        result = await db.execute(select(NetworkTable))
-        return [Network.model_validate(n, from_attributes=True) for n in result.scalars().all()]
+    async def get_networks(self, db: AsyncSession, cursor: Optional[str] = None,
+                           limit: int = DEFAULT_PAGE_SIZE) -> Page[Network]:
+        page = await paginate(select(NetworkTable), ((NetworkTable.network_profile_id, False),), cursor, limit, db,
+                              "networks")
+        return Page([Network.model_validate(n, from_attributes=True) for n in page.items], page.next_cursor)
 
     async def _get_db_network(self, id: StrictStr, db: AsyncSession) -> NetworkTable:
         result = await db.execute(select(NetworkTable).where(NetworkTable.network_profile_id == int(id)))
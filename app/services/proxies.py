@@ -0,0 +1,135 @@
+import asyncio
+import logging
+import uuid
+from fractions import Fraction
+from pathlib import Path
+from typing import ClassVar, List, Tuple
+
+from fastapi import BackgroundTasks, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.future import select
+
+from app.config.settings import Settings
+from app.database.tables.proxies import ProxyJob as proxy_job_table
+from app.database.tables.videos import InputVideo as input_video_table
+from app.models.analysis_status import AnalysisStatus
+from app.models.change import ChangeEntity, ChangeOperation
+from app.models.proxy import ProxyInput, ProxyJob
+from app.models.user import User
+from app.models.video import Video
+from app.services.changes import ChangesService
+from app.services.manifests import ManifestsService
+from app.services.thumbnails import ThumbnailsService
+from app.services.utility.blobs import BlobStore
+from app.services.utility.files import checksum_file
+from app.services.utility.proxies import create_proxy_file, proxy_header, proxy_layout, write_proxy_frames
+from app.services.utility.video_probe import probe_video
+from app.services.utility.workers import analysis_pool
+from app.services.video_analysis import VideoAnalysisService
+from app.services.videos import VideosService
+
+logger = logging.getLogger(__name__)
+
+
+class ProxiesService:
+    """
+    Downscaled, optionally 8-bit, Y4M proxies of stored videos for quick iteration runs, stored as videos of their
+    own linked to the original.
+    """
+    subclasses: ClassVar[Tuple] = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        ProxiesService.subclasses = ProxiesService.subclasses + (cls,)
+
+    async def create_proxy_job(self, video_id: str, proxy_input: ProxyInput, current_user: User, db: AsyncSession,
+                               sessionmaker: async_sessionmaker, settings: Settings,
+                               background_tasks: BackgroundTasks) -> ProxyJob:
+        video = await db.get(input_video_table, video_id)
+        if not video:
+            raise HTTPException(status_code=404, detail="Video not found")
+        bit_depth = proxy_input.bitDepth or video.bitDepth
+        if bit_depth > video.bitDepth:
+            raise HTTPException(status_code=400, detail=f"Proxy bit depth cannot exceed the source's {video.bitDepth}")
+
+        job = proxy_job_table(video_id=video_id, scale=proxy_input.scale, bit_depth=bit_depth,
+                              status=AnalysisStatus.PENDING.value, frames_done=0, created_by=current_user.username)
+        db.add(job)
+        await db.commit()
+        await db.refresh(job)
+        background_tasks.add_task(self.run_proxy_job, job.id, current_user, sessionmaker, settings)
+        return ProxyJob.model_validate(job)
+
+    async def run_proxy_job(self, job_id: int, current_user: User, sessionmaker: async_sessionmaker,
+                            settings: Settings) -> None:
+        """
+        Write the proxy in parallel chunks of frames straight into a staged blob, recording progress as each chunk
+        finishes, then store it as a video linked to its source.
+        """
+        async with sessionmaker() as db:
+            job = await db.get(proxy_job_table, job_id)
+            job.status = AnalysisStatus.RUNNING.value
+            await db.commit()
+
+            store = BlobStore.for_settings(settings)
+            staged = store.staging_path()
+            try:
+                videos = VideosService()
+                source = await db.get(input_video_table, job.video_id)
+                if not source:
+                    raise ValueError(f"Video {job.video_id} no longer exists")
+                layout = await videos.frame_layout(source, db)
+                frame_rate = layout.frameRate or (Fraction(source.frameRate) if source.frameRate else None)
+                header = proxy_header(layout, job.scale, job.bit_depth, frame_rate)
+                proxy = proxy_layout(layout, header, job.scale, job.bit_depth, frame_rate)
+
+                job.frame_count = layout.frameCount
+                await db.commit()
+                await asyncio.to_thread(create_proxy_file, staged, header, proxy)
+
+                chunks = [analysis_pool.run(write_proxy_frames, Path(videos.video_file_path(source)), layout, staged,
+                                            proxy, job.scale, chunk)
+                          for chunk in analysis_pool.chunks(range(layout.frameCount))]
+                for finished in asyncio.as_completed(chunks):
+                    job.frames_done += await finished
+                    await db.commit()
+
+                stored = await asyncio.to_thread(checksum_file, staged)
+                blob_path = await asyncio.to_thread(store.commit, staged, stored.sha256)
+                probe = await asyncio.to_thread(probe_video, blob_path, "y4m")
+                video = await videos.record_video(str(uuid.uuid4()), f"{source.title} 1/{job.scale}", "y4m",
+                                                  source.frameRate, source.description,
+                                                  stored._replace(path=blob_path), probe, current_user, db)
+
+                proxy_video = await db.get(input_video_table, video.id)
+                proxy_video.parentId, proxy_video.proxyScale = source.id, job.scale
+                await ChangesService().record(ChangeEntity.VIDEO, video.id, ChangeOperation.UPDATE, db)
+                job.proxy_id = video.id
+                job.status = AnalysisStatus.COMPLETE.value
+                await db.commit()
+            except Exception as e:
+                logger.exception(f"Proxy job {job_id} failed")
+                staged.unlink(missing_ok=True)
+                await db.rollback()
+                job.status = AnalysisStatus.ERROR.value
+                job.error = str(e.detail if isinstance(e, HTTPException) else e)
+                await db.commit()
+                return
+
+        # the proxy is a stored video like any other, so give it the same analysis, previews and checksums
+        await VideoAnalysisService().analyze_video(video.id, sessionmaker)
+        await ThumbnailsService().generate_thumbnails(video.id, sessionmaker, settings)
+        await ManifestsService().build_video_manifest(video.id, sessionmaker)
+
+    async def get_proxy_job(self, video_id: str, job_id: int, db: AsyncSession) -> ProxyJob:
+        job = await db.get(proxy_job_table, job_id)
+        if not job or job.video_id != video_id:
+            raise HTTPException(status_code=404, detail="Proxy job not found")
+        return ProxyJob.model_validate(job)
+
+    async def get_proxies(self, video_id: str, db: AsyncSession) -> List[Video]:
+        if not await db.get(input_video_table, video_id):
+            raise HTTPException(status_code=404, detail="Video not found")
+        result = await db.execute(select(input_video_table).where(input_video_table.parentId == video_id)
+                                  .order_by(input_video_table.proxyScale))
+        return [Video.model_validate(proxy, from_attributes=True) for proxy in result.scalars()]
@@ -0,0 +1,152 @@
+import asyncio
+import logging
+from pathlib import Path
+from typing import ClassVar, List, Tuple
+
+from fastapi import BackgroundTasks, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import undefer
+
+from app.database.tables.experiments import Experiment
+from app.database.tables.quality import QualityMetric as quality_metric_table
+from app.database.tables.results import ExperimentResult
+from app.database.tables.videos import InputVideo
+from app.models.analysis_status import AnalysisStatus
+from app.models.quality_metric import QualityMetric, QualityMetricDetail, QualityMetricInput
+from app.models.user import User
+from app.services.utility.quality_metrics import compare_frames, summarize
+from app.services.utility.video_probe import ProbeError, VideoProbe, probe_video
+from app.services.utility.workers import analysis_pool
+from app.services.videos import VideosService
+
+logger = logging.getLogger(__name__)
+
+
+class QualityService:
+    """
+    Server-side PSNR and SSIM between a reference video and a distorted video or result file of an experiment.
+
+    Comparisons run in the background: the frames are split into chunks which are measured in parallel on the
+    analysis process pool, then the per-frame values and their means are stored against the experiment.
+    """
+    subclasses: ClassVar[Tuple] = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        QualityService.subclasses = QualityService.subclasses + (cls,)
+
+    async def create_metric(self, experiment_id: int, metric_input: QualityMetricInput, current_user: User,
+                            db: AsyncSession, sessionmaker: async_sessionmaker,
+                            background_tasks: BackgroundTasks) -> QualityMetric:
+        await self._get_experiment(experiment_id, current_user, db)
+        reference = await db.get(InputVideo, metric_input.reference_video_id)
+        if not reference:
+            raise HTTPException(status_code=404, detail="Reference video not found")
+        distorted = None
+        if metric_input.distorted_video_id:
+            distorted = await db.get(InputVideo, metric_input.distorted_video_id)
+            if not distorted:
+                raise HTTPException(status_code=404, detail="Distorted video not found")
+        if metric_input.distorted_result_id:
+            result = await db.get(ExperimentResult, metric_input.distorted_result_id)
+            if not result or result.experiment_id != experiment_id:
+                raise HTTPException(status_code=404, detail="Distorted result file not found for this experiment")
+        for video in (reference, distorted):
+            if video is not None and video.frameCount == 0:
+                raise HTTPException(status_code=422, detail=f"Video {video.id} has no frames to compare")
+
+        metric = quality_metric_table(experiment_id=experiment_id, **metric_input.model_dump(),
+                                      status=AnalysisStatus.PENDING.value)
+        db.add(metric)
+        await db.commit()
+        await db.refresh(metric)
+        background_tasks.add_task(self.compute_metric, metric.id, sessionmaker)
+        return QualityMetric.model_validate(metric)
+
+    async def compute_metric(self, metric_id: int, sessionmaker: async_sessionmaker) -> None:
+        async with sessionmaker() as db:
+            metric = await db.get(quality_metric_table, metric_id)
+            metric.status = AnalysisStatus.RUNNING.value
+            await db.commit()
+            try:
+                reference_path, reference_layout = await self._video_source(metric.reference_video_id, db)
+                distorted_path, distorted_layout = await self._distorted_source(metric, reference_layout, db)
+                frames = range(min(reference_layout.frameCount, distorted_layout.frameCount))
+                if not frames:
+                    raise ValueError("No frames to compare")
+
+                chunks = await analysis_pool.map_chunks(compare_frames, analysis_pool.chunks(frames), reference_path,
+                                                        reference_layout, distorted_path, distorted_layout)
+                # mono videos have no chroma planes, so their chroma PSNR lists stay empty and are left out
+                per_frame = {name: values for name in chunks[0]
+                             if (values := [value for chunk in chunks for value in chunk[name]])}
+                summary = summarize(per_frame)
+
+                metric.frame_count = len(frames)
+                metric.psnr_y = summary["psnr_y"]
+                metric.psnr_u, metric.psnr_v = summary.get("psnr_u"), summary.get("psnr_v")
+                metric.ssim = summary["ssim"]
+                metric.per_frame = per_frame
+                metric.status = AnalysisStatus.COMPLETE.value
+            except Exception as e:
+                logger.exception(f"Quality metric {metric_id} failed")
+                metric.status = AnalysisStatus.ERROR.value
+                metric.error = e.detail if isinstance(e, HTTPException) else str(e)
+            await db.commit()
+
+    async def get_metrics(self, experiment_id: int, current_user: User, db: AsyncSession) -> List[QualityMetric]:
+        await self._get_experiment(experiment_id, current_user, db)
+        result = await db.execute(select(quality_metric_table).where(quality_metric_table.experiment_id == experiment_id)
+                                  .order_by(quality_metric_table.id))
+        return [QualityMetric.model_validate(metric) for metric in result.scalars()]
+
+    async def get_metric(self, experiment_id: int, metric_id: int, current_user: User,
+                         db: AsyncSession) -> QualityMetricDetail:
+        await self._get_experiment(experiment_id, current_user, db)
+        result = await db.execute(select(quality_metric_table).options(undefer(quality_metric_table.per_frame))
+                                  .where(quality_metric_table.id == metric_id,
+                                         quality_metric_table.experiment_id == experiment_id))
+        metric = result.scalars().first()
+        if not metric:
+            raise HTTPException(status_code=404, detail="Quality metric not found")
+        return QualityMetricDetail.model_validate(metric)
+
+    async def _video_source(self, video_id: str, db: AsyncSession) -> Tuple[Path, VideoProbe]:
+        videos = VideosService()
+        video = await db.get(InputVideo, video_id)
+        if not video:
+            raise ValueError(f"Video {video_id} no longer exists")
+        return Path(videos.video_file_path(video)), await videos.frame_layout(video, db)
+
+    async def _distorted_source(self, metric: quality_metric_table, reference: VideoProbe,
+                                db: AsyncSession) -> Tuple[Path, VideoProbe]:
+        if metric.distorted_video_id:
+            path, layout = await self._video_source(metric.distorted_video_id, db)
+        else:
+            result = await db.get(ExperimentResult, metric.distorted_result_id)
+            if not result:
+                raise ValueError(f"Result file {metric.distorted_result_id} no longer exists")
+            path = Path(result.path)
+            format = Path(result.filename).suffix.lstrip(".").lower()
+            if format not in ("y4m", "yuv"):
+                raise ValueError("Distorted result file must be a .y4m or .yuv video")
+            try:
+                layout = await asyncio.to_thread(probe_video, path, format, f"{reference.width}x{reference.height}",
+                                                 reference.chromaFormat, reference.bitDepth)
+            except ProbeError as e:
+                raise ValueError(f"Invalid distorted {format} file: {e}")
+
+        reference_shape = (reference.width, reference.height, reference.chromaFormat, reference.bitDepth)
+        distorted_shape = (layout.width, layout.height, layout.chromaFormat, layout.bitDepth)
+        if reference_shape != distorted_shape:
+            raise ValueError(f"Distorted video layout {distorted_shape} does not match the reference {reference_shape}")
+        return path, layout
+
+    async def _get_experiment(self, experiment_id: int, current_user: User, db: AsyncSession) -> Experiment:
+        experiment = await db.get(Experiment, experiment_id)
+        if not experiment:
+            raise HTTPException(status_code=404, detail="Experiment not found")
+        if current_user.id != experiment.owner_id and current_user.role not in ('admin', 'super_admin'):
+            raise HTTPException(status_code=403, detail="You are not authorized to access this resource")
+        return experiment
@@ -1,23 +1,27 @@
-import os.path
-import zipfile
-from io import BytesIO
-from typing import ClassVar
-from typing import Tuple
+from pathlib import Path
+from typing import AsyncIterator, ClassVar
+from typing import Optional, Tuple
 
-from fastapi import UploadFile, HTTPException
+from fastapi import BackgroundTasks, UploadFile, HTTPException
 from pydantic import Field, StrictStr
 from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.orm import joinedload
-from starlette.responses import StreamingResponse
+from starlette.responses import FileResponse, Response, StreamingResponse
 from typing_extensions import Annotated
 
 from app.config.settings import Settings
 from app.database.tables.experiments import Experiment
 from app.database.tables.results import ExperimentResult
+from app.models.change import ChangeEntity, ChangeOperation
 from app.models.info import Info
 from app.models.user import User
-from app.services.utility.files import upload_file
+from app.services.blobs import BlobsService
+from app.services.changes import ChangesService
+from app.services.manifests import ManifestsService
+from app.services.utility.archive_cache import ArchiveCache
+from app.services.utility.blobs import BlobStore
+from app.services.utility.files import StoredFile, iter_upload
 
 
 class ResultsService:
@@ -29,39 +33,84 @@ class ResultsService:
 
     async def get_experiment_results(self, experiment_id: Annotated[
         StrictStr, Field(description="ID to uniquely identify an experiment.")], current_user: User,
-                                     db: AsyncSession) -> StreamingResponse:
+                                     db: AsyncSession, settings: Settings,
+                                     if_none_match: Optional[str] = None) -> Response:
         """Get list of files to download for results."""
         experiment = await self.get_experiment(experiment_id, db, current_user)
 
         if not experiment.result_files:
             raise HTTPException(status_code=404, detail="No result files found for experiment")
 
-        zip_buffer = BytesIO()
-        with zipfile.ZipFile(zip_buffer, "w", compression=zipfile.ZIP_DEFLATED) as zf:
-            for result in experiment.result_files:
-                if not os.path.exists(result.path):
-                    continue
-                zf.write(result.path, arcname=result.filename)
-        zip_buffer.seek(0)
-        return StreamingResponse(zip_buffer, media_type='application/zip', headers={
-            "Content-Disposition": f"attachment; filename={experiment.experiment_name}_results.zip"})
+        cache = ArchiveCache.for_settings(settings)
+        digest = cache.digest(experiment.result_files)
+        etag = f'"{digest}"'
+        if if_none_match and (if_none_match.strip() == "*" or etag in [t.strip() for t in if_none_match.split(",")]):
+            return Response(status_code=304, headers={"ETag": etag})
+
+        headers = {"Content-Disposition": f"attachment; filename={experiment.experiment_name}_results.zip",
+                   "ETag": etag, "Cache-Control": "private, no-cache"}
+        cached = cache.lookup(experiment.id, digest)
+        if cached:
+            return FileResponse(cached, media_type='application/zip', headers=headers)
+
+        entries = [(result.path, result.filename) for result in experiment.result_files]
+        return StreamingResponse(cache.stream(experiment.id, digest, entries), media_type='application/zip',
+                                 headers=headers)
 
     async def upload_result(self, experiment_id: int, file: UploadFile, db: AsyncSession, settings: Settings,
-                            current_user: User) -> Info:
+                            current_user: User, sessionmaker: async_sessionmaker,
+                            background_tasks: BackgroundTasks) -> Info:
+        return await self.store_result(experiment_id, file.filename, iter_upload(file), db, settings, current_user,
+                                       sessionmaker, background_tasks)
+
+    async def store_result(self, experiment_id: int, filename: str, chunks: AsyncIterator[bytes], db: AsyncSession,
+                           settings: Settings, current_user: User, sessionmaker: async_sessionmaker,
+                           background_tasks: BackgroundTasks) -> Info:
+        """Stream a result file into the blob store and record it against the experiment."""
+        experiment = await self._get_experiment_for_upload(experiment_id, filename, db, current_user)
+        stored = await BlobStore.for_settings(settings).write(chunks)
+        return await self._record_result(experiment, filename, stored, db, settings, sessionmaker, background_tasks)
+
+    async def store_result_by_hash(self, experiment_id: int, filename: str, sha256: str, db: AsyncSession,
+                                   settings: Settings, current_user: User, sessionmaker: async_sessionmaker,
+                                   background_tasks: BackgroundTasks) -> Info:
+        """Record a result file whose content is already stored, without transferring it again."""
+        experiment = await self._get_experiment_for_upload(experiment_id, filename, db, current_user)
+        if not await BlobsService().blob_exists(sha256, db, settings, current_user):
+            raise HTTPException(status_code=404, detail="No stored content with this SHA-256, upload the file")
+
+        path = BlobStore.for_settings(settings).path_for(sha256)
+        stored = StoredFile(path, path.stat().st_size, sha256)
+        return await self._record_result(experiment, filename, stored, db, settings, sessionmaker, background_tasks)
+
+    async def _get_experiment_for_upload(self, experiment_id: int, filename: str, db: AsyncSession,
+                                         current_user: User) -> Experiment:
+        if not filename or filename in (".", "..") or Path(filename).name != filename:
+            raise HTTPException(status_code=400, detail="Invalid result filename")
+
         experiment = await self.get_experiment(experiment_id, db, current_user)
 
         results = await db.execute(select(ExperimentResult).where(ExperimentResult.experiment_id == experiment_id,
-                                                                  ExperimentResult.filename == file.filename))
+                                                                  ExperimentResult.filename == filename))
 
         if results.scalars().first():
             raise HTTPException(status_code=400,
                                 detail="File with this name has already been uploaded for this experiment")
+        return experiment
 
-        path = upload_file(file, settings.uploads_directory, "results", str(experiment_id))
-
-        result = ExperimentResult(filename=file.filename, experiment_id=experiment.id, path=str(path))
+    async def _record_result(self, experiment: Experiment, filename: str, stored: StoredFile, db: AsyncSession,
+                             settings: Settings, sessionmaker: async_sessionmaker,
+                             background_tasks: BackgroundTasks) -> Info:
+        result = ExperimentResult(filename=filename, experiment=experiment, path=str(stored.path),
+                                  size=stored.size, sha256=stored.sha256)
         db.add(result)
+        await db.flush()
+        await ChangesService().record(ChangeEntity.RESULT, result.id, ChangeOperation.INSERT, db,
+                                      owner_id=experiment.owner_id)
         await db.commit()
+        ArchiveCache.for_settings(settings).invalidate(experiment.id)
+        # checksummed once the response has been sent, so a large result does not hold up its upload
+        background_tasks.add_task(ManifestsService().build_result_manifest, result.id, sessionmaker)
 
         return Info(message="File uploaded successfully")
 
@@ -0,0 +1,89 @@
+import asyncio
+import logging
+from pathlib import Path
+from typing import ClassVar, Dict, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from starlette.responses import FileResponse
+
+from app.config.settings import Settings
+from app.database.tables.videos import InputVideo as input_video_table
+from app.services.utility.thumbnail_cache import ThumbnailCache, render_previews
+from app.services.utility.workers import analysis_pool
+from app.services.videos import VideosService
+
+logger = logging.getLogger(__name__)
+
+# previews of a video never change, so clients may keep them for as long as they like; they are only served to
+# signed-in users, so shared caches must not
+CACHE_CONTROL = "private, max-age=31536000, immutable"
+
+# renders in progress in this process, shared by the background job and requests for previews it has not finished
+_rendering: Dict[str, "asyncio.Future[int]"] = {}
+
+
+class ThumbnailsService:
+    """
+    Thumbnails of evenly spaced frames and a contact sheet of them, rendered once in the background after ingest so
+    the catalog can show previews without downloading videos.
+    """
+    subclasses: ClassVar[Tuple] = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        ThumbnailsService.subclasses = ThumbnailsService.subclasses + (cls,)
+
+    async def generate_thumbnails(self, video_id: str, sessionmaker: async_sessionmaker, settings: Settings) -> None:
+        """Background job: render the previews of a newly stored video into the thumbnail cache."""
+        async with sessionmaker() as db:
+            video = await db.get(input_video_table, video_id)
+            if not video:
+                return
+            try:
+                await self._render(video, db, ThumbnailCache.for_settings(settings))
+            except Exception:
+                logger.exception(f"Rendering thumbnails of video {video_id} failed")
+
+    async def get_thumbnail(self, video_id: str, n: int, db: AsyncSession, settings: Settings) -> FileResponse:
+        cache = await self._ensure_previews(video_id, db, settings)
+        path = cache.thumbnail(video_id, n)
+        if not path:
+            raise HTTPException(status_code=404, detail=f"Video has no thumbnail {n}")
+        return FileResponse(path, media_type="image/jpeg", headers={"Cache-Control": CACHE_CONTROL})
+
+    async def get_contact_sheet(self, video_id: str, db: AsyncSession, settings: Settings) -> FileResponse:
+        cache = await self._ensure_previews(video_id, db, settings)
+        return FileResponse(cache.contact_sheet(video_id), media_type="image/jpeg",
+                            headers={"Cache-Control": CACHE_CONTROL})
+
+    async def _ensure_previews(self, video_id: str, db: AsyncSession, settings: Settings) -> ThumbnailCache:
+        """
+        The thumbnail cache, after rendering this video's previews if they are missing. A request arriving while the
+        background job is still rendering waits for that render instead of starting its own.
+        """
+        cache = ThumbnailCache.for_settings(settings)
+        if cache.is_complete(video_id):
+            return cache
+        video = await db.get(input_video_table, video_id)
+        if not video:
+            raise HTTPException(status_code=404, detail="Video not found")
+        await self._render(video, db, cache)
+        return cache
+
+    async def _render(self, video: input_video_table, db: AsyncSession, cache: ThumbnailCache) -> int:
+        video_id = video.id
+        render = _rendering.get(video_id)
+        if render is None:
+            videos = VideosService()
+            layout = await videos.frame_layout(video, db)
+            # checked again: another render may have started while the layout was read
+            render = _rendering.get(video_id)
+            if render is None:
+                render = asyncio.ensure_future(
+                    analysis_pool.run(render_previews, Path(videos.video_file_path(video)), layout,
+                                      cache.video_directory(video_id), cache.count, cache.width))
+                _rendering[video_id] = render
+                render.add_done_callback(lambda _: _rendering.pop(video_id, None))
+        # shielded, so a waiter that goes away does not cancel the render for the others
+        return await asyncio.shield(render)
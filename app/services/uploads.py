@@ -0,0 +1,189 @@
+import asyncio
+import hashlib
+import logging
+import os
+import uuid
+from contextlib import asynccontextmanager
+from datetime import timedelta
+from pathlib import Path
+from typing import AsyncIterator, ClassVar, Dict, Set, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config.settings import Settings
+from app.database.tables.uploads import UploadSession as upload_session_table
+from app.database.timestamps import utcnow
+from app.models.upload_session import UploadSession, UploadSessionInput
+from app.models.user import User
+from app.models.video import Video
+from app.services.fingerprints import FingerprintsService
+from app.services.utility.blobs import BlobStore
+from app.services.utility.files import StoredFile, append_stream, checksum_file
+from app.services.videos import VideosService
+
+logger = logging.getLogger(__name__)
+
+# uploads a request of this process is currently writing to or finalizing
+_busy: Set[str] = set()
+# running SHA-256 of the bytes received so far, so completing an upload does not read the file again
+_digests: Dict[str, "_RunningDigest"] = {}
+
+
+class _RunningDigest:
+    def __init__(self):
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+
+    def update(self, chunk: bytes) -> None:
+        self.sha256.update(chunk)
+        self.size += len(chunk)
+
+
+@asynccontextmanager
+async def _exclusive(upload_id: str):
+    """
+    Hold an upload for one request. A concurrent PATCH at the same offset, such as a client retrying while its first
+    attempt is still streaming, would otherwise pass the offset check too and write into the same file.
+    """
+    if upload_id in _busy:
+        raise HTTPException(status_code=423, detail="Upload is busy with another request, retry when it finishes")
+    _busy.add(upload_id)
+    try:
+        yield
+    finally:
+        _busy.discard(upload_id)
+
+
+class VideoUploadsService:
+    """
+    Resumable video uploads, modelled on the tus protocol.
+
+    A session is created with the video metadata and total length, chunks are appended at the current offset into
+    a staging file beside the blob store, and finalizing the session moves it into the store and records the video. Sessions without
+    activity for ``upload_session_ttl_seconds`` are garbage-collected together with their partial files.
+    """
+    subclasses: ClassVar[Tuple] = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        VideoUploadsService.subclasses = VideoUploadsService.subclasses + (cls,)
+
+    async def create_upload(self, upload_input: UploadSessionInput, current_user: User, db: AsyncSession,
+                            settings: Settings) -> UploadSession:
+        videos = VideosService()
+        videos.validate_video_metadata(upload_input.format, upload_input.resolution, upload_input.bitDepth,
+                                       upload_input.chromaFormat)
+        await self.collect_abandoned_uploads(db, settings)
+
+        id = str(uuid.uuid4())
+        path = BlobStore.for_settings(settings).staging_path()
+        path.touch()
+
+        db_obj = upload_session_table(id=id, path=str(path), length=upload_input.length, offset=0,
+                                      video_metadata=upload_input.model_dump(exclude={"length"}),
+                                      created_by=current_user.username, last_activity=utcnow())
+        db.add(db_obj)
+        await db.commit()
+        return UploadSession.model_validate(db_obj)
+
+    async def get_upload(self, upload_id: str, current_user: User, db: AsyncSession) -> UploadSession:
+        return UploadSession.model_validate(await self._get_session(upload_id, current_user, db))
+
+    async def append_chunk(self, upload_id: str, offset: int, chunks: AsyncIterator[bytes], current_user: User,
+                           db: AsyncSession) -> UploadSession:
+        """Append the request body at ``offset``, which must match the number of bytes already received."""
+        async with _exclusive(upload_id):
+            session = await self._get_session(upload_id, current_user, db)
+            path = Path(session.path)
+            if offset != session.offset:
+                raise HTTPException(status_code=409, detail=f"Upload offset mismatch, expected {session.offset}")
+
+            # the running hash can only be continued if it covers exactly the bytes kept so far
+            digest = _digests.pop(upload_id, None)
+            if digest is None or digest.size != session.offset:
+                digest = _RunningDigest() if session.offset == 0 else None
+
+            # drop any bytes past the recorded offset left behind by an interrupted request
+            await asyncio.to_thread(os.truncate, path, session.offset)
+            try:
+                await append_stream(chunks, path, session.length - session.offset, digest)
+            except ValueError:
+                raise HTTPException(status_code=413, detail="Chunk exceeds the declared upload length")
+            finally:
+                session.offset = os.path.getsize(path)
+                session.last_activity = utcnow()
+                if digest is not None and digest.size == session.offset:
+                    _digests[upload_id] = digest
+                await db.commit()
+            return UploadSession.model_validate(session)
+
+    async def complete_upload(self, upload_id: str, current_user: User, db: AsyncSession,
+                              settings: Settings) -> Video:
+        async with _exclusive(upload_id):
+            session = await self._get_session(upload_id, current_user, db)
+            if session.offset != session.length:
+                raise HTTPException(status_code=409,
+                                    detail=f"Upload incomplete, received {session.offset} of {session.length} bytes")
+
+            videos = VideosService()
+            metadata = session.video_metadata
+            try:
+                probe = await videos.probe_video_file(session.path, metadata["format"], metadata["frameRate"],
+                                                      metadata["resolution"], metadata["bitDepth"],
+                                                      metadata.get("chromaFormat"))
+                fingerprint, duplicate_of = await FingerprintsService().check_duplicates(session.path, probe, db,
+                                                                                         settings)
+            except HTTPException:
+                # the upload is complete but not a valid (or a rejected duplicate) video, so there is nothing to resume
+                await self._discard(session, db)
+                raise
+
+            digest = _digests.pop(upload_id, None)
+            if digest is not None and digest.size == session.offset:
+                stored = StoredFile(Path(session.path), digest.size, digest.sha256.hexdigest())
+            else:
+                # the hash was lost, for example to a restart since the upload began
+                stored = await asyncio.to_thread(checksum_file, Path(session.path))
+            blob_path = await asyncio.to_thread(BlobStore.for_settings(settings).commit, stored.path, stored.sha256)
+            await db.delete(session)
+            return await videos.record_video(session.id, metadata["title"], metadata["format"],
+                                             metadata["frameRate"], metadata["description"],
+                                             StoredFile(blob_path, stored.size, stored.sha256), probe, current_user,
+                                             db, fingerprint, duplicate_of)
+
+    async def delete_upload(self, upload_id: str, current_user: User, db: AsyncSession) -> None:
+        async with _exclusive(upload_id):
+            await self._discard(await self._get_session(upload_id, current_user, db), db)
+
+    async def collect_abandoned_uploads(self, db: AsyncSession, settings: Settings) -> int:
+        """Delete sessions, and their partial files, with no activity within the session TTL."""
+        cutoff = utcnow() - timedelta(seconds=settings.upload_session_ttl_seconds)
+        result = await db.execute(select(upload_session_table).where(upload_session_table.last_activity < cutoff))
+        # a chunk still streaming in only updates last_activity when it ends
+        abandoned = [session for session in result.scalars().all() if session.id not in _busy]
+        for session in abandoned:
+            logger.info(f"Removing abandoned upload: {session.id}")
+            Path(session.path).unlink(missing_ok=True)
+            _digests.pop(session.id, None)
+            await db.delete(session)
+        if abandoned:
+            await db.commit()
+        return len(abandoned)
+
+    async def _discard(self, session: upload_session_table, db: AsyncSession) -> None:
+        Path(session.path).unlink(missing_ok=True)
+        _digests.pop(session.id, None)
+        await db.delete(session)
+        await db.commit()
+
+    async def _get_session(self, upload_id: str, current_user: User, db: AsyncSession) -> upload_session_table:
+        result = await db.execute(select(upload_session_table).where(upload_session_table.id == upload_id))
+        session = result.scalars().first()
+        if not session:
+            raise HTTPException(status_code=404, detail="Upload not found")
+        if session.created_by != current_user.username and current_user.role not in ("admin", "super_admin"):
+            raise HTTPException(status_code=403, detail="You are not authorized to access this upload")
+        return session
+
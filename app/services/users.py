@@ -7,15 +7,16 @@ from sqlalchemy import or_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.inspection import inspect
-from passlib.context import CryptContext
 import enum
 
+from app.auth.hashing import password_hasher
+from app.auth.principal_cache import principal_cache
 from app.database.tables.user import User as user_table
 from app.models.user import User
 from app.models.user_input import UserInput
+from app.services.utility.pagination import DEFAULT_PAGE_SIZE, Page, paginate
 
 logger = logging.getLogger(__name__)
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
 class UsersService:
@@ -51,7 +52,7 @@ class UsersService:
             raise HTTPException(status_code=400, detail="Email already registered")
 
         data = user_input.model_dump(exclude_none=True, by_alias=True)
-        data["password"] = pwd_context.hash(data["password"])
+        data["password"] = await password_hasher.hash(data["password"])
         db_obj = user_table(**data)
 
         db.add(db_obj)
@@ -59,18 +60,16 @@ class UsersService:
         await db.refresh(db_obj)
         return User.model_validate(self.safe_dict(db_obj))
 
-    async def get_all_users(self, db: AsyncSession, roles: Optional[List[str]] = None) -> List[User]:
+    async def get_all_users(self, db: AsyncSession, roles: Optional[List[str]] = None, cursor: Optional[str] = None,
+                            limit: int = DEFAULT_PAGE_SIZE) -> Page[User]:
         logger.info("Retrieving all users")
         query = select(user_table)
 
         if roles:
             query = query.where(user_table.role.in_(roles))
 
-        result = await db.execute(query)
-        users: List[User] = []
-        for obj in result.scalars().all():
-            users.append(User.model_validate(self.safe_dict(obj)))
-        return users
+        page = await paginate(query, ((user_table.id, False),), cursor, limit, db, "users")
+        return Page([User.model_validate(self.safe_dict(obj)) for obj in page.items], page.next_cursor)
 
     async def get_user_by_name(self, username: str, db: AsyncSession) -> User:
         logger.info(f"Retrieving user: {username}")
@@ -123,13 +122,14 @@ class UsersService:
                 raise HTTPException(status_code=400, detail="Email already registered")
 
         if "password" in update_data:
-            update_data["password"] = pwd_context.hash(update_data["password"])
+            update_data["password"] = await password_hasher.hash(update_data["password"])
 
         for key, val in update_data.items():
             setattr(db_obj, key, val)
 
         db.add(db_obj)
         await db.commit()
+        principal_cache.invalidate(username)
         await db.refresh(db_obj)
         return User.model_validate(self.safe_dict(db_obj))
 
@@ -144,6 +144,7 @@ class UsersService:
 
         await db.delete(db_obj)
         await db.commit()
+        principal_cache.invalidate(username)
         return Response(status_code=204)
 
 
@@ -160,6 +161,7 @@ class UsersService:
 
         db.add(db_obj)
         await db.commit()
+        principal_cache.invalidate(db_obj.username)
         await db.refresh(db_obj)
 
     async def get_user_role_by_id(self, user_id: int, db: AsyncSession) -> str:
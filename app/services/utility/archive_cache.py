@@ -0,0 +1,90 @@
+import asyncio
+import hashlib
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import AsyncIterator, Iterable, Optional, Tuple
+
+from app.config.settings import Settings
+from app.services.utility.zip_stream import stream_zip
+
+
+class ArchiveCache:
+    """
+    On-disk cache of finished result archives, stored as ``<directory>/<experiment_id>/<digest>.zip``.
+
+    The digest covers every result row and the size and mtime of its file, so a stale archive is never served even
+    if invalidation is missed. The cache is kept under ``max_bytes`` by evicting the least recently used archives.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    @classmethod
+    def for_settings(cls, settings: Settings) -> "ArchiveCache":
+        return cls(Path(settings.uploads_directory) / "cache" / "results", settings.result_archive_cache_bytes)
+
+    @staticmethod
+    def digest(result_files) -> str:
+        sha = hashlib.sha256()
+        for result in sorted(result_files, key=lambda r: r.id):
+            try:
+                stat = os.stat(result.path)
+                fingerprint = (stat.st_size, stat.st_mtime_ns)
+            except (OSError, TypeError):
+                fingerprint = (None, None)
+            sha.update(repr((result.id, result.filename, result.path, *fingerprint)).encode())
+        return sha.hexdigest()
+
+    def lookup(self, experiment_id: int, digest: str) -> Optional[Path]:
+        path = self._archive_path(experiment_id, digest)
+        try:
+            os.utime(path)  # mtime doubles as the LRU timestamp
+        except FileNotFoundError:
+            return None
+        return path
+
+    async def stream(self, experiment_id: int, digest: str, entries: Iterable[Tuple[str, str]]) -> AsyncIterator[bytes]:
+        """Stream a freshly built archive to the client and keep it once it has been sent in full."""
+        directory = self.directory / str(experiment_id)
+        directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=directory, suffix=".partial")
+        completed = False
+        try:
+            with os.fdopen(fd, "wb") as tee:
+                async for chunk in stream_zip(entries, tee=tee):
+                    yield chunk
+            completed = True
+        finally:
+            if completed:
+                await asyncio.to_thread(self._commit, Path(tmp_name), self._archive_path(experiment_id, digest))
+            else:
+                Path(tmp_name).unlink(missing_ok=True)
+
+    def invalidate(self, experiment_id: int) -> None:
+        shutil.rmtree(self.directory / str(experiment_id), ignore_errors=True)
+
+    def evict(self) -> None:
+        archives = []
+        for path in self.directory.glob("*/*.zip"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            archives.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in archives)
+        for _, size, path in sorted(archives):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def _commit(self, tmp_path: Path, archive_path: Path) -> None:
+        os.replace(tmp_path, archive_path)
+        self.evict()
+
+    def _archive_path(self, experiment_id: int, digest: str) -> Path:
+        return self.directory / str(experiment_id) / f"{digest}.zip"
@@ -0,0 +1,62 @@
+import asyncio
+import os
+import re
+import uuid
+from pathlib import Path
+from typing import AsyncIterator
+
+from app.config.settings import Settings
+from app.services.utility.files import StoredFile, write_stream
+
+SHA256_PATTERN = re.compile(r"[0-9a-f]{64}")
+
+
+class BlobStore:
+    """
+    Content-addressed file store: each distinct file is kept once at ``<root>/ab/cd/<sha256>``.
+
+    Uploads are staged under ``<root>/tmp`` and renamed into place once their digest is known, so identical
+    content uploaded under different names or experiments shares a single file.
+    """
+
+    def __init__(self, root: Path):
+        self.root = root
+
+    @classmethod
+    def for_settings(cls, settings: Settings) -> "BlobStore":
+        return cls(Path(settings.uploads_directory) / "blobs")
+
+    def path_for(self, sha256: str) -> Path:
+        if not SHA256_PATTERN.fullmatch(sha256):
+            raise ValueError(f"Not a SHA-256 hex digest: {sha256}")
+        return self.root / sha256[:2] / sha256[2:4] / sha256
+
+    def exists(self, sha256: str) -> bool:
+        try:
+            return self.path_for(sha256).is_file()
+        except ValueError:
+            return False
+
+    def staging_path(self) -> Path:
+        """A unique path on the same filesystem as the store, so committing it is a rename rather than a copy."""
+        staging = self.root / "tmp"
+        staging.mkdir(parents=True, exist_ok=True)
+        return staging / uuid.uuid4().hex
+
+    def commit(self, staged: Path, sha256: str) -> Path:
+        """Move a fully written staged file into place, discarding it if the content is already stored."""
+        destination = self.path_for(sha256)
+        if destination.is_file():
+            staged.unlink(missing_ok=True)
+        else:
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(staged, destination)
+        return destination
+
+    async def write(self, chunks: AsyncIterator[bytes]) -> StoredFile:
+        stored = await write_stream(chunks, self.staging_path())
+        path = await asyncio.to_thread(self.commit, stored.path, stored.sha256)
+        return StoredFile(path, stored.size, stored.sha256)
+
+    def remove(self, sha256: str) -> None:
+        self.path_for(sha256).unlink(missing_ok=True)
@@ -0,0 +1,122 @@
+import os
+import stat
+from pathlib import Path
+from typing import Optional, Tuple
+from urllib.parse import quote
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.types import Receive, Scope, Send
+
+from app.config.settings import Settings
+
+ZEROCOPY_SEND = "http.response.zerocopysend"
+PATH_SEND = "http.response.pathsend"
+OFFLOAD_HEADERS = {"x-accel-redirect": "X-Accel-Redirect", "x-sendfile": "X-Sendfile"}
+
+
+class SendfileResponse(FileResponse):
+    """
+    FileResponse that lets the ASGI server copy the file to the socket with ``sendfile`` when it offers to.
+
+    Servers advertising the zero-copy send extension get the open file with an offset and count, which covers whole
+    files and single byte ranges; servers advertising path sends get whole files by path. Everything else - HEAD,
+    multi-range and unsatisfiable requests, and servers offering neither - is answered by ``FileResponse`` itself,
+    reading in chunks large enough to keep the per-chunk overhead small. Only its public interface is used, so
+    upgrades of Starlette cannot silently turn the zero-copy path off.
+    """
+    chunk_size = 1024 * 1024
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        extensions = scope.get("extensions") or {}
+        zerocopy = ZEROCOPY_SEND in extensions
+        if scope["method"].upper() == "HEAD" or not (zerocopy or PATH_SEND in extensions):
+            return await super().__call__(scope, receive, send)
+
+        stat_result = self.stat_result
+        if stat_result is None:
+            try:
+                stat_result = await anyio.to_thread.run_sync(os.stat, self.path)
+            except OSError:
+                # FileResponse reports the missing file
+                return await super().__call__(scope, receive, send)
+            if not stat.S_ISREG(stat_result.st_mode):
+                return await super().__call__(scope, receive, send)
+            self.set_stat_headers(stat_result)
+
+        headers = Headers(scope=scope)
+        byte_range = None
+        if "range" in headers and self._range_applies(headers.get("if-range")):
+            byte_range = parse_byte_range(headers["range"], stat_result.st_size)
+            if byte_range is None or not zerocopy:
+                return await super().__call__(scope, receive, send)
+
+        if byte_range is not None:
+            start, end = byte_range
+            self.headers["content-range"] = f"bytes {start}-{end - 1}/{stat_result.st_size}"
+            self.headers["content-length"] = str(end - start)
+            await send({"type": "http.response.start", "status": 206, "headers": self.raw_headers})
+            with open(self.path, "rb") as file:
+                await send({"type": ZEROCOPY_SEND, "file": file, "offset": start, "count": end - start,
+                            "more_body": False})
+        else:
+            await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+            if zerocopy:
+                with open(self.path, "rb") as file:
+                    await send({"type": ZEROCOPY_SEND, "file": file, "more_body": False})
+            else:
+                await send({"type": PATH_SEND, "path": os.fspath(self.path)})
+
+        if self.background is not None:
+            await self.background()
+
+    def _range_applies(self, if_range: Optional[str]) -> bool:
+        """A Range is only honoured when ``If-Range``, if sent, still matches this file's validator."""
+        return if_range is None or if_range in (self.headers.get("etag"), self.headers.get("last-modified"))
+
+
+def parse_byte_range(header: str, file_size: int) -> Optional[Tuple[int, int]]:
+    """
+    The ``[start, end)`` of a ``Range: bytes=...`` header asking for exactly one satisfiable range of a
+    ``file_size`` byte file, or None for anything else.
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, dash, last = spec.strip().partition("-")
+    if not dash or not (first or last) or not all(part.isdigit() for part in (first, last) if part):
+        return None
+    if not first:
+        # a suffix: the last ``last`` bytes
+        start, end = max(file_size - int(last), 0), file_size
+        return (start, end) if int(last) > 0 and start < end else None
+    start = int(first)
+    end = min(int(last) + 1, file_size) if last else file_size
+    return (start, end) if start < end else None
+
+
+def offload_response(path: str, media_type: str, filename: str, settings: Settings) -> Optional[Response]:
+    """
+    An empty response telling a front proxy to send the file itself: nginx ``X-Accel-Redirect`` to the uploads
+    location under ``download_offload_prefix``, or Apache/lighttpd ``X-Sendfile`` with the absolute path. The proxy
+    then serves it with ``sendfile`` and handles Range requests.
+
+    Returns None when offloading is off or the file lies outside the uploads directory the proxy can see.
+    """
+    if settings.download_offload == "off":
+        return None
+    absolute = Path(os.path.abspath(path))
+    try:
+        relative = absolute.relative_to(os.path.abspath(settings.uploads_directory))
+    except ValueError:
+        return None
+
+    if settings.download_offload == "x-accel-redirect":
+        target = settings.download_offload_prefix.rstrip("/") + "/" + quote(relative.as_posix())
+    else:
+        target = str(absolute)
+    return Response(media_type=media_type, headers={
+        OFFLOAD_HEADERS[settings.download_offload]: target,
+        "Content-Disposition": f"attachment; filename*=utf-8''{quote(filename)}",
+    })
@@ -1,14 +1,84 @@
-import os
+import asyncio
+import hashlib
 from pathlib import Path
-from typing import Iterable
+from typing import AsyncIterator, BinaryIO, NamedTuple
 
 from fastapi import UploadFile
 
+CHUNK_SIZE = 1024 * 1024
+
+
+class StoredFile(NamedTuple):
+    path: Path
+    size: int
+    sha256: str
+
+
+async def iter_upload(file: UploadFile, chunk_size: int = CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """Read an uploaded file in fixed-size chunks"""
+    while chunk := await file.read(chunk_size):
+        yield chunk
+
+
+def _write_chunk(dest_file: BinaryIO, sha256, chunk: bytes) -> None:
+    dest_file.write(chunk)
+    sha256.update(chunk)
+
+
+async def write_stream(chunks: AsyncIterator[bytes], destination: Path) -> StoredFile:
+    """
+    Write a stream of chunks to ``destination``, computing its size and SHA-256 in the same pass.
+
+    Each chunk is written and hashed in a worker thread so the event loop is never blocked on disk, and only one
+    chunk is held in memory at a time. A partially written file is removed if the stream fails.
+    """
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    sha256 = hashlib.sha256()
+    size = 0
+    dest_file = await asyncio.to_thread(open, destination, "wb")
+    try:
+        async for chunk in chunks:
+            await asyncio.to_thread(_write_chunk, dest_file, sha256, chunk)
+            size += len(chunk)
+    except BaseException:
+        await asyncio.to_thread(dest_file.close)
+        destination.unlink(missing_ok=True)
+        raise
+    await asyncio.to_thread(dest_file.close)
+    return StoredFile(destination, size, sha256.hexdigest())
+
+
+async def append_stream(chunks: AsyncIterator[bytes], destination: Path, max_bytes: int, sha256=None) -> int:
+    """
+    Append a stream of chunks to ``destination`` in worker threads, returning the number of bytes written.
+
+    Raises ``ValueError`` rather than write more than ``max_bytes``. Bytes written before a failure are kept, so
+    the file size is always the number of bytes received so far. Each chunk is fed to ``sha256``, if given, once it
+    has been written.
+    """
+    written = 0
+    dest_file = await asyncio.to_thread(open, destination, "ab")
+    try:
+        async for chunk in chunks:
+            if written + len(chunk) > max_bytes:
+                raise ValueError("Stream is longer than the declared length")
+            if sha256 is None:
+                await asyncio.to_thread(dest_file.write, chunk)
+            else:
+                await asyncio.to_thread(_write_chunk, dest_file, sha256, chunk)
+            written += len(chunk)
+    finally:
+        await asyncio.to_thread(dest_file.close)
+    return written
+
+
+def checksum_file(path: Path, chunk_size: int = CHUNK_SIZE) -> StoredFile:
+    """Compute the size and SHA-256 of a stored file. Blocking; call from a worker thread."""
+    sha256 = hashlib.sha256()
+    size = 0
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            sha256.update(chunk)
+            size += len(chunk)
+    return StoredFile(path, size, sha256.hexdigest())
 
-def upload_file(file: UploadFile, *path_components: [Iterable[str]]) -> Path:
-    """Save file to local uploads storage bucket"""
-    destination = Path('\\'.join(path_components)) / Path(file.filename)
-    os.makedirs(destination.parent.resolve(), exist_ok=True)
-    with open(destination, 'wb') as dest_file:
-        dest_file.write(file.file.read())
-    return destination
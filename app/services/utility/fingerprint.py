@@ -0,0 +1,58 @@
+from pathlib import Path
+from typing import List
+
+import cv2
+import numpy as np
+
+from app.services.utility.video_probe import VideoProbe
+from app.services.utility.yuv_reader import YuvReader, evenly_spaced_frames
+
+FRAMES = 16
+HASH_BITS = 64
+BAND_BITS = 16
+BANDS_PER_FRAME = HASH_BITS // BAND_BITS
+FINGERPRINT_BYTES = FRAMES * HASH_BITS // 8
+
+
+def frame_hash(luma: np.ndarray) -> int:
+    """
+    64-bit difference hash of a luma plane: shrink it to 9x8 with area averaging and record whether each sample is
+    brighter than its right-hand neighbour. Survives rescaling, re-encoding and small brightness shifts.
+    """
+    small = cv2.resize(luma.astype(np.float32), (9, 8), interpolation=cv2.INTER_AREA)
+    bits = (small[:, 1:] > small[:, :-1]).ravel()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def video_fingerprint(path: Path, layout: VideoProbe) -> bytes:
+    """
+    Difference hashes of ``FRAMES`` evenly spaced frames, concatenated. Blocking; call from a worker thread.
+
+    Frames are sampled by position in the video, so copies of a sequence in another container, resolution or bit
+    depth fingerprint alike, while a trimmed copy does not. Short videos repeat their frames to fill the length;
+    an empty video has an empty fingerprint.
+    """
+    frames = evenly_spaced_frames(layout.frameCount, FRAMES)
+    if not frames:
+        return b""
+    with YuvReader(path, layout) as reader:
+        hashes = [frame_hash(reader.frame(n)[0]) for n in frames]
+    hashes = [hashes[i * len(hashes) // FRAMES] for i in range(FRAMES)]
+    return b"".join(h.to_bytes(HASH_BITS // 8, "big") for h in hashes)
+
+
+def band_keys(fingerprint: bytes) -> List[int]:
+    """
+    The index keys of a fingerprint: each frame hash split into 16-bit bands, keyed by position and value.
+
+    Near-duplicates differ in a few bits of each hash, so they are all but certain to agree exactly on at least one
+    of the 64 bands, which makes candidates findable with equality lookups.
+    """
+    values = np.frombuffer(fingerprint, dtype=">u2")
+    return [band << BAND_BITS | int(value) for band, value in enumerate(values)]
+
+
+def distance(first: bytes, second: bytes) -> float:
+    """Mean number of differing bits per frame hash, from 0 (identical) to 64."""
+    a, b = np.frombuffer(first, dtype=np.uint8), np.frombuffer(second, dtype=np.uint8)
+    return int(np.unpackbits(a ^ b).sum()) / FRAMES
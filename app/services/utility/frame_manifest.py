@@ -0,0 +1,25 @@
+import hashlib
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+from app.services.utility.video_probe import VideoProbe
+from app.services.utility.yuv_reader import YuvReader
+
+
+def frame_md5s(path: Path, layout: VideoProbe) -> List[str]:
+    """
+    Hex MD5 of the pixel data of every frame, like ffmpeg's ``framemd5`` muxer on raw video of the same pixel format.
+
+    Blocking; call from a worker thread. A single sequential pass over the memory-mapped file: frame headers are
+    skipped and hashlib releases the GIL while it hashes each frame.
+    """
+    with YuvReader(path, layout) as reader:
+        return [hashlib.md5(reader.frame_bytes(n)).hexdigest() for n in range(len(reader))]
+
+
+def first_mismatch(first: Sequence[str], second: Sequence[str]) -> Optional[int]:
+    """The first frame whose checksums differ, or that only one side has; ``None`` when the sequences match."""
+    for n, (a, b) in enumerate(zip(first, second)):
+        if a != b:
+            return n
+    return None if len(first) == len(second) else min(len(first), len(second))
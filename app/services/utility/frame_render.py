@@ -0,0 +1,54 @@
+import cv2
+import numpy as np
+
+from app.services.utility.yuv_reader import Planes, YuvReader
+
+IMAGE_FORMATS = {"png": (".png", "image/png"), "jpeg": (".jpg", "image/jpeg")}
+JPEG_QUALITY = 90
+
+
+def to_bgr(planes: Planes, chroma_format: str, bit_depth: int) -> np.ndarray:
+    """
+    Convert planar YUV to an 8-bit BGR image (or greyscale for mono) using limited-range BT.601.
+
+    Chroma planes are upsampled by repetition and the conversion runs as whole-array NumPy arithmetic.
+    """
+    if bit_depth > 8:
+        planes = tuple((plane >> (bit_depth - 8)).astype(np.uint8) for plane in planes)
+    y = planes[0]
+    if chroma_format == "mono":
+        return y
+
+    height, width = y.shape
+    u, v = (np.repeat(np.repeat(plane, -(-height // plane.shape[0]), axis=0), -(-width // plane.shape[1]),
+                      axis=1)[:height, :width] for plane in planes[1:])
+    luma = (y.astype(np.float32) - 16) * 1.164
+    cb, cr = u.astype(np.float32) - 128, v.astype(np.float32) - 128
+    bgr = np.dstack((luma + 2.018 * cb, luma - 0.391 * cb - 0.813 * cr, luma + 1.596 * cr))
+    return np.clip(bgr + 0.5, 0, 255).astype(np.uint8)
+
+
+def decode_frame(reader: YuvReader, n: int) -> np.ndarray:
+    """Frame ``n`` as an 8-bit BGR image (greyscale for mono)."""
+    layout = reader.layout
+    if layout.chromaFormat == "420" and layout.bitDepth == 8 and not layout.width % 2 and not layout.height % 2:
+        # the frame is already contiguous I420, which cv2 converts straight from the mapped bytes
+        i420 = reader.frame_bytes(n).reshape(layout.height * 3 // 2, layout.width)
+        image = cv2.cvtColor(i420, cv2.COLOR_YUV2BGR_I420)
+        del i420
+    else:
+        planes = reader.frame(n)
+        image = to_bgr(planes, layout.chromaFormat, layout.bitDepth)
+        del planes
+    return image
+
+
+def render_frame(reader: YuvReader, n: int, image_format: str) -> bytes:
+    """Encode frame ``n`` as PNG or JPEG. Blocking; call from a worker thread."""
+    image = decode_frame(reader, n)
+    extension, _ = IMAGE_FORMATS[image_format]
+    params = [cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY] if image_format == "jpeg" else []
+    ok, encoded = cv2.imencode(extension, image, params)
+    if not ok:
+        raise ValueError(f"Could not encode frame {n} as {image_format}")
+    return encoded.tobytes()
@@ -0,0 +1,113 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Generic, List, Optional, Sequence, Tuple, TypeVar
+
+from fastapi import HTTPException, Request, Response
+from sqlalchemy import Select, and_, false, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+T = TypeVar("T")
+# a sort column and whether it is descending; the last one must be unique so the order is total
+SortKey = Tuple[InstrumentedAttribute, bool]
+
+
+@dataclass
+class Page(Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str]
+
+
+async def paginate(query: Select, keys: Sequence[SortKey], cursor: Optional[str], limit: int, db: AsyncSession,
+                   scope: str) -> Page:
+    """
+    One page of ``query`` ordered by ``keys``, starting after the row the cursor points at.
+
+    Pages are found by comparing against the last row's sort values rather than by offset, so every page is an index
+    range scan however deep it is, and rows inserted or deleted meanwhile do not shift later pages. Nullable columns
+    sort their NULLs last. The cursor is opaque to clients and tied to ``scope``, which names the endpoint and sort
+    so a cursor cannot be replayed against another ordering.
+    """
+    if cursor is not None:
+        query = query.where(_after(keys, _decode(cursor, scope, len(keys))))
+    query = query.order_by(*(_ordering(column, descending) for column, descending in keys)).limit(limit + 1)
+
+    result = await db.execute(query)
+    # whole entities come back as objects, selected columns as rows; both expose the sort keys as attributes
+    descriptions = query.column_descriptions
+    entity = len(descriptions) == 1 and descriptions[0]["expr"] is descriptions[0]["entity"]
+    rows = list(result.scalars().all() if entity else result.all())
+    if len(rows) <= limit:
+        return Page(rows, None)
+    rows = rows[:limit]
+    return Page(rows, _encode(scope, [getattr(rows[-1], column.key) for column, _ in keys]))
+
+
+def set_page_headers(page: Page, request: Request, response: Response) -> None:
+    """Point clients at the next page with an ``X-Next-Cursor`` header and an RFC 8288 ``Link`` header."""
+    if page.next_cursor is not None:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+        response.headers["Link"] = f'<{request.url.include_query_params(cursor=page.next_cursor)}>; rel="next"'
+
+
+def _nullable(column: InstrumentedAttribute) -> bool:
+    return column.expression.nullable
+
+
+def _ordering(column: InstrumentedAttribute, descending: bool):
+    ordering = column.desc() if descending else column.asc()
+    return ordering.nulls_last() if _nullable(column) else ordering
+
+
+def _after(keys: Sequence[SortKey], values: List[Any]):
+    """Rows sorting strictly after ``values``: equal on a prefix of the keys and after it on the next one."""
+    terms, equal = [], []
+    for (column, descending), value in zip(keys, values):
+        if value is None:
+            # NULLs sort last, so only rows tied on this NULL can follow
+            equal.append(column.is_(None))
+            continue
+        after = column < value if descending else column > value
+        if _nullable(column):
+            after = or_(after, column.is_(None))
+        terms.append(and_(*equal, after))
+        equal.append(column == value)
+    return or_(*terms) if terms else false()
+
+
+def _encode(scope: str, values: List[Any]) -> str:
+    return base64.urlsafe_b64encode(json.dumps([scope, *map(_tag, values)]).encode()).decode().rstrip("=")
+
+
+def _decode(cursor: str, scope: str, length: int) -> List[Any]:
+    try:
+        decoded = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if isinstance(decoded, list):
+            decoded = [decoded[0], *map(_untag, decoded[1:])] if decoded else decoded
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+        decoded = None
+    if not isinstance(decoded, list) or len(decoded) != length + 1 or decoded[0] != scope:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return decoded[1:]
+
+
+def _tag(value: Any) -> Any:
+    """JSON has no datetime, so timestamps travel as ISO 8601 strings tagged to tell them apart from text."""
+    if isinstance(value, datetime):
+        return {"datetime": value.isoformat()}
+    return value
+
+
+def _untag(value: Any) -> Any:
+    if isinstance(value, dict):
+        if set(value) != {"datetime"}:
+            raise ValueError("Unknown cursor value")
+        parsed = datetime.fromisoformat(value["datetime"])
+        return parsed if parsed.tzinfo is not None else parsed.replace(tzinfo=timezone.utc)
+    return value
@@ -0,0 +1,80 @@
+from fractions import Fraction
+from pathlib import Path
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+from app.services.utility.video_probe import VideoProbe, frame_size, y4m_colorspace
+from app.services.utility.yuv_reader import YuvReader, plane_shapes
+
+FRAME_HEADER = b"FRAME\n"
+BATCH_SIZE = 4
+DEFAULT_FRAME_RATE = Fraction(25)
+
+
+def proxy_header(source: VideoProbe, scale: int, bit_depth: int, frame_rate: Optional[Fraction]) -> bytes:
+    """The Y4M stream header of a proxy ``scale`` times smaller than ``source`` in each dimension."""
+    frame_rate = frame_rate or DEFAULT_FRAME_RATE
+    width, height = max(1, source.width // scale), max(1, source.height // scale)
+    return (f"YUV4MPEG2 W{width} H{height} F{frame_rate.numerator}:{frame_rate.denominator} Ip A1:1 "
+            f"C{y4m_colorspace(source.chromaFormat, bit_depth)}\n").encode()
+
+
+def proxy_layout(source: VideoProbe, header: bytes, scale: int, bit_depth: int,
+                 frame_rate: Optional[Fraction]) -> VideoProbe:
+    """Layout of the proxy file: every frame has the same ``FRAME`` header, so it has a single stride."""
+    width, height = max(1, source.width // scale), max(1, source.height // scale)
+    size = frame_size(width, height, source.chromaFormat, bit_depth)
+    return VideoProbe(width, height, frame_rate or DEFAULT_FRAME_RATE, source.chromaFormat, bit_depth,
+                      source.frameCount, len(header) + len(FRAME_HEADER), size, size + len(FRAME_HEADER), None)
+
+
+def downscale(plane: np.ndarray, shape: Tuple[int, int], scale: int, bit_depth: int, shift: int) -> np.ndarray:
+    """
+    Area-average a ``(frames, height, width)`` plane batch down to ``shape``, dropping ``shift`` bits per sample to
+    reach ``bit_depth``.
+
+    When the plane is an exact multiple of the target, the whole batch is averaged at once by reshaping each
+    ``scale`` x ``scale`` block onto its own axes; other sizes are resized frame by frame with cv2's area filter.
+    """
+    height, width = shape
+    if plane.shape[1:] == (height * scale, width * scale):
+        averaged = plane.reshape(len(plane), height, scale, width, scale).mean(axis=(2, 4), dtype=np.float32)
+    else:
+        averaged = np.stack([cv2.resize(frame.astype(np.float32), (width, height), interpolation=cv2.INTER_AREA)
+                             for frame in plane])
+    if shift:
+        averaged /= 1 << shift
+    dtype = np.uint8 if bit_depth <= 8 else np.dtype("<u2")
+    return np.clip(averaged + 0.5, 0, (1 << bit_depth) - 1).astype(dtype)
+
+
+def create_proxy_file(path: Path, header: bytes, layout: VideoProbe) -> None:
+    """Write the stream header and size the file for every frame, so chunks can be written in parallel."""
+    with open(path, "wb") as f:
+        f.write(header)
+        f.truncate(layout.offset_of(layout.frameCount - 1) + layout.frameSize if layout.frameCount else len(header))
+
+
+def write_proxy_frames(source_path: Path, source: VideoProbe, proxy_path: Path, proxy: VideoProbe, scale: int,
+                       frames: range) -> int:
+    """
+    Downscale ``frames`` of the source into their slots in the proxy file. Runs in a worker process.
+
+    Frames are read as views over the memory-mapped source a small batch at a time, so memory stays bounded by the
+    batch size whatever the length of the video, and each chunk writes only its own byte range of the proxy.
+    """
+    shift = source.bitDepth - proxy.bitDepth
+    shapes = plane_shapes(proxy)
+    with YuvReader(source_path, source) as reader, open(proxy_path, "r+b") as output:
+        for batch, planes in reader.batches(BATCH_SIZE, frames):
+            scaled = [downscale(plane, shape, scale, proxy.bitDepth, shift)
+                      for plane, shape in zip(planes, shapes)]
+            del planes
+            output.seek(proxy.offset_of(batch[0]) - len(FRAME_HEADER))
+            for i in range(len(batch)):
+                output.write(FRAME_HEADER)
+                for plane in scaled:
+                    output.write(plane[i].tobytes())
+    return len(frames)
@@ -0,0 +1,66 @@
+import math
+from pathlib import Path
+from typing import Dict, List
+
+import cv2
+import numpy as np
+
+from app.services.utility.video_probe import VideoProbe
+from app.services.utility.yuv_reader import YuvReader
+
+PLANES = ("y", "u", "v")
+# identical frames have infinite PSNR; report this instead so values stay finite and averageable
+PSNR_CAP = 100.0
+BATCH_SIZE = 8
+
+FrameMetrics = Dict[str, List[float]]
+
+
+def psnr(reference: np.ndarray, distorted: np.ndarray, peak: int) -> np.ndarray:
+    """Per-frame PSNR of ``(frames, height, width)`` planes."""
+    diff = reference.astype(np.int32) - distorted
+    mse = np.square(diff, dtype=np.int64).mean(axis=(1, 2))
+    with np.errstate(divide="ignore"):
+        values = 10 * np.log10(peak * peak / mse)
+    return np.minimum(values, PSNR_CAP)
+
+
+def ssim(reference: np.ndarray, distorted: np.ndarray, peak: int) -> float:
+    """Mean SSIM of one luma plane, with the usual 11x11 Gaussian window (sigma 1.5)."""
+    c1, c2 = (0.01 * peak) ** 2, (0.03 * peak) ** 2
+    x, y = reference.astype(np.float32), distorted.astype(np.float32)
+
+    def blur(image):
+        return cv2.GaussianBlur(image, (11, 11), 1.5)
+
+    mu_x, mu_y = blur(x), blur(y)
+    mu_xx, mu_yy, mu_xy = mu_x * mu_x, mu_y * mu_y, mu_x * mu_y
+    sigma_xx, sigma_yy, sigma_xy = blur(x * x) - mu_xx, blur(y * y) - mu_yy, blur(x * y) - mu_xy
+    ssim_map = ((2 * mu_xy + c1) * (2 * sigma_xy + c2)) / ((mu_xx + mu_yy + c1) * (sigma_xx + sigma_yy + c2))
+    return float(ssim_map.mean())
+
+
+def compare_frames(reference_path: Path, reference_layout: VideoProbe, distorted_path: Path,
+                   distorted_layout: VideoProbe, frames: range) -> FrameMetrics:
+    """
+    PSNR of every plane and luma SSIM for ``frames`` of two videos with the same layout.
+
+    Runs in a worker process: frames are read in batches of views over memory-mapped files, PSNR is computed for the
+    whole batch at once and SSIM frame by frame.
+    """
+    peak = (1 << reference_layout.bitDepth) - 1
+    metrics: FrameMetrics = {**{f"psnr_{plane}": [] for plane in PLANES}, "ssim": []}
+    with YuvReader(reference_path, reference_layout) as reference, \
+            YuvReader(distorted_path, distorted_layout) as distorted:
+        for (batch, reference_planes), (_, distorted_planes) in zip(reference.batches(BATCH_SIZE, frames),
+                                                                    distorted.batches(BATCH_SIZE, frames)):
+            for plane, a, b in zip(PLANES, reference_planes, distorted_planes):
+                metrics[f"psnr_{plane}"].extend(psnr(a, b, peak).tolist())
+            metrics["ssim"].extend(ssim(a, b, peak) for a, b in zip(reference_planes[0], distorted_planes[0]))
+            del reference_planes, distorted_planes, a, b
+    return metrics
+
+
+def summarize(metrics: FrameMetrics) -> Dict[str, float]:
+    """Mean of each per-frame metric."""
+    return {name: math.fsum(values) / len(values) for name, values in metrics.items() if values}
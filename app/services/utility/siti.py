@@ -0,0 +1,64 @@
+import math
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+from app.services.utility.video_probe import VideoProbe
+from app.services.utility.yuv_reader import YuvReader
+
+BATCH_SIZE = 4
+
+FrameSiti = Dict[str, List[float]]
+
+
+def spatial_information(luma: np.ndarray) -> np.ndarray:
+    """
+    Per-frame SI of a ``(frames, height, width)`` float luma batch: the spatial standard deviation of the Sobel
+    gradient magnitude, over the pixels with a full 3x3 neighbourhood.
+    """
+    left, centre, right = luma[:, :, :-2], luma[:, :, 1:-1], luma[:, :, 2:]
+    # separable Sobel: smooth across one axis, difference along the other
+    gx = right[:, :-2] + 2 * right[:, 1:-1] + right[:, 2:] - left[:, :-2] - 2 * left[:, 1:-1] - left[:, 2:]
+    smoothed = left + 2 * centre + right
+    gy = smoothed[:, 2:] - smoothed[:, :-2]
+    return np.sqrt(gx * gx + gy * gy).std(axis=(1, 2))
+
+
+def temporal_information(luma: np.ndarray, previous: np.ndarray) -> np.ndarray:
+    """Per-frame TI of a luma batch: the spatial standard deviation of its difference from the frame before."""
+    before = np.concatenate((previous[np.newaxis], luma[:-1]))
+    return (luma - before).std(axis=(1, 2))
+
+
+def siti_frames(path: Path, layout: VideoProbe, frames: range) -> FrameSiti:
+    """
+    ITU-T P.910 SI and TI of each of ``frames`` of a stored video, on an 8-bit luma scale.
+
+    Runs in a worker process. TI needs the frame before each one, so a chunk that does not start at the first frame
+    also reads its predecessor; the first frame of the video has no TI.
+    """
+    scale = np.float32(1 / (1 << (layout.bitDepth - 8)))
+    result: FrameSiti = {"si": [], "ti": []}
+    with YuvReader(path, layout) as reader:
+        previous = reader.frame(frames[0] - 1)[0] * scale if frames and frames[0] > 0 else None
+        for _, planes in reader.batches(BATCH_SIZE, frames):
+            luma = planes[0] * scale
+            del planes
+            result["si"].extend(spatial_information(luma).tolist())
+            if previous is None:
+                previous, luma = luma[0], luma[1:]
+            if len(luma):
+                result["ti"].extend(temporal_information(luma, previous).tolist())
+                previous = luma[-1]
+    return result
+
+
+def summarize_siti(siti: FrameSiti) -> Dict[str, float]:
+    """P.910 summary values, the maximum of each over time, alongside the means."""
+    summary = {}
+    for name, values in siti.items():
+        if values:
+            summary[f"{name}Max"] = max(values)
+            summary[f"{name}Mean"] = math.fsum(values) / len(values)
+    return summary
@@ -0,0 +1,92 @@
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+import cv2
+import numpy as np
+
+from app.config.settings import Settings
+from app.services.utility.frame_render import JPEG_QUALITY, decode_frame
+from app.services.utility.video_probe import VideoProbe
+from app.services.utility.yuv_reader import YuvReader, evenly_spaced_frames
+
+CONTACT_SHEET_COLUMNS = 4
+
+
+def render_previews(path: Path, layout: VideoProbe, directory: Path, count: int, width: int) -> int:
+    """
+    Write downscaled JPEG thumbnails of evenly spaced frames and a contact sheet of them into ``directory``.
+
+    Blocking; run in a worker process. Only the chosen frames are read from the memory-mapped file. Each image is
+    written to a temporary file and renamed into place, and the contact sheet is written last, so its presence means
+    the set is complete. Returns the number of thumbnails.
+    """
+    height = max(1, round(layout.height * min(width, layout.width) / layout.width))
+    size = (min(width, layout.width), height)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    thumbnails = []
+    with YuvReader(path, layout) as reader:
+        for i, n in enumerate(evenly_spaced_frames(layout.frameCount, count)):
+            image = decode_frame(reader, n)
+            thumbnail = cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+            if thumbnail.ndim == 2:
+                thumbnail = cv2.cvtColor(thumbnail, cv2.COLOR_GRAY2BGR)
+            _write_jpeg(directory / f"{i}.jpg", thumbnail)
+            thumbnails.append(thumbnail)
+
+    columns = min(CONTACT_SHEET_COLUMNS, len(thumbnails))
+    rows = -(-len(thumbnails) // columns)
+    sheet = np.zeros((rows * size[1], columns * size[0], 3), dtype=np.uint8)
+    for i, thumbnail in enumerate(thumbnails):
+        row, column = divmod(i, columns)
+        sheet[row * size[1]:(row + 1) * size[1], column * size[0]:(column + 1) * size[0]] = thumbnail
+    _write_jpeg(directory / "contact.jpg", sheet)
+    return len(thumbnails)
+
+
+def _write_jpeg(path: Path, image: np.ndarray) -> None:
+    ok, encoded = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY])
+    if not ok:
+        raise ValueError(f"Could not encode {path.name}")
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".partial")
+    with os.fdopen(fd, "wb") as f:
+        f.write(encoded.tobytes())
+    os.replace(tmp_name, path)
+
+
+class ThumbnailCache:
+    """
+    On-disk cache of video previews, stored as ``<directory>/<video_id>/<n>.jpg`` plus ``contact.jpg``.
+
+    Stored videos never change, so previews stay valid until the video is deleted and can be served as immutable.
+    """
+
+    def __init__(self, directory: Path, count: int, width: int):
+        self.directory = directory
+        self.count = count
+        self.width = width
+
+    @classmethod
+    def for_settings(cls, settings: Settings) -> "ThumbnailCache":
+        return cls(Path(settings.uploads_directory) / "cache" / "thumbnails", settings.thumbnail_count,
+                   settings.thumbnail_width)
+
+    def video_directory(self, video_id: str) -> Path:
+        return self.directory / video_id
+
+    def thumbnail(self, video_id: str, n: int) -> Optional[Path]:
+        path = self.video_directory(video_id) / f"{n}.jpg"
+        return path if self.is_complete(video_id) and path.is_file() else None
+
+    def contact_sheet(self, video_id: str) -> Optional[Path]:
+        path = self.video_directory(video_id) / "contact.jpg"
+        return path if path.is_file() else None
+
+    def is_complete(self, video_id: str) -> bool:
+        return (self.video_directory(video_id) / "contact.jpg").is_file()
+
+    def remove(self, video_id: str) -> None:
+        shutil.rmtree(self.video_directory(video_id), ignore_errors=True)
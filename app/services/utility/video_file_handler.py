@@ -1,14 +1,17 @@
 import os
-import shutil
+from pathlib import Path
+from typing import AsyncIterator
 
-import cv2
+from fastapi import UploadFile
 
+from app.services.utility.files import StoredFile, iter_upload, write_stream
 
-def store_video_file(video, file_path, filename):
-    path = os.path.join(file_path, filename)
-    with open(path, "wb") as buffer:
-        shutil.copyfileobj(video, buffer)
-    return {"filename": filename, "saved_to": file_path}
+
+async def store_video_file(video: UploadFile, file_path, filename) -> StoredFile:
+    return await store_video_stream(iter_upload(video), file_path, filename)
+
+async def store_video_stream(chunks: AsyncIterator[bytes], file_path, filename) -> StoredFile:
+    return await write_stream(chunks, Path(file_path) / filename)
 
 def delete_video_file(file_path):
     if os.path.exists(file_path):
@@ -0,0 +1,168 @@
+import mmap
+import os
+import re
+from fractions import Fraction
+from pathlib import Path
+from typing import List, NamedTuple, Optional
+
+Y4M_SIGNATURE = b"YUV4MPEG2 "
+FRAME_MARKER = b"FRAME"
+# header lines are a few dozen bytes; anything longer than this is not a Y4M header
+MAX_HEADER_BYTES = 1024
+
+CHROMA_FORMATS = ("420", "422", "444", "mono")
+_Y4M_COLORSPACE = re.compile(r"(420|422|444|mono)(?:jpeg|paldv|mpeg2)?(?:p?(\d+))?")
+
+
+class ProbeError(ValueError):
+    """The file is truncated, malformed, or does not match its declared layout."""
+
+
+class VideoProbe(NamedTuple):
+    """
+    Frame layout of a stored raw video.
+
+    Frame ``n``'s pixel data starts at ``frameOffset + n * frameStride`` and is ``frameSize`` bytes long. Y4M files
+    whose ``FRAME`` headers vary in length have no single stride, so their data offsets are listed in ``frameIndex``.
+    """
+    width: int
+    height: int
+    frameRate: Optional[Fraction]
+    chromaFormat: str
+    bitDepth: int
+    frameCount: int
+    frameOffset: int
+    frameSize: int
+    frameStride: Optional[int]
+    frameIndex: Optional[List[int]]
+
+    def offset_of(self, frame: int) -> int:
+        if self.frameIndex is not None:
+            return self.frameIndex[frame]
+        return self.frameOffset + frame * self.frameStride
+
+
+def frame_size(width: int, height: int, chroma_format: str, bit_depth: int) -> int:
+    """Bytes of planar pixel data in one frame."""
+    chroma_width, chroma_height = -(-width // 2), -(-height // 2)
+    chroma_samples = {"420": 2 * chroma_width * chroma_height, "422": 2 * chroma_width * height,
+                      "444": 2 * width * height, "mono": 0}[chroma_format]
+    return (width * height + chroma_samples) * (2 if bit_depth > 8 else 1)
+
+
+def parse_resolution(resolution: str) -> tuple[int, int]:
+    width, height = (int(value) for value in resolution.lower().split("x"))
+    return width, height
+
+
+def probe_video(path: Path, format: str, resolution: Optional[str] = None, chroma_format: Optional[str] = None,
+                bit_depth: Optional[int] = None) -> VideoProbe:
+    """
+    Read the frame layout of a ``y4m`` or ``yuv`` file. Blocking; call from a worker thread.
+
+    Only the stream and frame headers are read, never the pixel data, so probing costs a few page reads per frame.
+    Raw ``yuv`` carries no header, so its layout comes from ``resolution``, ``chroma_format`` and ``bit_depth``.
+    """
+    if format == "y4m":
+        return _probe_y4m(path)
+    if not resolution or not bit_depth:
+        raise ProbeError("Raw yuv video requires a resolution and bit depth")
+    width, height = parse_resolution(resolution)
+    return _probe_yuv(path, width, height, chroma_format or "420", bit_depth)
+
+
+def _probe_yuv(path: Path, width: int, height: int, chroma_format: str, bit_depth: int) -> VideoProbe:
+    size = os.path.getsize(path)
+    stride = frame_size(width, height, chroma_format, bit_depth)
+    if size == 0 or size % stride:
+        raise ProbeError(f"File size {size} is not a whole number of {stride}-byte {width}x{height} "
+                         f"{chroma_format} frames")
+    return VideoProbe(width, height, None, chroma_format, bit_depth, size // stride, 0, stride, stride, None)
+
+
+def _probe_y4m(path: Path) -> VideoProbe:
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise ProbeError("File is empty")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            header_end = mm.find(b"\n", 0, MAX_HEADER_BYTES)
+            if mm[:len(Y4M_SIGNATURE)] != Y4M_SIGNATURE or header_end < 0:
+                raise ProbeError("Missing YUV4MPEG2 stream header")
+            width, height, frame_rate, chroma_format, bit_depth = _parse_y4m_header(mm[:header_end])
+            size = frame_size(width, height, chroma_format, bit_depth)
+            offsets = _index_y4m_frames(mm, header_end + 1, size)
+
+    strides = {b - a for a, b in zip(offsets, offsets[1:])}
+    if len(strides) > 1:
+        return VideoProbe(width, height, frame_rate, chroma_format, bit_depth, len(offsets), offsets[0], size, None,
+                          offsets)
+    stride = strides.pop() if strides else len(FRAME_MARKER) + 1 + size
+    return VideoProbe(width, height, frame_rate, chroma_format, bit_depth, len(offsets), offsets[0], size, stride,
+                      None)
+
+
+def _parse_y4m_header(header: bytes):
+    width = height = frame_rate = None
+    chroma_format, bit_depth = "420", 8
+    for token in header[len(Y4M_SIGNATURE):].decode("ascii", errors="replace").split():
+        tag, value = token[0], token[1:]
+        try:
+            if tag == "W":
+                width = int(value)
+            elif tag == "H":
+                height = int(value)
+            elif tag == "F":
+                numerator, denominator = value.split(":")
+                frame_rate = Fraction(int(numerator), int(denominator))
+            elif tag == "C":
+                match = _Y4M_COLORSPACE.fullmatch(value)
+                if not match:
+                    raise ProbeError(f"Unsupported Y4M colorspace: {value}")
+                chroma_format, bit_depth = match.group(1), int(match.group(2) or 8)
+        except ProbeError:
+            raise
+        except (ValueError, ZeroDivisionError):
+            raise ProbeError(f"Malformed Y4M header parameter: {token}")
+
+    if not width or not height or width < 0 or height < 0:
+        raise ProbeError("Y4M header is missing the frame width or height")
+    return width, height, frame_rate, chroma_format, bit_depth
+
+
+def _index_y4m_frames(mm: mmap.mmap, start: int, size: int) -> List[int]:
+    """Walk the FRAME headers from ``start``, returning the offset of each frame's pixel data."""
+    offsets = []
+    position, end = start, len(mm)
+    while position < end:
+        if mm[position:position + len(FRAME_MARKER)] != FRAME_MARKER:
+            raise ProbeError(f"Missing FRAME header at byte {position}, frame {len(offsets)}")
+        line_end = mm.find(b"\n", position, min(end, position + MAX_HEADER_BYTES))
+        if line_end < 0:
+            raise ProbeError(f"Unterminated FRAME header at byte {position}, frame {len(offsets)}")
+        data = line_end + 1
+        if data + size > end:
+            raise ProbeError(f"Frame {len(offsets)} is truncated: expected {size} bytes, found {end - data}")
+        offsets.append(data)
+        position = data + size
+
+    if not offsets:
+        raise ProbeError("Y4M file contains no frames")
+    return offsets
+
+
+def read_y4m_header(path: Path) -> bytes:
+    """The stream header line of a Y4M file, newline included. Blocking; call from a worker thread."""
+    with open(path, "rb") as f:
+        header = f.readline(MAX_HEADER_BYTES)
+    if not header.startswith(Y4M_SIGNATURE) or not header.endswith(b"\n"):
+        raise ProbeError("Missing YUV4MPEG2 stream header")
+    return header
+
+
+def y4m_colorspace(chroma_format: str, bit_depth: int) -> str:
+    """The Y4M ``C`` parameter for a planar layout."""
+    if chroma_format == "mono":
+        return "mono" if bit_depth == 8 else f"mono{bit_depth}"
+    if bit_depth == 8:
+        return "420jpeg" if chroma_format == "420" else chroma_format
+    return f"{chroma_format}p{bit_depth}"
@@ -0,0 +1,102 @@
+import asyncio
+import mmap
+from pathlib import Path
+from typing import AsyncIterator, Iterator, List, Optional, Tuple, Union
+
+from app.services.utility.files import CHUNK_SIZE
+from app.services.utility.video_probe import FRAME_MARKER, VideoProbe, read_y4m_header, y4m_colorspace
+
+Y4M_FRAME_HEADER = FRAME_MARKER + b"\n"
+DEFAULT_FRAME_RATE = 25
+
+# a byte range of the source file, or literal bytes to emit between ranges
+Piece = Union[Tuple[int, int], bytes]
+
+
+class VideoStream:
+    """
+    Stream a range of frames of a stored video as Y4M or raw YUV, converting between the two on the fly.
+
+    Output is assembled from slices of a read-only memory map over the source, so nothing is written to disk and at
+    most about one chunk is held in memory. Frames that are adjacent in the source are coalesced into a single slice,
+    so a contiguous range is read at close to raw disk speed.
+    """
+
+    def __init__(self, path: Path, layout: VideoProbe, source_format: str, output_format: str,
+                 frames: range, frame_rate: Optional[int] = None):
+        self.path = path
+        self.layout = layout
+        self.source_format = source_format
+        self.output_format = output_format
+        self.frames = frames
+        self.frame_rate = frame_rate
+        # Y4M to Y4M copies each frame with its own FRAME line, keeping any per-frame parameters
+        self.copy_frame_headers = source_format == "y4m" and output_format == "y4m"
+
+    def header(self) -> bytes:
+        """The stream header to emit: the source's own for Y4M, or one synthesized from the layout for raw YUV."""
+        if self.output_format != "y4m":
+            return b""
+        if self.source_format == "y4m":
+            return read_y4m_header(self.path)
+        layout = self.layout
+        return (f"YUV4MPEG2 W{layout.width} H{layout.height} F{self.frame_rate or DEFAULT_FRAME_RATE}:1 Ip A1:1 "
+                f"C{y4m_colorspace(layout.chromaFormat, layout.bitDepth)}\n").encode()
+
+    def content_length(self, header: bytes) -> int:
+        return len(header) + sum(len(piece) if isinstance(piece, bytes) else piece[1] - piece[0]
+                                 for piece in self._pieces(len(header)))
+
+    def _frame_pieces(self, n: int, header_length: int) -> List[Piece]:
+        layout = self.layout
+        data_start = layout.offset_of(n)
+        if self.copy_frame_headers:
+            # the FRAME line starts where the previous frame's data (or the stream header) ends
+            start = header_length if n == 0 else layout.offset_of(n - 1) + layout.frameSize
+            return [(start, data_start + layout.frameSize)]
+        if self.output_format == "y4m":
+            return [Y4M_FRAME_HEADER, (data_start, data_start + layout.frameSize)]
+        return [(data_start, data_start + layout.frameSize)]
+
+    def _pieces(self, header_length: int) -> Iterator[Piece]:
+        """Every range and literal in output order, with source ranges that touch merged into one."""
+        pending = None
+        for n in self.frames:
+            for piece in self._frame_pieces(n, header_length):
+                if isinstance(piece, tuple) and isinstance(pending, tuple) and pending[1] == piece[0]:
+                    pending = (pending[0], piece[1])
+                    continue
+                if pending is not None:
+                    yield pending
+                pending = piece
+        if pending is not None:
+            yield pending
+
+    async def iter_chunks(self, header: bytes) -> AsyncIterator[bytes]:
+        """Yield ``header`` followed by the frames, in chunks of about ``CHUNK_SIZE`` bytes."""
+        if header:
+            yield header
+
+        with open(self.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            batch: List[Piece] = []
+            batch_bytes = 0
+            for piece in self._pieces(len(header)):
+                if isinstance(piece, bytes):
+                    batch.append(piece)
+                    batch_bytes += len(piece)
+                else:
+                    # split long ranges so no more than one chunk is read at a time
+                    for start in range(piece[0], piece[1], CHUNK_SIZE):
+                        end = min(start + CHUNK_SIZE, piece[1])
+                        batch.append((start, end))
+                        batch_bytes += end - start
+                        if batch_bytes >= CHUNK_SIZE:
+                            yield await asyncio.to_thread(_gather, mm, batch)
+                            batch, batch_bytes = [], 0
+            if batch:
+                yield await asyncio.to_thread(_gather, mm, batch)
+
+
+def _gather(mm: mmap.mmap, pieces: List[Piece]) -> bytes:
+    """Copy the ranges out of the map in a worker thread, so page faults never block the event loop."""
+    return b"".join(piece if isinstance(piece, bytes) else mm[piece[0]:piece[1]] for piece in pieces)
@@ -0,0 +1,63 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, Optional, Sequence, TypeVar
+
+from app.config.settings import get_settings
+
+T = TypeVar("T")
+
+
+class SpawnedProcessPool:
+    """A ``ProcessPoolExecutor`` of ``workers`` processes, started on first use and stopped by :meth:`shutdown`."""
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn rather than fork: the parent holds DB and event loop threads that must not be duplicated
+            self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                 mp_context=multiprocessing.get_context("spawn"))
+        return self._executor
+
+
+class AnalysisPool(SpawnedProcessPool):
+    """
+    Process pool shared by CPU-bound video analysis, so NumPy and cv2 work runs on every core without blocking the
+    event loop. Work is split into independent chunks of frames which are submitted together and gathered in order.
+    """
+
+    def __init__(self, workers: int):
+        super().__init__(workers)
+        self.submitted = 0
+        self.completed = 0
+
+    async def run(self, fn: Callable[..., T], *args) -> T:
+        loop = asyncio.get_running_loop()
+        self.submitted += 1
+        try:
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            self.completed += 1
+
+    async def map_chunks(self, fn: Callable[..., T], chunks: Sequence[range], *args) -> List[T]:
+        """Run ``fn(*args, chunk)`` for every chunk in parallel, returning results in chunk order."""
+        return list(await asyncio.gather(*(self.run(fn, *args, chunk) for chunk in chunks)))
+
+    def chunks(self, frames: range, min_chunk: int = 16) -> List[range]:
+        """Split ``frames`` into a few chunks per worker, so a slow chunk does not leave the other workers idle."""
+        size = max(min_chunk, -(-len(frames) // (self.workers * 4)))
+        return [frames[start:start + size] for start in range(0, len(frames), size)]
+
+    def stats(self) -> dict:
+        return {"workers": self.workers, "in_flight": self.submitted - self.completed, "completed": self.completed}
+
+
+analysis_pool = AnalysisPool(get_settings().analysis_workers)
@@ -0,0 +1,109 @@
+import mmap
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import as_strided
+
+from app.services.utility.video_probe import VideoProbe
+
+Planes = Tuple[np.ndarray, ...]
+
+
+def plane_shapes(layout: VideoProbe) -> Tuple[Tuple[int, int], ...]:
+    """``(height, width)`` of the Y plane followed by the U and V planes, if the format has chroma."""
+    width, height = layout.width, layout.height
+    chroma_width, chroma_height = -(-width // 2), -(-height // 2)
+    chroma = {"420": (chroma_height, chroma_width), "422": (height, chroma_width), "444": (height, width),
+              "mono": None}[layout.chromaFormat]
+    return ((height, width),) if chroma is None else ((height, width), chroma, chroma)
+
+
+def evenly_spaced_frames(frame_count: int, count: int) -> List[int]:
+    """``count`` evenly spaced frame numbers from the first frame to the last, fewer for very short videos."""
+    if frame_count <= count:
+        return list(range(frame_count))
+    return [round(i * (frame_count - 1) / (count - 1)) for i in range(count)] if count > 1 else [0]
+
+
+class YuvReader:
+    """
+    Random access to the frames of a stored planar YUV video through a read-only memory map.
+
+    Supports 4:2:0, 4:2:2, 4:4:4 and mono layouts with 8-bit samples or 9 to 16-bit little-endian samples. Planes
+    are returned as read-only NumPy views onto the map rather than copies, so reading a frame touches only that
+    frame's pages and costs the same wherever it sits in the file. Views must be dropped before the reader is closed.
+    """
+
+    def __init__(self, path: Path, layout: VideoProbe):
+        self.layout = layout
+        self.dtype = np.dtype(np.uint8) if layout.bitDepth <= 8 else np.dtype("<u2")
+        self.shapes = plane_shapes(layout)
+        self._file = open(path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except BaseException:
+            self._file.close()
+            raise
+
+    def __enter__(self) -> "YuvReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.layout.frameCount
+
+    def frame_bytes(self, n: int) -> np.ndarray:
+        """The whole frame as a flat ``uint8`` view, planes back to back."""
+        if not 0 <= n < self.layout.frameCount:
+            raise IndexError(f"Frame {n} out of range for {self.layout.frameCount} frames")
+        return np.frombuffer(self._mmap, dtype=np.uint8, count=self.layout.frameSize, offset=self.layout.offset_of(n))
+
+    def frame(self, n: int) -> Planes:
+        """The Y, U and V planes of frame ``n`` (just Y for mono) as 2-D views in the sample dtype."""
+        samples = self.frame_bytes(n).view(self.dtype)
+        planes, start = [], 0
+        for shape in self.shapes:
+            end = start + shape[0] * shape[1]
+            planes.append(samples[start:end].reshape(shape))
+            start = end
+        return tuple(planes)
+
+    def batches(self, batch_size: int = 16, frames: Optional[range] = None) -> Iterator[Tuple[range, Planes]]:
+        """
+        Iterate ``frames`` (all by default) in batches, yielding each batch's frame numbers and its planes.
+
+        Each plane is a ``(frames, height, width)`` array. When the frames are evenly spaced in the file, as they
+        are for raw YUV and almost every Y4M, the arrays are strided views onto the map; otherwise they are stacked
+        copies.
+        """
+        frames = range(len(self)) if frames is None else frames
+        if frames and not (0 <= frames[0] < len(self) and 0 <= frames[-1] < len(self)):
+            raise IndexError(f"Frames {frames} out of range for {len(self)} frames")
+        for start in range(0, len(frames), batch_size):
+            batch = frames[start:start + batch_size]
+            if self.layout.frameStride is not None:
+                yield batch, self._strided_planes(batch)
+            else:
+                yield batch, tuple(np.stack(plane) for plane in zip(*(self.frame(n) for n in batch)))
+
+    def _strided_planes(self, batch: range) -> Planes:
+        frame_stride = self.layout.frameStride * batch.step
+        base = np.frombuffer(self._mmap, dtype=np.uint8)[self.layout.offset_of(batch[0]):]
+        planes, start = [], 0
+        for height, width in self.shapes:
+            row_bytes = width * self.dtype.itemsize
+            plane = as_strided(base[start:], shape=(len(batch), height, row_bytes),
+                               strides=(frame_stride, row_bytes, 1), writeable=False)
+            planes.append(plane.view(self.dtype))
+            start += height * row_bytes
+        return tuple(planes)
+
+    def close(self) -> None:
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass  # a caller still holds a view; the map is released when the last one is collected
+        self._file.close()
@@ -0,0 +1,96 @@
+import asyncio
+import io
+import os
+import zipfile
+from typing import AsyncIterator, Iterable, Optional, Tuple
+
+CHUNK_SIZE = 256 * 1024
+MAX_PENDING_CHUNKS = 8
+
+
+class _ArchiveAborted(Exception):
+    pass
+
+
+class _QueueWriter(io.RawIOBase):
+    """Unseekable sink that hands fixed-size chunks from the compression thread to the event loop."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, queue: asyncio.Queue, tee: Optional[io.BufferedIOBase]):
+        super().__init__()
+        self._loop = loop
+        self._queue = queue
+        self._tee = tee
+        self._buffer = bytearray()
+        self.aborted = False
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        if self.aborted:
+            raise _ArchiveAborted()
+        self._buffer += data
+        if len(self._buffer) >= CHUNK_SIZE:
+            self._emit()
+        return len(data)
+
+    def flush_remaining(self) -> None:
+        if self._buffer:
+            self._emit()
+
+    def _emit(self) -> None:
+        chunk = bytes(self._buffer)
+        self._buffer.clear()
+        if self._tee is not None:
+            self._tee.write(chunk)
+        # blocks this thread while the queue is full, which is what applies backpressure to compression
+        asyncio.run_coroutine_threadsafe(self._queue.put(chunk), self._loop).result()
+
+
+def _write_archive(writer: _QueueWriter, entries: Iterable[Tuple[str, str]]) -> None:
+    with zipfile.ZipFile(writer, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for path, arcname in entries:
+            if not os.path.exists(path):
+                continue
+            zf.write(path, arcname=arcname)
+    writer.flush_remaining()
+
+
+async def stream_zip(entries: Iterable[Tuple[str, str]],
+                     tee: Optional[io.BufferedIOBase] = None) -> AsyncIterator[bytes]:
+    """
+    Yield a ZIP archive of ``(path, arcname)`` entries as it is compressed.
+
+    Compression runs in a worker thread and at most ``MAX_PENDING_CHUNKS`` chunks are buffered, so memory stays
+    flat regardless of archive size. If ``tee`` is given every chunk is also written to it from the worker thread.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=MAX_PENDING_CHUNKS)
+    writer = _QueueWriter(loop, queue, tee)
+    done = object()
+
+    async def produce():
+        try:
+            await asyncio.to_thread(_write_archive, writer, entries)
+        finally:
+            if not writer.aborted:
+                await queue.put(done)
+
+    producer = asyncio.ensure_future(produce())
+    try:
+        while True:
+            chunk = await queue.get()
+            if chunk is done:
+                break
+            yield chunk
+        await producer
+    finally:
+        if not producer.done():
+            writer.aborted = True
+            # unblock a producer waiting on a full queue so the thread can observe the abort
+            while not queue.empty():
+                queue.get_nowait()
+            try:
+                await producer
+            except _ArchiveAborted:
+                pass
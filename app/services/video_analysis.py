@@ -0,0 +1,82 @@
+import logging
+from pathlib import Path
+from typing import ClassVar, Tuple
+
+from fastapi import BackgroundTasks, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.future import select
+from starlette.responses import JSONResponse
+
+from app.database.tables.videos import InputVideo as input_video_table
+from app.models.analysis_status import AnalysisStatus
+from app.models.change import ChangeEntity, ChangeOperation
+from app.models.video_analysis import VideoAnalysis
+from app.services.changes import ChangesService
+from app.services.utility.siti import siti_frames, summarize_siti
+from app.services.utility.workers import analysis_pool
+from app.services.videos import VideosService
+
+logger = logging.getLogger(__name__)
+
+
+class VideoAnalysisService:
+    """
+    Spatial and temporal information of stored videos, computed once in the background after ingest so that videos
+    can be filtered and sorted by complexity without reading them again.
+    """
+    subclasses: ClassVar[Tuple] = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        VideoAnalysisService.subclasses = VideoAnalysisService.subclasses + (cls,)
+
+    async def analyze_video(self, video_id: str, sessionmaker: async_sessionmaker) -> None:
+        """Compute and store the SI/TI of a video, splitting its frames across the analysis pool."""
+        async with sessionmaker() as db:
+            video = await db.get(input_video_table, video_id)
+            if not video:
+                return
+            video.analysisStatus = AnalysisStatus.RUNNING.value
+            await ChangesService().record(ChangeEntity.VIDEO, video_id, ChangeOperation.UPDATE, db)
+            await db.commit()
+            try:
+                videos = VideosService()
+                layout = await videos.frame_layout(video, db)
+                path = Path(videos.video_file_path(video))
+                chunks = await analysis_pool.map_chunks(siti_frames, analysis_pool.chunks(range(layout.frameCount)),
+                                                        path, layout)
+                siti = {name: [value for chunk in chunks for value in chunk[name]] for name in ("si", "ti")}
+                summary = summarize_siti(siti)
+
+                video.siMax, video.siMean = summary.get("siMax"), summary.get("siMean")
+                video.tiMax, video.tiMean = summary.get("tiMax"), summary.get("tiMean")
+                video.siti = siti
+                video.analysisStatus = AnalysisStatus.COMPLETE.value
+            except Exception:
+                logger.exception(f"SI/TI analysis of video {video_id} failed")
+                video.analysisStatus = AnalysisStatus.ERROR.value
+            await ChangesService().record(ChangeEntity.VIDEO, video_id, ChangeOperation.UPDATE, db)
+            await db.commit()
+
+    async def queue_analysis(self, video_id: str, db: AsyncSession, sessionmaker: async_sessionmaker,
+                             background_tasks: BackgroundTasks) -> JSONResponse:
+        """Run the analysis again, for example for videos stored before it existed."""
+        video = await db.get(input_video_table, video_id)
+        if not video:
+            raise HTTPException(status_code=404, detail="Video not found")
+        video.analysisStatus = AnalysisStatus.PENDING.value
+        await ChangesService().record(ChangeEntity.VIDEO, video_id, ChangeOperation.UPDATE, db)
+        await db.commit()
+        background_tasks.add_task(self.analyze_video, video_id, sessionmaker)
+        return JSONResponse(status_code=202, content={"message": "Analysis queued"})
+
+    async def get_analysis(self, video_id: str, db: AsyncSession) -> VideoAnalysis:
+        result = await db.execute(select(input_video_table.analysisStatus, input_video_table.siMax,
+                                         input_video_table.siMean, input_video_table.tiMax, input_video_table.tiMean,
+                                         input_video_table.siti).where(input_video_table.id == video_id))
+        row = result.first()
+        if not row:
+            raise HTTPException(status_code=404, detail="Video not found")
+        siti = row.siti or {}
+        return VideoAnalysis(id=video_id, analysisStatus=row.analysisStatus, siMax=row.siMax, siMean=row.siMean,
+                             tiMax=row.tiMax, tiMean=row.tiMean, si=siti.get("si", []), ti=siti.get("ti", []))
@@ -1,26 +1,48 @@
+import asyncio
 import os
-from datetime import datetime
-from typing import List
+from pathlib import Path
+from typing import AsyncIterator
 from typing import Optional, ClassVar, Tuple
 import re
 
 from fastapi import HTTPException, UploadFile
 from pydantic import StrictStr
+from sqlalchemy import delete
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from starlette.responses import JSONResponse, FileResponse
+from starlette.responses import JSONResponse, Response, StreamingResponse
 
+from app.database.tables.manifests import FrameManifest
+from app.database.tables.proxies import ProxyJob
 from app.database.tables.videos import InputVideo as input_video_table
+from app.models.analysis_status import AnalysisStatus
+from app.models.change import ChangeEntity, ChangeOperation
 from app.models.video import Video
 from tests.utility.validation import validate_video
 import uuid
 from app.models.user import User
 
-now = datetime.now()
-path = "app\\database\\videos".replace("\\", os.sep)
+from app.config.settings import Settings
+from app.models.video_input import VideoByHashInput
+from app.services.blobs import BlobsService
+from app.services.changes import ChangesService
+from app.services.fingerprints import FingerprintsService
+from app.services.utility.blobs import BlobStore
+from app.services.utility.downloads import SendfileResponse, offload_response
+from app.services.utility.files import StoredFile, iter_upload
+from app.services.utility.video_file_handler import delete_video_file
+from app.services.utility.frame_cache import frame_cache
+from app.services.utility.frame_render import IMAGE_FORMATS, render_frame
+from app.services.utility.pagination import DEFAULT_PAGE_SIZE, Page, paginate
+from app.services.utility.thumbnail_cache import ThumbnailCache
+from app.services.utility.video_probe import (CHROMA_FORMATS, ProbeError, VideoProbe, frame_size, parse_resolution,
+                                              probe_video)
+from app.services.utility.video_streams import VideoStream
+from app.services.utility.yuv_reader import YuvReader
 
-
-from app.services.utility.video_file_handler import delete_video_file, store_video_file
+MEDIA_TYPES = {"y4m": "video/x-yuv4mpeg", "yuv": "application/octet-stream"}
+# columns the video list may be sorted by, ascending or with a leading "-" for descending
+SORT_FIELDS = ("title", "createdDate", "updatedDate", "frameCount", "size", "siMax", "siMean", "tiMax", "tiMean")
 
 
 class VideosService:
@@ -32,33 +54,125 @@ class VideosService:
 
     async def create_video(self, video: UploadFile,
                            title: Optional[StrictStr], format: Optional[StrictStr], frameRate: Optional[int],
-                           resolution: Optional[StrictStr], description: Optional[StrictStr], bitDepth: Optional[int], current_user: User, db) -> Video:
+                           resolution: Optional[StrictStr], description: Optional[StrictStr], bitDepth: Optional[int], current_user: User, db,
+                           settings: Settings, chromaFormat: Optional[StrictStr] = None) -> Video:
         """Upload a new video to the infrastructure portal (Super User access required)."""
+        return await self.create_video_from_stream(iter_upload(video), title, format, frameRate, resolution,
+                                                   description, bitDepth, current_user, db, settings, chromaFormat)
+
+    async def create_video_from_stream(self, chunks: AsyncIterator[bytes],
+                                       title: Optional[StrictStr], format: Optional[StrictStr], frameRate: Optional[int],
+                                       resolution: Optional[StrictStr], description: Optional[StrictStr],
+                                       bitDepth: Optional[int], current_user: User, db, settings: Settings,
+                                       chromaFormat: Optional[StrictStr] = None) -> Video:
+        """Create a video from a raw byte stream, such as an un-encoded request body."""
+        self.validate_video_metadata(format, resolution, bitDepth, chromaFormat)
+        id = str(uuid.uuid4())
+
+        # Save video into the blob store, checksumming it as it is written, then check its frames and record it
+        stored = await BlobStore.for_settings(settings).write(chunks)
+        try:
+            probe = await self.probe_video_file(stored.path, format, frameRate, resolution, bitDepth, chromaFormat)
+            fingerprint, duplicate_of = await FingerprintsService().check_duplicates(stored.path, probe, db, settings)
+        except HTTPException:
+            await BlobsService().release_blobs([stored.sha256], db, settings)
+            raise
+
+        return await self.record_video(id, title, format, frameRate, description, stored, probe, current_user, db,
+                                       fingerprint, duplicate_of)
 
-        if not bitDepth == 8 and not bitDepth == 10:
+    async def create_video_by_hash(self, video_input: VideoByHashInput, current_user: User, db,
+                                   settings: Settings) -> Video:
+        """Create a video from content that is already stored, without transferring it again."""
+        self.validate_video_metadata(video_input.format, video_input.resolution, video_input.bitDepth,
+                                     video_input.chromaFormat)
+        if not await BlobsService().blob_exists(video_input.sha256, db, settings, current_user):
+            raise HTTPException(status_code=404, detail="No stored content with this SHA-256, upload the file")
+
+        blob_path = BlobStore.for_settings(settings).path_for(video_input.sha256)
+        stored = StoredFile(blob_path, blob_path.stat().st_size, video_input.sha256)
+        probe = await self.probe_video_file(blob_path, video_input.format, video_input.frameRate,
+                                            video_input.resolution, video_input.bitDepth, video_input.chromaFormat)
+        fingerprint, duplicate_of = await FingerprintsService().check_duplicates(blob_path, probe, db, settings)
+        return await self.record_video(str(uuid.uuid4()), video_input.title, video_input.format,
+                                       video_input.frameRate, video_input.description, stored, probe, current_user,
+                                       db, fingerprint, duplicate_of)
+
+    def validate_video_metadata(self, format: Optional[StrictStr], resolution: Optional[StrictStr],
+                                bitDepth: Optional[int], chromaFormat: Optional[StrictStr] = None) -> None:
+        """Check the supplied metadata. Y4M files describe themselves, so their resolution and bit depth may be omitted."""
+        if (bitDepth is not None or format != "y4m") and not bitDepth == 8 and not bitDepth == 10:
             raise HTTPException(status_code=400, detail="BitDepth must be either 8 or 10")
 
         if not format == "yuv" and not format == "y4m":
             raise HTTPException(status_code=400, detail="Accepted formats are: yuv, y4m")
-        id = str(uuid.uuid4())
 
         res_pattern = r"[0-9]+x[0-9]+"
-        if not re.fullmatch(res_pattern, resolution):
+        if (resolution is not None or format != "y4m") and (not resolution or not re.fullmatch(res_pattern, resolution)):
             raise HTTPException(status_code=400, detail="Resolution must follow the format widthxheight (Example 1920x1080)")
 
-        # Create and save video
-        data = {"id": id, "title": title, "path": path, "format": format,
-                "frameRate": frameRate, "resolution": resolution, "description": description, "bitDepth": bitDepth, "createdDate": now.strftime("%m/%d/%Y, %H:%M:%S"), "lastUpdatedBy": current_user.username}
+        if chromaFormat is not None and chromaFormat not in CHROMA_FORMATS:
+            raise HTTPException(status_code=400, detail=f"Accepted chroma formats are: {', '.join(CHROMA_FORMATS)}")
+
+    async def probe_video_file(self, file_path, format: str, frameRate: Optional[int], resolution: Optional[str],
+                               bitDepth: Optional[int], chromaFormat: Optional[str]) -> VideoProbe:
+        """Index the frames of a stored video and check them against the metadata supplied with it."""
+        try:
+            probe = await asyncio.to_thread(probe_video, Path(file_path), format, resolution, chromaFormat, bitDepth)
+        except ProbeError as e:
+            raise HTTPException(status_code=422, detail=f"Invalid {format} file: {e}")
+
+        mismatches = []
+        if resolution and parse_resolution(resolution) != (probe.width, probe.height):
+            mismatches.append(f"resolution is {probe.width}x{probe.height}")
+        if bitDepth and bitDepth != probe.bitDepth:
+            mismatches.append(f"bit depth is {probe.bitDepth}")
+        if chromaFormat and chromaFormat != probe.chromaFormat:
+            mismatches.append(f"chroma format is {probe.chromaFormat}")
+        if frameRate and probe.frameRate and round(probe.frameRate) != frameRate:
+            mismatches.append(f"frame rate is {float(probe.frameRate):g}")
+        if mismatches:
+            raise HTTPException(status_code=422, detail=f"Video metadata does not match the file: {', '.join(mismatches)}")
+
+        if probe.bitDepth not in (8, 10):
+            raise HTTPException(status_code=422, detail="BitDepth must be either 8 or 10")
+        return probe
+
+    def video_file_path(self, video_info: input_video_table) -> str:
+        """Location of a video's file: its blob, or ``<path>/<title>_<id>.<format>`` for videos stored before."""
+        if video_info.sha256 and os.path.basename(video_info.path) == video_info.sha256:
+            return video_info.path
+        stored_filename = f"{video_info.title}_{video_info.id}.{video_info.format}"
+        return f"{video_info.path}\\{stored_filename}".replace("\\", os.sep)
+
+    async def record_video(self, id: str, title: Optional[StrictStr], format: Optional[StrictStr],
+                           frameRate: Optional[int], description: Optional[StrictStr], stored: StoredFile,
+                           probe: VideoProbe, current_user: User, db, fingerprint: Optional[bytes] = None,
+                           duplicate_of: Optional[str] = None) -> Video:
+        """
+        Create the database record for a video file that has already been stored and probed. Videos recorded with a
+        fingerprint join the duplicate index; derived videos such as proxies are recorded without one.
+        """
+        if frameRate is None and probe.frameRate:
+            frameRate = round(probe.frameRate)
+        data = {"id": id, "title": title, "path": str(stored.path), "format": format,
+                "frameRate": frameRate, "resolution": f"{probe.width}x{probe.height}", "description": description, "bitDepth": probe.bitDepth, "lastUpdatedBy": current_user.username,
+                "size": stored.size, "sha256": stored.sha256, "frameCount": probe.frameCount,
+                "chromaFormat": probe.chromaFormat, "frameOffset": probe.frameOffset,
+                "frameStride": probe.frameStride, "frameIndex": probe.frameIndex,
+                "analysisStatus": AnalysisStatus.PENDING.value, "fingerprint": fingerprint or None,
+                "duplicateOf": duplicate_of}
 
         db_obj = input_video_table(**data)
         db.add(db_obj)
+        if fingerprint:
+            FingerprintsService().index(id, fingerprint, db)
+        await ChangesService().record(ChangeEntity.VIDEO, id, ChangeOperation.INSERT, db)
         await db.commit()
         await db.refresh(db_obj)
-        formatted_path = path.replace("\\", os.sep).replace("/", os.sep)
-        store_video_file(video.file, formatted_path, f"{data["title"]}_{data["id"]}.{data["format"]}")
         return validate_video(db_obj)
 
-    async def delete_video(self, video_id: StrictStr, db) -> JSONResponse:
+    async def delete_video(self, video_id: StrictStr, db, settings: Settings) -> JSONResponse:
         """Delete a specific video by ID (Super User access required)."""
         db_obj = await db.execute(select(input_video_table).filter(input_video_table.id == video_id))
         video_info = db_obj.scalars().first()
@@ -66,17 +180,38 @@ class VideosService:
         if not video_info:
             raise HTTPException(status_code=404, detail="Video not found")
 
-        stored_filename = f"{video_info.title}_{video_info.id}.{video_info.format}"
-        file_path = f"{path}\\{stored_filename}".replace("\\", os.sep)
+        # proxies are derived from the video, so go with it
+        proxies = await db.execute(select(input_video_table.id).where(input_video_table.parentId == video_id))
+        for proxy_id in proxies.scalars().all():
+            await self.delete_video(proxy_id, db, settings)
 
-        delete_video_file(file_path)
+        file_path = self.video_file_path(video_info)
+        is_blob = file_path == video_info.path
+        sha256 = video_info.sha256
 
+        await db.execute(delete(FrameManifest).where(FrameManifest.video_id == video_id))
+        await FingerprintsService().remove(video_id, db)
+        await db.execute(delete(ProxyJob).where((ProxyJob.video_id == video_id) | (ProxyJob.proxy_id == video_id)))
         await db.delete(video_info)
+        await ChangesService().record(ChangeEntity.VIDEO, video_id, ChangeOperation.DELETE, db)
         await db.commit()
+
+        # blobs may be shared with other videos and results, so only drop the file once nothing references it
+        if is_blob:
+            await BlobsService().release_blobs([sha256], db, settings)
+        else:
+            delete_video_file(file_path)
+        ThumbnailCache.for_settings(settings).remove(video_id)
         return JSONResponse(status_code=200, content={"message": "Video deleted"})
 
-    async def get_video(self, video_id: StrictStr, db: AsyncSession):
-        """Fetch a specific video by ID."""
+    async def get_video(self, video_id: StrictStr, db: AsyncSession, output_format: Optional[str] = None,
+                        settings: Optional[Settings] = None):
+        """
+        Fetch a specific video by ID, converting between Y4M and raw YUV on the fly if asked for the other.
+
+        Stored files are sent with ``sendfile`` and support Range requests, or are handed to a front proxy when
+        download offloading is configured.
+        """
         # todo user authentication
         db_obj = await db.execute(select(input_video_table).filter(input_video_table.id == video_id))
         video_info = db_obj.scalars().first()
@@ -84,10 +219,8 @@ class VideosService:
         if not video_info:
             raise HTTPException(status_code=404, detail="Video not found")
 
-        path = video_info.path
         returned_filename = f"{video_info.title}.{video_info.format}"
-        stored_filename = f"{video_info.title}_{video_info.id}.{video_info.format}"
-        file_path = f"{path}\\{stored_filename}".replace("\\", os.sep)
+        file_path = self.video_file_path(video_info)
 
         if not file_path:
             raise HTTPException(status_code=404, detail="No video files found")
@@ -95,20 +228,119 @@ class VideosService:
         if not os.path.exists(file_path):
             raise HTTPException(status_code=404, detail="Error Retrieving File")
 
+        if output_format and output_format != video_info.format:
+            layout = await self.frame_layout(video_info, db)
+            return await self._stream_frames(video_info, file_path, layout, range(layout.frameCount), output_format,
+                                             f"{video_info.title}.{output_format}")
+
         media_type = ""
         if video_info.format == "y4m":
             media_type = "video/x-yuv4mpeg"
         elif video_info.format == "yuv":
             media_type = "application/octet-stream"
 
-        return FileResponse(path=file_path, media_type=media_type, filename=returned_filename)
+        if settings is not None:
+            offloaded = offload_response(file_path, media_type, returned_filename, settings)
+            if offloaded is not None:
+                return offloaded
+        return SendfileResponse(path=file_path, media_type=media_type, filename=returned_filename)
+
+    async def get_video_frame(self, video_id: StrictStr, n: int, image_format: str, db: AsyncSession) -> Response:
+        """Render one frame as an image, reading only that frame's bytes from the stored file."""
+        video_info = await self._get_video_info(video_id, db)
+        key = (video_info.id, n, image_format)
+        image = frame_cache.get(key)
+        if image is None:
+            file_path = self.video_file_path(video_info)
+            if not os.path.exists(file_path):
+                raise HTTPException(status_code=404, detail="Error Retrieving File")
+            layout = await self.frame_layout(video_info, db)
+            if n >= layout.frameCount:
+                raise HTTPException(status_code=404, detail=f"Frame not found, video has {layout.frameCount} frames")
+            image = await asyncio.to_thread(self._render_frame, file_path, layout, n, image_format)
+            frame_cache.set(key, image)
+
+        return Response(content=image, media_type=IMAGE_FORMATS[image_format][1],
+                        headers={"Cache-Control": "private, max-age=86400"})
+
+    async def get_video_clip(self, video_id: StrictStr, start: int, end: Optional[int], step: int,
+                             output_format: Optional[str], db: AsyncSession) -> StreamingResponse:
+        """Stream frames ``start`` up to ``end`` (exclusive), taking every ``step``th, as Y4M or raw YUV."""
+        video_info = await self._get_video_info(video_id, db)
+        file_path = self.video_file_path(video_info)
+        if not os.path.exists(file_path):
+            raise HTTPException(status_code=404, detail="Error Retrieving File")
+
+        layout = await self.frame_layout(video_info, db)
+        end = layout.frameCount if end is None else end
+        if not start < end <= layout.frameCount:
+            raise HTTPException(status_code=400, detail=f"Invalid frame range, video has {layout.frameCount} frames")
+
+        output_format = output_format or video_info.format
+        return await self._stream_frames(video_info, file_path, layout, range(start, end, step), output_format,
+                                         f"{video_info.title}_{start}-{end}.{output_format}")
+
+    async def _stream_frames(self, video_info: input_video_table, file_path: str, layout: VideoProbe, frames: range,
+                             output_format: str, filename: str) -> StreamingResponse:
+        stream = VideoStream(Path(file_path), layout, video_info.format, output_format, frames, video_info.frameRate)
+        header = await asyncio.to_thread(stream.header)
+        length = await asyncio.to_thread(stream.content_length, header)
+        return StreamingResponse(stream.iter_chunks(header), media_type=MEDIA_TYPES[output_format],
+                                 headers={"Content-Length": str(length),
+                                          "Content-Disposition": f"attachment; filename={filename}"})
+
+    async def frame_layout(self, video_info: input_video_table, db: AsyncSession) -> VideoProbe:
+        """Frame layout recorded at ingest. Videos stored before ingest probing are indexed on first use."""
+        if video_info.frameCount is None:
+            probe = await self.probe_video_file(self.video_file_path(video_info), video_info.format, None,
+                                                video_info.resolution, video_info.bitDepth, video_info.chromaFormat)
+            video_info.frameCount, video_info.chromaFormat = probe.frameCount, probe.chromaFormat
+            video_info.frameOffset, video_info.frameStride = probe.frameOffset, probe.frameStride
+            video_info.frameIndex = probe.frameIndex
+            await db.commit()
+            return probe
+
+        frame_index = None
+        if video_info.frameStride is None:
+            frame_index = await db.scalar(
+                select(input_video_table.frameIndex).where(input_video_table.id == video_info.id))
+        width, height = parse_resolution(video_info.resolution)
+        return VideoProbe(width, height, None, video_info.chromaFormat, video_info.bitDepth, video_info.frameCount,
+                          video_info.frameOffset,
+                          frame_size(width, height, video_info.chromaFormat, video_info.bitDepth),
+                          video_info.frameStride, frame_index)
+
+    @staticmethod
+    def _render_frame(file_path: str, layout: VideoProbe, n: int, image_format: str) -> bytes:
+        with YuvReader(Path(file_path), layout) as reader:
+            return render_frame(reader, n, image_format)
+
+    async def _get_video_info(self, video_id: StrictStr, db: AsyncSession) -> input_video_table:
+        db_obj = await db.execute(select(input_video_table).filter(input_video_table.id == video_id))
+        video_info = db_obj.scalars().first()
+
+        if not video_info:
+            raise HTTPException(status_code=404, detail="Video not found")
+        return video_info
 
-    async def get_videos(self, db) -> List[Video]:
-        """Fetch a list of all available videos."""
-        db_obj = await db.execute(select(input_video_table))
-        all_videos = db_obj.scalars()
+    async def get_videos(self, db, min_si: Optional[float] = None, max_si: Optional[float] = None,
+                         min_ti: Optional[float] = None, max_ti: Optional[float] = None,
+                         sort: Optional[str] = None, cursor: Optional[str] = None,
+                         limit: int = DEFAULT_PAGE_SIZE) -> Page:
+        """Fetch a page of available videos, optionally filtered by SI/TI range and sorted by a column."""
+        query = select(input_video_table)
+        for column, minimum, maximum in ((input_video_table.siMax, min_si, max_si),
+                                         (input_video_table.tiMax, min_ti, max_ti)):
+            if minimum is not None:
+                query = query.where(column >= minimum)
+            if maximum is not None:
+                query = query.where(column <= maximum)
 
-        if not all_videos:
-            return []
+        keys = ((input_video_table.id, False),)
+        if sort:
+            name = sort.removeprefix("-")
+            if name not in SORT_FIELDS:
+                raise HTTPException(status_code=400, detail=f"Videos can be sorted by: {', '.join(SORT_FIELDS)}")
+            keys = ((getattr(input_video_table, name), sort.startswith("-")),) + keys
 
-        return all_videos
+        return await paginate(query, keys, cursor, limit, db, f"videos:{sort or ''}")
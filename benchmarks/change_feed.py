@@ -0,0 +1,115 @@
+"""
+Bytes and latency of keeping a client's copy of the video and network lists current by polling ``GET /changes``,
+against listing both again on every poll.
+
+Starts the application under uvicorn with a temporary database of generated videos and networks, logged as the
+change-log migration logs existing rows, then polls with no changes pending and after a few network updates:
+
+    poetry run python -m benchmarks.change_feed --rows 20000 --updates 5
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+from sqlalchemy import insert
+
+from app.database.migrations import seed_change_log
+from app.database.tables.network import Network
+from app.database.tables.videos import InputVideo
+from benchmarks.server import BenchmarkServer
+
+BATCH = 10000
+POLLS = 20
+
+
+async def _populate(session, rows: int) -> None:
+    for start in range(0, rows, BATCH):
+        numbers = range(start, min(start + BATCH, rows))
+        await session.execute(insert(InputVideo), [
+            {"id": f"{n:08d}", "title": f"video {n}", "format": "yuv", "resolution": "1920x1080", "frameRate": 30,
+             "bitDepth": 8, "size": 1920 * 1080 * 3 // 2 * 300, "frameCount": 300, "chromaFormat": "420"}
+            for n in numbers])
+        await session.execute(insert(Network), [
+            {"network_name": f"network {n}", "description": "", "packet_loss": n % 5, "delay": 20, "jitter": 5,
+             "bandwidth": 1000} for n in numbers])
+    await session.run_sync(lambda sync_session: seed_change_log(sync_session.connection()))
+    await session.commit()
+
+
+async def _get_all(client: httpx.AsyncClient, url: str, params: dict) -> tuple:
+    """Follow cursors to the end, returning the bytes received and the cursor to resume from."""
+    size = 0
+    while True:
+        response = await client.get(url, params=params)
+        assert response.status_code == 200, response.text
+        size += len(response.content)
+        if url.endswith("/changes"):
+            body = response.json()
+            params = {**params, "since": body["cursor"]}
+            if not body["hasMore"]:
+                return size, body["cursor"]
+        elif "x-next-cursor" in response.headers:
+            params = {**params, "cursor": response.headers["x-next-cursor"]}
+        else:
+            return size, None
+
+
+async def _full_poll(client: httpx.AsyncClient, base: str) -> int:
+    videos, _ = await _get_all(client, f"{base}/infrastructure/videos", {"limit": 1000})
+    networks, _ = await _get_all(client, f"{base}/infrastructure/networks", {"limit": 1000})
+    return videos + networks
+
+
+def _report(label: str, latencies: list, size: int) -> None:
+    print(f"{label:<28} median {statistics.median(latencies) * 1000:9.2f} ms  {size:>12,} bytes")
+
+
+async def _run(server: BenchmarkServer, updates: int) -> None:
+    async with httpx.AsyncClient(timeout=None) as client:
+        started = time.perf_counter()
+        size, cursor = await _get_all(client, f"{server.url}/changes", {"limit": 1000})
+        _report("initial sync from /changes", [time.perf_counter() - started], size)
+
+        latencies = []
+        for _ in range(3):
+            started = time.perf_counter()
+            size = await _full_poll(client, server.url)
+            latencies.append(time.perf_counter() - started)
+        _report("poll: list everything", latencies, size)
+
+        latencies = []
+        for _ in range(POLLS):
+            started = time.perf_counter()
+            size, cursor = await _get_all(client, f"{server.url}/changes", {"since": cursor})
+            latencies.append(time.perf_counter() - started)
+        _report("poll: /changes, idle", latencies, size)
+
+        latencies, sizes = [], []
+        for poll in range(POLLS):
+            for n in range(updates):
+                network_id = (poll * updates + n) % 1000 + 1
+                await client.put(f"{server.url}/infrastructure/networks/{network_id}",
+                                 json={"networkName": f"renamed {poll}", "delay": poll})
+            started = time.perf_counter()
+            size, cursor = await _get_all(client, f"{server.url}/changes", {"since": cursor})
+            latencies.append(time.perf_counter() - started)
+            sizes.append(size)
+        _report(f"poll: /changes, {updates} updates", latencies, int(statistics.median(sizes)))
+
+
+def main(rows: int, updates: int):
+    server = BenchmarkServer()
+    server.setup(lambda session: _populate(session, rows))
+    print(f"{rows} videos and {rows} networks")
+    with server:
+        asyncio.run(_run(server, updates))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--updates", type=int, default=5)
+    args = parser.parse_args()
+    main(args.rows, args.updates)
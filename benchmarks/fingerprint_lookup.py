@@ -0,0 +1,92 @@
+"""
+Latency of near-duplicate lookups in the fingerprint band index as the catalog grows.
+
+Fills a temporary SQLite database with random fingerprints, then times FingerprintsService.find_duplicate for
+perturbed copies of catalog entries (hits) and for unseen fingerprints (misses):
+
+    poetry run python -m benchmarks.fingerprint_lookup
+    poetry run python -m benchmarks.fingerprint_lookup --videos 10000 50000 --lookups 500
+"""
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.database.database import Base
+from app.database.tables.fingerprints import FingerprintBand
+from app.database.tables.videos import InputVideo
+from app.services.fingerprints import FingerprintsService
+from app.services.utility.fingerprint import FINGERPRINT_BYTES, band_keys
+
+BIT_FLIPS = 64  # bits changed in a hit's fingerprint, about four per frame hash
+MAX_DISTANCE = 8.0
+
+
+def _perturb(fingerprint: bytes, rng: np.random.Generator) -> bytes:
+    bits = np.unpackbits(np.frombuffer(fingerprint, dtype=np.uint8))
+    flips = rng.choice(len(bits), BIT_FLIPS, replace=False)
+    bits[flips] ^= 1
+    return np.packbits(bits).tobytes()
+
+
+async def _fill(sessions, start: int, count: int, rng: np.random.Generator) -> list:
+    fingerprints = [rng.bytes(FINGERPRINT_BYTES) for _ in range(count)]
+    async with sessions() as db:
+        ids = [f"video-{start + i}" for i in range(count)]
+        await db.execute(insert(InputVideo), [{"id": video_id, "title": video_id, "fingerprint": fingerprint}
+                                              for video_id, fingerprint in zip(ids, fingerprints)])
+        await db.execute(insert(FingerprintBand), [{"video_id": video_id, "key": key}
+                                                   for video_id, fingerprint in zip(ids, fingerprints)
+                                                   for key in band_keys(fingerprint)])
+        await db.commit()
+    return fingerprints
+
+
+async def _time_lookups(sessions, queries: list, expect_hit: bool) -> list:
+    service, latencies = FingerprintsService(), []
+    async with sessions() as db:
+        for query in queries:
+            started = time.perf_counter()
+            found = await service.find_duplicate(query, db, MAX_DISTANCE)
+            latencies.append(time.perf_counter() - started)
+            assert (found is not None) == expect_hit
+    return latencies
+
+
+def _report(label: str, latencies: list) -> str:
+    ordered = sorted(latencies)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    return f"{label} median {statistics.median(ordered) * 1000:.3f} ms, p99 {p99 * 1000:.3f} ms"
+
+
+async def main(sizes, lookups: int):
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{Path(directory) / 'bench.db'}")
+        sessions = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+        catalog = []
+        for size in sorted(sizes):
+            catalog += await _fill(sessions, len(catalog), size - len(catalog), rng)
+            hits = [_perturb(catalog[i], rng) for i in rng.choice(len(catalog), lookups)]
+            misses = [rng.bytes(FINGERPRINT_BYTES) for _ in range(lookups)]
+            await _time_lookups(sessions, hits[:10], True)  # warm the page cache
+            print(f"{size:>7} videos: {_report('hit', await _time_lookups(sessions, hits, True))}; "
+                  f"{_report('miss', await _time_lookups(sessions, misses, False))}")
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--videos", nargs="+", type=int, default=[1000, 10000, 50000])
+    parser.add_argument("--lookups", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.videos, args.lookups))
@@ -0,0 +1,102 @@
+"""
+Latency of listing videos a page at a time with keyset cursors, against OFFSET paging and loading the whole table.
+
+Starts the application under uvicorn with a temporary database of generated video rows, then walks every page of
+``GET /infrastructure/videos`` by following X-Next-Cursor, in ID order and sorted by SI (a nullable column):
+
+    poetry run python -m benchmarks.list_pagination --rows 100000 --page-size 100
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+import numpy as np
+from sqlalchemy import insert, select
+
+from app.database.tables.videos import InputVideo
+from app.models.video import Video
+from benchmarks.server import BenchmarkServer
+
+BATCH = 10000
+
+
+async def _populate(session, rows: int) -> None:
+    rng = np.random.default_rng(0)
+    si = np.round(rng.uniform(0, 200, rows), 1)
+    for start in range(0, rows, BATCH):
+        await session.execute(insert(InputVideo), [
+            {"id": f"{n:08d}", "title": f"video {n}", "format": "yuv", "resolution": "1920x1080", "frameRate": 30,
+             "bitDepth": 8, "size": 1920 * 1080 * 3 // 2 * 300, "frameCount": 300, "chromaFormat": "420",
+             # a tenth of the catalog is still waiting for analysis
+             "siMax": None if n % 10 == 0 else float(si[n])}
+            for n in range(start, min(start + BATCH, rows))])
+    await session.commit()
+
+
+async def _walk(client: httpx.AsyncClient, url: str, params: dict) -> list:
+    latencies, rows = [], 0
+    while True:
+        started = time.perf_counter()
+        response = await client.get(url, params=params)
+        latencies.append(time.perf_counter() - started)
+        assert response.status_code == 200, response.text
+        rows += len(response.json())
+        if "x-next-cursor" not in response.headers:
+            return latencies
+        params = {**params, "cursor": response.headers["x-next-cursor"]}
+
+
+async def _offset_pages(server: BenchmarkServer, rows: int, page_size: int) -> list:
+    """What the endpoint would cost with LIMIT/OFFSET: the first page, the middle one and the last one."""
+    latencies = []
+    async with server.sessions() as session:
+        for offset in (0, rows // 2 // page_size * page_size, (rows - 1) // page_size * page_size):
+            started = time.perf_counter()
+            result = await session.execute(select(InputVideo).order_by(InputVideo.id).offset(offset).limit(page_size))
+            [Video.model_validate(video, from_attributes=True).model_dump_json() for video in result.scalars()]
+            latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+async def _whole_table(server: BenchmarkServer) -> float:
+    """The previous behaviour: every row loaded and serialized in one response."""
+    async with server.sessions() as session:
+        started = time.perf_counter()
+        result = await session.execute(select(InputVideo))
+        [Video.model_validate(video, from_attributes=True).model_dump_json() for video in result.scalars()]
+        return time.perf_counter() - started
+
+
+def _report(label: str, latencies: list) -> None:
+    ms = [latency * 1000 for latency in latencies]
+    print(f"{label:<28} first {ms[0]:7.2f} ms  median {statistics.median(ms):7.2f} ms  "
+          f"last {ms[-1]:7.2f} ms  ({len(ms)} pages)")
+
+
+async def _run(server: BenchmarkServer, rows: int, page_size: int) -> None:
+    url = f"{server.url}/infrastructure/videos"
+    async with httpx.AsyncClient(timeout=None) as client:
+        _report("keyset, by ID", await _walk(client, url, {"limit": page_size}))
+        _report("keyset, by -siMax", await _walk(client, url, {"limit": page_size, "sort": "-siMax"}))
+    offset = await _offset_pages(server, rows, page_size)
+    print(f"{'offset, by ID (no HTTP)':<28} first {offset[0] * 1000:7.2f} ms  middle {offset[1] * 1000:7.2f} ms  "
+          f"last {offset[2] * 1000:7.2f} ms")
+    print(f"{'whole table (no HTTP)':<28} {await _whole_table(server) * 1000:7.0f} ms")
+
+
+def main(rows: int, page_size: int):
+    server = BenchmarkServer()
+    server.setup(lambda session: _populate(session, rows))
+    print(f"{rows} videos, {page_size} per page")
+    with server:
+        asyncio.run(_run(server, rows, page_size))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--page-size", type=int, default=100)
+    args = parser.parse_args()
+    main(args.rows, args.page_size)
@@ -0,0 +1,90 @@
+"""
+Login throughput and latency of unrelated requests while logins are under load.
+
+Runs the application in-process over ASGI against an in-memory database. ``--inline`` hashes on the event loop
+(the previous behaviour) so the two modes can be compared:
+
+    poetry run python -m benchmarks.login_throughput
+    poetry run python -m benchmarks.login_throughput --inline
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.auth import hashing
+from app.auth.dependencies import user_dependency
+from app.database.database import Base, get_db
+from app.main import app
+from app.models.user import User
+
+
+async def _inline_submit(fn, *args):
+    return fn(*args)
+
+
+async def _login_loop(client: AsyncClient, deadline: float, counter: list):
+    while time.perf_counter() < deadline:
+        response = await client.post("/auth/login", json={"username": "bench", "password": "bench-password"})
+        assert response.status_code == 200, response.text
+        counter.append(1)
+
+
+async def _get_loop(client: AsyncClient, deadline: float, latencies: list):
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        response = await client.get("/infrastructure/networks")
+        assert response.status_code == 200, response.text
+        latencies.append(time.perf_counter() - started)
+        await asyncio.sleep(0.005)
+
+
+async def main(duration: float, logins: int, readers: int, inline: bool):
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool,
+                                 connect_args={"check_same_thread": False})
+    sessions = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async def override_get_db():
+        async with sessions() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[user_dependency] = lambda: User(id=1, username="reader", role="user")
+    if inline:
+        hashing.password_hasher._submit = _inline_submit
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+        await client.post("/users", json={"username": "bench", "first_name": "Bench", "last_name": "User",
+                                          "email": "bench@example.com", "password": "bench-password"})
+        # warm the pool so process start-up is not measured
+        await client.post("/auth/login", json={"username": "bench", "password": "bench-password"})
+
+        completed, latencies = [], []
+        deadline = time.perf_counter() + duration
+        await asyncio.gather(*[_login_loop(client, deadline, completed) for _ in range(logins)],
+                             *[_get_loop(client, deadline, latencies) for _ in range(readers)])
+
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99) - 1] if latencies else float("nan")
+    print(f"mode={'inline' if inline else 'pool'} workers={hashing.password_hasher.workers} "
+          f"concurrency={hashing.password_hasher.concurrency}")
+    print(f"logins/s: {len(completed) / duration:.1f}")
+    print(f"GET /infrastructure/networks: n={len(latencies)} p50={statistics.median(latencies) * 1000:.1f}ms "
+          f"p99={p99 * 1000:.1f}ms")
+    hashing.password_hasher.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--logins", type=int, default=8, help="concurrent login clients")
+    parser.add_argument("--readers", type=int, default=4, help="concurrent clients issuing unrelated GETs")
+    parser.add_argument("--inline", action="store_true", help="hash on the event loop for comparison")
+    args = parser.parse_args()
+    asyncio.run(main(args.duration, args.logins, args.readers, args.inline))
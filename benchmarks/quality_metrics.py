@@ -0,0 +1,77 @@
+"""
+Wall time of a PSNR/SSIM comparison split across the analysis process pool, against one process doing it all.
+
+Writes a reference and a noisier distorted raw 4:2:0 YUV file, then measures them with each worker count:
+
+    poetry run python -m benchmarks.quality_metrics
+    poetry run python -m benchmarks.quality_metrics --resolution 1920x1080 --frames 600 --workers 1 2 4 8
+
+Scaling is bounded by the cores on the machine; on a single core every worker count takes about as long as one.
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from app.services.utility.quality_metrics import compare_frames, summarize
+from app.services.utility.video_probe import frame_size, probe_video
+from app.services.utility.workers import AnalysisPool
+
+
+def _write_videos(directory: Path, width: int, height: int, frames: int):
+    size = frame_size(width, height, "420", 8)
+    rng = np.random.default_rng(0)
+    reference, distorted = directory / "reference.yuv", directory / "distorted.yuv"
+    with open(reference, "wb") as r, open(distorted, "wb") as d:
+        for _ in range(frames):
+            frame = rng.integers(16, 236, size, dtype=np.uint8)
+            noise = rng.integers(-3, 4, size, dtype=np.int16)
+            r.write(frame.tobytes())
+            d.write((frame + noise).astype(np.uint8).tobytes())
+    return reference, distorted
+
+
+async def _compare(pool: AnalysisPool, reference, reference_layout, distorted, distorted_layout) -> dict:
+    chunks = await pool.map_chunks(compare_frames, pool.chunks(range(reference_layout.frameCount)), reference,
+                                   reference_layout, distorted, distorted_layout)
+    return summarize({name: [v for chunk in chunks for v in chunk[name]] for name in chunks[0]})
+
+
+def main(resolution: str, frames: int, worker_counts):
+    width, height = (int(v) for v in resolution.split("x"))
+    print(f"{resolution}, {frames} frames, {os.cpu_count()} CPUs")
+    print(f"{'workers':>7} {'seconds':>8} {'frames/s':>9} {'speedup':>8} {'PSNR-Y':>7} {'SSIM':>6}")
+    with tempfile.TemporaryDirectory() as directory:
+        reference, distorted = _write_videos(Path(directory), width, height, frames)
+        reference_layout = probe_video(reference, "yuv", resolution, "420", 8)
+        distorted_layout = probe_video(distorted, "yuv", resolution, "420", 8)
+
+        started = time.perf_counter()
+        compare_frames(reference, reference_layout, distorted, distorted_layout, range(frames))
+        single = time.perf_counter() - started
+        print(f"{'inline':>7} {single:>8.2f} {frames / single:>9.1f} {1.0:>8.2f}")
+
+        for workers in worker_counts:
+            pool = AnalysisPool(workers)
+            # start the worker processes before timing, as the server's long-lived pool would have
+            asyncio.run(pool.map_chunks(compare_frames, [range(1)] * workers, reference, reference_layout,
+                                        distorted, distorted_layout))
+            started = time.perf_counter()
+            summary = asyncio.run(_compare(pool, reference, reference_layout, distorted, distorted_layout))
+            elapsed = time.perf_counter() - started
+            pool.shutdown()
+            print(f"{workers:>7} {elapsed:>8.2f} {frames / elapsed:>9.1f} {single / elapsed:>8.2f} "
+                  f"{summary['psnr_y']:>7.2f} {summary['ssim']:>6.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--resolution", default="1920x1080")
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--workers", nargs="+", type=int, default=[1, 2, 4])
+    args = parser.parse_args()
+    main(args.resolution, args.frames, args.workers)
@@ -0,0 +1,78 @@
+"""Runs the application under uvicorn on a local port against a temporary database and uploads directory."""
+import asyncio
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import time
+from typing import Awaitable, Callable, TypeVar
+
+import uvicorn
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.auth.dependencies import super_admin_dependency, user_dependency
+from app.config.settings import Settings, get_settings
+from app.database.database import Base, get_db
+from app.main import app
+from app.models.user import User
+
+T = TypeVar("T")
+
+
+class BenchmarkServer:
+    """
+    Context manager serving ``app`` from a background thread, authenticated as an admin user.
+
+    The database is a file rather than in-memory so it can be set up on one event loop and served from another.
+    """
+
+    def __init__(self):
+        self.uploads = tempfile.mkdtemp()
+        self.settings = Settings(uploads_directory=self.uploads)
+        self.user = User(id=1, username="bench", role="super_admin")
+        self.engine = create_async_engine(f"sqlite+aiosqlite:///{os.path.join(self.uploads, 'bench.db')}")
+        self.sessions = async_sessionmaker(bind=self.engine, class_=AsyncSession, expire_on_commit=False)
+        self.url = None
+        self._server = None
+        self._thread = None
+
+    def setup(self, populate: Callable[[AsyncSession], Awaitable[T]]) -> T:
+        """Create the schema and run ``populate`` with a session before the server starts."""
+        async def run():
+            async with self.engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+            async with self.sessions() as session:
+                result = await populate(session)
+            await self.engine.dispose()
+            return result
+
+        return asyncio.run(run())
+
+    def __enter__(self) -> "BenchmarkServer":
+        async def override_get_db():
+            async with self.sessions() as session:
+                yield session
+
+        app.dependency_overrides[get_db] = override_get_db
+        app.dependency_overrides[get_settings] = lambda: self.settings
+        app.dependency_overrides[user_dependency] = lambda: self.user
+        app.dependency_overrides[super_admin_dependency] = lambda: self.user
+
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            port = s.getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}"
+        self._server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning",
+                                                     lifespan="off"))
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+        self._thread.start()
+        while not self._server.started:
+            time.sleep(0.05)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._server.should_exit = True
+        self._thread.join()
+        app.dependency_overrides.clear()
+        shutil.rmtree(self.uploads, ignore_errors=True)
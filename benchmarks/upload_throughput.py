@@ -0,0 +1,87 @@
+"""
+Upload throughput of multipart POST versus raw-body PUT for result files.
+
+Starts the application under uvicorn on a local port with a temporary database and uploads directory, then
+streams the same payload through both endpoints:
+
+    poetry run python -m benchmarks.upload_throughput --size-mb 512
+"""
+import argparse
+import asyncio
+import os
+import time
+
+import httpx
+
+from app.database.tables.experiments import Experiment
+from app.models.experiment import ExperimentStatus
+from benchmarks.server import BenchmarkServer
+
+CHUNK = 1024 * 1024
+
+
+async def _payload(size: int):
+    block = os.urandom(CHUNK)
+    for _ in range(size // CHUNK):
+        yield block
+
+
+class _MultipartBody:
+    """Streams a single-file multipart body without building it in memory."""
+
+    def __init__(self, filename: str, size: int):
+        self.boundary = "benchmarkboundary"
+        self.head = (f"--{self.boundary}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"{filename}\"\r\n"
+                     "Content-Type: application/octet-stream\r\n\r\n").encode()
+        self.tail = f"\r\n--{self.boundary}--\r\n".encode()
+        self.size = size
+
+    async def __aiter__(self):
+        yield self.head
+        async for block in _payload(self.size):
+            yield block
+        yield self.tail
+
+
+async def _run(size: int, url: str, experiment_id: int):
+    base = f"{url}/experiments/{experiment_id}/results"
+    async with httpx.AsyncClient(timeout=None) as client:
+        body = _MultipartBody("multipart.bin", size)
+        started = time.perf_counter()
+        response = await client.post(base, content=body,
+                                     headers={"Content-Type": f"multipart/form-data; boundary={body.boundary}"})
+        multipart_seconds = time.perf_counter() - started
+        assert response.status_code == 200, response.text
+
+        started = time.perf_counter()
+        response = await client.put(f"{base}/raw.bin", content=_payload(size),
+                                    headers={"Content-Type": "application/octet-stream"})
+        raw_seconds = time.perf_counter() - started
+        assert response.status_code == 200, response.text
+
+    mb = size / CHUNK
+    print(f"payload: {mb:.0f} MiB")
+    print(f"multipart POST: {mb / multipart_seconds:8.1f} MiB/s ({multipart_seconds:.2f}s)")
+    print(f"raw PUT:        {mb / raw_seconds:8.1f} MiB/s ({raw_seconds:.2f}s)")
+
+
+def main(size_mb: int):
+    server = BenchmarkServer()
+
+    async def create_experiment(session) -> int:
+        experiment = Experiment(experiment_name="bench", description="upload benchmark", owner_id=1,
+                                status=ExperimentStatus.PENDING)
+        session.add(experiment)
+        await session.commit()
+        return experiment.id
+
+    experiment_id = server.setup(create_experiment)
+    with server:
+        asyncio.run(_run(size_mb * CHUNK, server.url, experiment_id))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size-mb", type=int, default=256)
+    args = parser.parse_args()
+    main(args.size_mb)
@@ -0,0 +1,71 @@
+"""
+Download throughput of stored videos served as-is versus converted between Y4M and raw YUV on the fly.
+
+Starts the application under uvicorn with a temporary database and uploads directory, uploads one Y4M and one raw
+YUV video of random frames, then downloads each in its stored format and converted to the other:
+
+    poetry run python -m benchmarks.video_conversion --resolution 1920x1080 --frames 120
+"""
+import argparse
+import asyncio
+import os
+import time
+
+import httpx
+
+from benchmarks.server import BenchmarkServer
+
+
+async def _y4m_body(width: int, height: int, frames: int):
+    yield f"YUV4MPEG2 W{width} H{height} F30:1 Ip A1:1 C420jpeg\n".encode()
+    frame = os.urandom(width * height * 3 // 2)
+    for _ in range(frames):
+        yield b"FRAME\n" + frame
+
+
+async def _yuv_body(width: int, height: int, frames: int):
+    frame = os.urandom(width * height * 3 // 2)
+    for _ in range(frames):
+        yield frame
+
+
+async def _download(client: httpx.AsyncClient, url: str, params: dict) -> tuple[int, float]:
+    size = 0
+    started = time.perf_counter()
+    async with client.stream("GET", url, params=params) as response:
+        assert response.status_code == 200, response.status_code
+        async for chunk in response.aiter_raw():
+            size += len(chunk)
+    return size, time.perf_counter() - started
+
+
+async def _run(url: str, resolution: str, frames: int):
+    width, height = (int(v) for v in resolution.split("x"))
+    metadata = {"title": "bench", "frameRate": 30, "resolution": resolution, "bitDepth": 8, "description": "bench"}
+    async with httpx.AsyncClient(base_url=url, timeout=None) as client:
+        print(f"{resolution}, {frames} frames")
+        for stored, body, converted in (("y4m", _y4m_body, "yuv"), ("yuv", _yuv_body, "y4m")):
+            response = await client.put("/infrastructure/videos", params={**metadata, "format": stored},
+                                        content=body(width, height, frames))
+            assert response.status_code == 200, response.text
+            video_url = f"/infrastructure/videos/{response.json()['id']}"
+
+            for label, params in ((f"{stored} as stored", {}), (f"{stored} -> {converted}", {"format": converted})):
+                size, seconds = await _download(client, video_url, params)
+                print(f"  {label:<16} {size / 2 ** 20 / seconds:8.1f} MiB/s "
+                      f"{frames / seconds:8.1f} frames/s ({seconds:.2f}s)")
+
+
+def main(resolution: str, frames: int):
+    server = BenchmarkServer()
+    server.setup(lambda session: asyncio.sleep(0))
+    with server:
+        asyncio.run(_run(server.url, resolution, frames))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--resolution", default="1920x1080")
+    parser.add_argument("--frames", type=int, default=120)
+    args = parser.parse_args()
+    main(args.resolution, args.frames)
@@ -0,0 +1,89 @@
+"""
+Throughput and server-side CPU cost of each way of sending a stored video.
+
+uvicorn advertises no zero-copy send extension, so the responses are driven in-process by a minimal ASGI server that
+writes to a local socket pair drained by a reader thread. Body messages go through ``sock_sendall`` and zero-copy sends
+through ``sock_sendfile`` (kernel ``sendfile`` on Linux), as a server supporting the extension would do:
+
+    poetry run python -m benchmarks.video_download --size-mb 1024
+"""
+import argparse
+import asyncio
+import os
+import socket
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from starlette.responses import FileResponse
+
+from app.config.settings import Settings
+from app.services.utility.downloads import ZEROCOPY_SEND, SendfileResponse, offload_response
+
+CHUNK = 1024 * 1024
+
+
+def _drain(sock: socket.socket, received: list) -> None:
+    total = 0
+    while data := sock.recv(CHUNK):
+        total += len(data)
+    received.append(total)
+
+
+async def _serve(response, extensions: dict) -> int:
+    """Send ``response`` over a socket pair, returning the bytes the client received."""
+    loop = asyncio.get_running_loop()
+    server, client = socket.socketpair()
+    server.setblocking(False)
+    received = []
+    reader = threading.Thread(target=_drain, args=(client, received))
+    reader.start()
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            await loop.sock_sendall(server, message.get("body", b""))
+        elif message["type"] == ZEROCOPY_SEND:
+            await loop.sock_sendfile(server, message["file"], message.get("offset", 0), message.get("count"))
+
+    scope = {"type": "http", "method": "GET", "headers": [], "extensions": extensions}
+    await response(scope, None, send)
+    server.close()
+    await asyncio.to_thread(reader.join)
+    client.close()
+    return received[0]
+
+
+def _measure(label: str, make_response, extensions: dict, size: int) -> None:
+    started, cpu_started = time.perf_counter(), time.thread_time()
+    received = asyncio.run(_serve(make_response(), extensions))
+    seconds, cpu_seconds = time.perf_counter() - started, time.thread_time() - cpu_started
+    mb = size / CHUNK
+    print(f"{label:<32} {received / CHUNK:6.0f} MiB sent {received / CHUNK / seconds:8.1f} MiB/s "
+          f"{cpu_seconds * 1000 / mb * 1024:8.1f} ms CPU per GiB of video")
+
+
+def main(size_mb: int):
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "video.yuv"
+        with open(path, "wb") as file:
+            for _ in range(size_mb):
+                file.write(os.urandom(CHUNK))
+        size = path.stat().st_size
+        settings = Settings(uploads_directory=directory, download_offload="x-accel-redirect")
+        media_type = "application/octet-stream"
+
+        print(f"payload: {size_mb} MiB")
+        _measure("FileResponse, 64 KiB reads", lambda: FileResponse(path, media_type=media_type), {}, size)
+        _measure("SendfileResponse, 1 MiB reads", lambda: SendfileResponse(path, media_type=media_type), {}, size)
+        _measure("SendfileResponse, zero-copy", lambda: SendfileResponse(path, media_type=media_type),
+                 {ZEROCOPY_SEND: {}}, size)
+        _measure("X-Accel-Redirect (app side only)",
+                 lambda: offload_response(str(path), media_type, "video.yuv", settings), {}, size)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size-mb", type=int, default=1024)
+    args = parser.parse_args()
+    main(args.size_mb)
@@ -0,0 +1,81 @@
+"""
+Frame throughput of YuvReader batches versus reading each frame with read() into a new array.
+
+Writes a raw 4:2:0 YUV file of random samples per resolution and bit depth, then sums every luma plane both ways,
+so each sample is touched once:
+
+    poetry run python -m benchmarks.yuv_reader
+    poetry run python -m benchmarks.yuv_reader --resolutions 1920x1080 3840x2160 --megabytes 1024
+"""
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from app.services.utility.video_probe import frame_size, probe_video
+from app.services.utility.yuv_reader import YuvReader
+
+DEFAULT_RESOLUTIONS = ["352x288", "1280x720", "1920x1080", "3840x2160"]
+
+
+def _read_frames(path: Path, layout) -> float:
+    """Baseline: one read() and one array per frame."""
+    dtype = np.uint8 if layout.bitDepth == 8 else np.dtype("<u2")
+    luma = layout.width * layout.height
+    total = 0
+    with open(path, "rb") as f:
+        while data := f.read(layout.frameSize):
+            total += int(np.frombuffer(data, dtype=dtype, count=luma).sum(dtype=np.uint64))
+    return total
+
+
+def _reader_batches(path: Path, layout, batch_size: int) -> float:
+    total = 0
+    with YuvReader(path, layout) as reader:
+        for _, planes in reader.batches(batch_size):
+            total += int(planes[0].sum(dtype=np.uint64))
+            del planes
+    return total
+
+
+def _measure(fn, *args) -> float:
+    started = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - started
+
+
+def main(resolutions, bit_depths, megabytes: int, batch_size: int):
+    print(f"{'resolution':>10} {'bits':>4} {'frames':>6} {'read() frames/s':>16} {'YuvReader frames/s':>19}")
+    with tempfile.TemporaryDirectory() as directory:
+        for resolution in resolutions:
+            width, height = (int(v) for v in resolution.split("x"))
+            for bit_depth in bit_depths:
+                size = frame_size(width, height, "420", bit_depth)
+                frames = max(1, megabytes * 2 ** 20 // size)
+                path = Path(directory) / f"{resolution}_{bit_depth}.yuv"
+                with open(path, "wb") as f:
+                    frame = os.urandom(size)
+                    for _ in range(frames):
+                        f.write(frame)
+                layout = probe_video(path, "yuv", resolution, "420", bit_depth)
+
+                # warm the page cache so both runs read from memory
+                _measure(_read_frames, path, layout)
+                baseline = _measure(_read_frames, path, layout)
+                batched = _measure(_reader_batches, path, layout, batch_size)
+                print(f"{resolution:>10} {bit_depth:>4} {frames:>6} {frames / baseline:>16.1f} "
+                      f"{frames / batched:>19.1f}")
+                path.unlink()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--resolutions", nargs="+", default=DEFAULT_RESOLUTIONS)
+    parser.add_argument("--bit-depths", nargs="+", type=int, default=[8, 10])
+    parser.add_argument("--megabytes", type=int, default=256, help="Approximate file size per run")
+    parser.add_argument("--batch-size", type=int, default=16)
+    args = parser.parse_args()
+    main(args.resolutions, args.bit_depths, args.megabytes, args.batch_size)
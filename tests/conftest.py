@@ -1,6 +1,6 @@
 import shutil
 import tempfile
-from datetime import datetime
+from datetime import datetime, timezone
 from io import BytesIO
 
 import pytest
@@ -12,7 +12,7 @@ from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, Asyn
 
 from app.auth.dependencies import user_dependency, super_admin_dependency, get_current_user
 from app.config.settings import Settings, get_settings
-from app.database.database import Base, get_db
+from app.database.database import Base, get_db, get_sessionmaker
 from app.database.tables.encoders import Encoders
 from app.main import app as application
 from app.models.encoder_input import EncoderInput
@@ -23,6 +23,7 @@ from app.models.user_input import UserInput
 from app.services.encoders import EncodersService
 from app.services.networks import NetworksService
 from app.services.videos import VideosService
+from tests.utility.video_samples import make_y4m
 
 SQLALCHEMY_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
 engine = create_async_engine(SQLALCHEMY_DATABASE_URL, echo=False)
@@ -53,6 +54,7 @@ def app(db, isolate_upload_dir) -> FastAPI:
 
     application.dependency_overrides[get_db] = override_get_db
     application.dependency_overrides[get_settings] = override_get_settings
+    application.dependency_overrides[get_sessionmaker] = lambda: TestingSessionLocal
     return application
 
 @pytest_asyncio.fixture
@@ -215,7 +217,7 @@ def experiment(db):
             description="Test upload results",
             owner_id=1,
             status=ExperimentStatus.COMPLETE,
-            created_at=datetime.now()
+            created_at=datetime.now(timezone.utc)
         )
         db.add(exp)
         await db.commit()
@@ -252,19 +254,20 @@ def test_video_data():
         "title": "sample_video",
         "format": "y4m",
         "frameRate": 30,
-        "resolution": "1920x1080",
+        "resolution": "16x16",
         "description": "Test video upload",
         "bitDepth": 8,
     }
 
 @pytest.fixture
-def video_factory(db, test_super_admin):
+def video_factory(db, test_super_admin, isolate_upload_dir):
     async def _create_video(**kwargs):
-        file = UploadFile(filename="video.y4m", file=BytesIO(b"YUV4MPEG2 content"))
+        file = UploadFile(filename="video.y4m", file=BytesIO(make_y4m()))
         return await VideosService().create_video(
             video=file,
             current_user=test_super_admin,
             db=db,
+            settings=Settings(uploads_directory=isolate_upload_dir),
             **kwargs
         )
     return _create_video
@@ -293,7 +296,7 @@ async def create_experiment(db):
             description="Test upload results",
             owner_id=1,
             status=ExperimentStatus.COMPLETE,
-            created_at=datetime.now().isoformat()
+            created_at=datetime.now(timezone.utc)
         )
         db.add(exp)
         await db.commit()
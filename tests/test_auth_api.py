@@ -1,6 +1,14 @@
+import asyncio
+
 import pytest
+from fastapi import HTTPException
 from httpx import AsyncClient
+from app.auth.dependencies import get_current_user
+from app.auth.hashing import PasswordHasher
+from app.auth.principal_cache import PrincipalCache, principal_cache
+from app.models.user_input import UserInput
 from app.services.auth import AuthService
+from app.services.users import UsersService
 
 
 @pytest.mark.asyncio
@@ -89,3 +97,72 @@ class TestAuthRoutes:
 
         assert response.status_code == 404
         assert "user not found" in response.text.lower()
+
+    async def test_diagnostics_reports_password_hashing(self, async_client: AsyncClient, user_factory):
+        await user_factory(username="metricsuser", password="metricspass")
+        await async_client.post("/auth/login", json={"username": "metricsuser", "password": "metricspass"})
+
+        response = await async_client.get("/diagnostics")
+
+        assert response.status_code == 200
+        stats = response.json()["password_hashing"]
+        assert stats["completed"] >= 2
+        assert stats["in_flight"] == 0
+        assert stats["queued"] == 0
+
+
+@pytest.mark.asyncio
+class TestPasswordHasher:
+
+    async def test_hash_and_verify_in_pool(self):
+        hasher = PasswordHasher(workers=1, concurrency=1)
+        try:
+            hashed = await hasher.hash("correct horse")
+            results = await asyncio.gather(hasher.verify("correct horse", hashed),
+                                           hasher.verify("wrong horse", hashed),
+                                           hasher.verify("correct horse", hashed))
+        finally:
+            hasher.shutdown()
+
+        assert results == [True, False, True]
+        assert hasher.completed == 4
+        assert hasher.max_queued >= 2
+        assert hasher.queued == 0 and hasher.in_flight == 0
+
+
+@pytest.mark.asyncio
+class TestPrincipalCache:
+
+    async def test_get_current_user_is_cached_and_invalidated(self, db):
+        principal_cache.clear()
+        await UsersService().create_user(UserInput(username="cached", first_name="Cached", last_name="User",
+                                                   email="cached@example.com", password="pw", role="user"), db)
+        token = AuthService().create_access_token({"sub": "cached", "role": "user", "iat": 1})
+        hits = principal_cache.hits
+
+        first = await get_current_user(token, db)
+        second = await get_current_user(token, db)
+
+        assert first.username == second.username == "cached"
+        assert principal_cache.hits == hits + 1
+
+        await UsersService().update_user("cached", UserInput(role="admin"), db)
+
+        with pytest.raises(HTTPException) as exc:
+            await get_current_user(token, db)
+        assert exc.value.status_code == 401
+
+    async def test_entries_expire_and_evict(self, test_user):
+        cache = PrincipalCache(max_entries=2, ttl_seconds=60)
+        cache.set(("a", 1), test_user)
+        cache.set(("b", 1), test_user)
+        cache.get(("a", 1))
+        cache.set(("c", 1), test_user)
+
+        assert cache.get(("b", 1)) is None
+        assert cache.get(("a", 1)) is test_user
+
+        cache.ttl_seconds = -1
+        cache.set(("d", 1), test_user)
+        assert cache.get(("d", 1)) is None
+        assert cache.stats()["hits"] == 2
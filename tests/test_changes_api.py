@@ -0,0 +1,105 @@
+import pytest
+from httpx import AsyncClient
+
+from app.auth.dependencies import user_dependency
+from app.models.user import User
+from app.services.video_analysis import VideoAnalysisService
+from tests.utility.video_samples import make_y4m, make_yuv
+
+
+@pytest.mark.asyncio
+class TestChangesRoutes:
+
+    async def test_changes_since_cursor(self, async_client: AsyncClient, test_network_json,
+                                       experiment_input_payload):
+        network = (await async_client.post("/infrastructure/networks", json=test_network_json)).json()
+        start = (await async_client.get("/changes")).json()
+        assert [(c["entity"], c["operation"]) for c in start["changes"]] == [("network", "insert")]
+        assert start["changes"][0]["data"]["networkName"] == test_network_json["networkName"]
+
+        await async_client.delete(f"/infrastructure/networks/{network['network_profile_id']}")
+        experiment = (await async_client.post("/experiments", json=experiment_input_payload)).json()
+        await async_client.put(f"/experiments/{experiment['Id']}", json={"Description": "Changed"})
+
+        response = await async_client.get("/changes", params={"since": start["cursor"]})
+        changes = response.json()["changes"]
+
+        # the experiment's insert and update collapse into its latest state
+        assert [(c["entity"], c["id"], c["operation"]) for c in changes] == [
+            ("network", str(network["network_profile_id"]), "delete"),
+            ("experiment", str(experiment["Id"]), "update")]
+        assert changes[0]["data"] is None
+        assert changes[1]["data"] == (await async_client.get(f"/experiments/{experiment['Id']}")).json()
+        assert changes[0]["seq"] < changes[1]["seq"]
+
+        idle = await async_client.get("/changes", params={"since": response.json()["cursor"]})
+        assert idle.json() == {"changes": [], "cursor": response.json()["cursor"], "hasMore": False}
+        assert len(idle.content) < 100
+
+    async def test_changes_in_pages(self, async_client: AsyncClient, test_network_json):
+        for n in range(3):
+            await async_client.post("/infrastructure/networks", json={**test_network_json, "networkName": f"n{n}"})
+
+        first = (await async_client.get("/changes", params={"limit": 2})).json()
+        rest = (await async_client.get("/changes", params={"limit": 2, "since": first["cursor"]})).json()
+
+        assert first["hasMore"] and not rest["hasMore"]
+        assert [c["data"]["networkName"] for c in first["changes"] + rest["changes"]] == ["n0", "n1", "n2"]
+        assert (await async_client.get("/changes", params={"since": "abc"})).status_code == 400
+
+    async def test_users_only_see_their_own_experiments(self, app, async_client: AsyncClient,
+                                                        experiment_input_payload):
+        await async_client.post("/experiments", json=experiment_input_payload)
+
+        app.dependency_overrides[user_dependency] = lambda: User(id=5, username="other", role="user")
+        assert (await async_client.get("/changes")).json()["changes"] == []
+
+    async def test_experiment_logged_with_its_sequences(self, async_client: AsyncClient, db, monkeypatch,
+                                                        experiment_input_payload):
+        commits = []
+        commit = db.commit
+
+        async def counting_commit():
+            commits.append(True)
+            await commit()
+
+        monkeypatch.setattr(db, "commit", counting_commit)
+        experiment = (await async_client.post("/experiments", json=experiment_input_payload)).json()
+
+        # one transaction, so a client can never read the insert before the sequences exist
+        assert len(commits) == 1
+        changes = (await async_client.get("/changes")).json()["changes"]
+        assert [c["data"]["Sequences"] for c in changes] == [experiment["Sequences"]]
+        assert len(experiment["Sequences"]) == 1
+
+    async def test_clearing_duplicates_logs_video_updates(self, async_client: AsyncClient, test_video_data):
+        first = (await async_client.put("/infrastructure/videos", params=test_video_data,
+                                        content=make_y4m(frames=6))).json()
+        copy = (await async_client.put("/infrastructure/videos",
+                                       params={**test_video_data, "title": "copy", "format": "yuv"},
+                                       content=make_yuv(frames=6))).json()
+        assert copy["duplicateOf"] == first["id"]
+        cursor = (await async_client.get("/changes")).json()["cursor"]
+
+        await async_client.delete(f"/infrastructure/videos/{first['id']}")
+
+        changes = (await async_client.get("/changes", params={"since": cursor})).json()["changes"]
+        assert sorted((c["id"], c["operation"]) for c in changes) == sorted([(first["id"], "delete"),
+                                                                             (copy["id"], "update")])
+        assert next(c for c in changes if c["id"] == copy["id"])["data"]["duplicateOf"] is None
+
+    async def test_proxy_link_logged_as_video_update(self, async_client: AsyncClient, monkeypatch, test_video_data):
+        async def skip_analysis(self, video_id, sessionmaker):
+            pass
+
+        # analysis logs its own update, which would hide a missing one
+        monkeypatch.setattr(VideoAnalysisService, "analyze_video", skip_analysis)
+        source = (await async_client.put("/infrastructure/videos", params=test_video_data,
+                                         content=make_y4m(frames=2))).json()
+        cursor = (await async_client.get("/changes")).json()["cursor"]
+
+        await async_client.post(f"/infrastructure/videos/{source['id']}/proxies", json={"scale": 2})
+
+        changes = (await async_client.get("/changes", params={"since": cursor})).json()["changes"]
+        assert [(c["operation"], c["data"]["parentId"], c["data"]["proxyScale"]) for c in changes] == [
+            ("update", source["id"], 2)]
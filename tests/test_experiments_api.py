@@ -1,9 +1,11 @@
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.auth.dependencies import user_dependency
 from app.database.tables.experiments import Experiment, ExperimentSequence
 from app.models.experiment import ExperimentStatus
 
@@ -24,6 +26,19 @@ def experiment_input_payload():
     }
 
 
+@pytest.fixture
+def statements(db: AsyncSession):
+    """SQL statements executed while the test runs."""
+    engine, executed = db.bind.sync_engine, []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(engine, "before_cursor_execute", record)
+
+
 @pytest.mark.asyncio
 class TestExperimentsRoutes:
 
@@ -51,6 +66,120 @@ class TestExperimentsRoutes:
         assert response.status_code == 200
         assert response.json()["Id"] == exp_id
 
+    async def test_list_experiments_in_pages(self, async_client: AsyncClient, experiment_input_payload):
+        ids = [(await async_client.post("/experiments", json={**experiment_input_payload,
+                                                              "ExperimentName": f"Paged {n}"})).json()["Id"]
+               for n in range(3)]
+
+        first = await async_client.get("/experiments", params={"limit": 2})
+        assert [e["Id"] for e in first.json()] == ids[:2]
+        assert first.headers["link"].endswith('>; rel="next"')
+
+        second = await async_client.get("/experiments", params={"limit": 2, "cursor": first.headers["x-next-cursor"]})
+        assert [e["Id"] for e in second.json()] == ids[2:]
+        assert "x-next-cursor" not in second.headers
+
+    async def test_list_experiments_with_sparse_fields(self, async_client: AsyncClient, experiment_input_payload,
+                                                       network_factory, test_network_json, statements):
+        await network_factory(test_network_json)
+        for n in range(3):
+            await async_client.post("/experiments", json={**experiment_input_payload, "ExperimentName": f"Exp {n}"})
+
+        statements.clear()
+        full = await async_client.get("/experiments")
+        assert len(statements) == 4  # experiments, sequences and both network profiles
+        assert full.json()[0]["Sequences"][0]["NetworkTopology"]["networkName"] == test_network_json["networkName"]
+
+        statements.clear()
+        sparse = await async_client.get("/experiments", params={"fields": "ExperimentName,status,CreatedAt"})
+        assert len(statements) == 1
+        assert "description" not in statements[0][0] and "experiment_sequences" not in statements[0][0]
+        assert [set(e) for e in sparse.json()] == [{"Id", "ExperimentName", "status", "CreatedAt"}] * 3
+        assert [e["CreatedAt"] for e in sparse.json()] == [e["CreatedAt"] for e in full.json()]
+        assert len(sparse.content) * 4 < len(full.content)
+
+        statements.clear()
+        sequences = await async_client.get("/experiments", params={"fields": "ExperimentName", "include": "Sequences"})
+        assert len(statements) == 2
+        assert "NetworkTopology" not in sequences.json()[0]["Sequences"][0]
+
+    async def test_get_experiment_with_fieldset(self, async_client: AsyncClient, experiment_input_payload,
+                                                network_factory, test_network_json, statements):
+        await network_factory(test_network_json)
+        exp_id = (await async_client.post("/experiments", json=experiment_input_payload)).json()["Id"]
+
+        full = await async_client.get(f"/experiments/{exp_id}")
+        expanded = await async_client.get(f"/experiments/{exp_id}", params={
+            "include": "Sequences.NetworkTopology,Sequences.NetworkDisruptionProfile"})
+        assert expanded.json() == full.json()
+
+        statements.clear()
+        status = await async_client.get(f"/experiments/{exp_id}", params={"fields": "status"})
+        assert status.json() == {"Id": exp_id, "status": "PENDING"}
+        assert len(statements) == 1
+
+        assert (await async_client.get(f"/experiments/{exp_id}", params={"fields": "Secret"})).status_code == 400
+        assert (await async_client.get(f"/experiments/{exp_id}", params={"include": "Results"})).status_code == 400
+
+    @pytest.mark.parametrize("filters, index, expected", [
+        ({"status": "COMPLETE"}, "ix_experiments_status_id", [0, 3, 6, 9]),
+        ({"owner_id": 3}, "ix_experiments_owner_id_id", [3, 7, 11]),
+        ({"created_after": "2025-01-03T00:00:00", "created_before": "2025-01-05T00:00:00"},
+         "ix_experiments_created_at_id", [2, 3]),
+        ({"network_topology_id": 2}, "ix_experiment_sequences_topology_experiment", [2, 5, 8, 11]),
+        ({"network_disruption_profile_id": 1}, "ix_experiment_sequences_disruption_experiment", [1, 3, 5, 7, 9, 11]),
+        ({"name_prefix": "Exp 1"}, "ix_experiments_experiment_name", [1, 10, 11]),
+    ])
+    async def test_experiment_filters_use_indexes(self, app, async_client: AsyncClient, db: AsyncSession,
+                                                  test_super_admin, statements, filters, index, expected):
+        app.dependency_overrides[user_dependency] = lambda: test_super_admin
+        for n in range(12):
+            db.add(Experiment(experiment_name=f"Exp {n}", description="", owner_id=n % 4,
+                              status=list(ExperimentStatus)[n % 3],
+                              created_at=datetime(2025, 1, n + 1, 12, tzinfo=timezone.utc),
+                              sequences=[ExperimentSequence(network_topology_id=n % 3,
+                                                            network_disruption_profile_id=n % 2,
+                                                            encoding_parameters={})]))
+        await db.commit()
+
+        statements.clear()
+        response = await async_client.get("/experiments", params={**filters, "fields": "ExperimentName"})
+        assert response.status_code == 200
+        assert [e["ExperimentName"] for e in response.json()] == [f"Exp {n}" for n in expected]
+
+        statement, parameters = statements[0]
+        connection = await db.connection()
+        plan = [row[-1] for row in await connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)]
+        assert any(index in step for step in plan), plan
+        assert not any(step.startswith("SCAN") for step in plan), plan
+
+    async def test_list_experiments_sorted(self, async_client: AsyncClient, experiment_input_payload):
+        for name in ("b", "c", "a"):
+            await async_client.post("/experiments", json={**experiment_input_payload, "ExperimentName": name})
+
+        first = await async_client.get("/experiments", params={"sort": "-ExperimentName", "limit": 2,
+                                                                "fields": "ExperimentName"})
+        rest = await async_client.get("/experiments", params={"sort": "-ExperimentName", "limit": 2,
+                                                               "cursor": first.headers["x-next-cursor"]})
+
+        assert [e["ExperimentName"] for e in first.json() + rest.json()] == ["c", "b", "a"]
+        assert (await async_client.get("/experiments", params={"sort": "Description"})).status_code == 400
+
+    async def test_list_experiments_newest_first(self, app, async_client: AsyncClient, db: AsyncSession,
+                                                 test_super_admin):
+        app.dependency_overrides[user_dependency] = lambda: test_super_admin
+        for n, day in enumerate((2, 3, 1)):
+            db.add(Experiment(experiment_name=f"Exp {n}", description="", owner_id=1,
+                              status=ExperimentStatus.PENDING, created_at=datetime(2025, 1, day, tzinfo=timezone.utc)))
+        await db.commit()
+
+        first = await async_client.get("/experiments", params={"sort": "-CreatedAt", "limit": 2})
+        rest = await async_client.get("/experiments", params={"sort": "-CreatedAt", "limit": 2,
+                                                               "cursor": first.headers["x-next-cursor"]})
+
+        assert rest.status_code == 200
+        assert [e["ExperimentName"] for e in first.json() + rest.json()] == ["Exp 1", "Exp 0", "Exp 2"]
+
     async def test_update_experiment_fields(self, async_client: AsyncClient, experiment_input_payload):
         create_resp = await async_client.post("/experiments", json=experiment_input_payload)
         exp_id = create_resp.json()["Id"]
@@ -68,13 +197,26 @@ class TestExperimentsRoutes:
         assert update_resp.json()["ExperimentName"] == "Updated Name"
         assert update_resp.json()["status"] == "COMPLETE"
 
+    async def test_experiment_timestamps(self, async_client: AsyncClient, experiment_input_payload):
+        created = (await async_client.post("/experiments", json=experiment_input_payload)).json()
+        created_at = datetime.fromisoformat(created["CreatedAt"])
+        assert created_at.utcoffset() == timedelta(0)
+        assert datetime.fromisoformat(created["UpdatedAt"]) >= created_at
+
+        updated = await async_client.put(f"/experiments/{created['Id']}", json={"Description": "Changed"})
+        fetched = (await async_client.get(f"/experiments/{created['Id']}")).json()
+
+        assert updated.json()["UpdatedAt"] == fetched["UpdatedAt"]
+        assert datetime.fromisoformat(fetched["CreatedAt"]) == created_at
+        assert datetime.fromisoformat(fetched["UpdatedAt"]) > datetime.fromisoformat(created["UpdatedAt"])
+
     async def test_delete_experiment(self, async_client: AsyncClient, db: AsyncSession):
         exp = Experiment(
             experiment_name="ToDelete",
             description="Should be deleted",
             owner_id=2,
             status=ExperimentStatus.PENDING,
-            created_at=datetime.now().isoformat()
+            created_at=datetime.now(timezone.utc)
         )
 
         db.add(exp)
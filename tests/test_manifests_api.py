@@ -0,0 +1,135 @@
+import hashlib
+import io
+from datetime import datetime, timezone
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import select
+
+from app.database.tables.experiments import Experiment
+from app.database.tables.manifests import FrameManifest
+from app.database.tables.results import ExperimentResult
+from app.models.experiment import ExperimentStatus
+from tests.utility.video_samples import make_frames, make_y4m, make_yuv
+
+
+@pytest_asyncio.fixture
+async def experiment(db):
+    exp = Experiment(experiment_name="ManifestTest", description="Test frame manifests", owner_id=1,
+                     status=ExperimentStatus.COMPLETE, created_at=datetime.now(timezone.utc))
+    db.add(exp)
+    await db.commit()
+    await db.refresh(exp)
+    return exp
+
+
+def with_changed_frame(frames: int, changed: int) -> bytes:
+    """A Y4M file matching ``make_y4m(frames=frames)`` except for one sample of frame ``changed``."""
+    content = bytearray(make_y4m(frames=frames))
+    header_length = content.index(b"\n") + 1
+    frame_length = len(b"FRAME\n") + len(make_frames(frames=1)[0])
+    content[header_length + changed * frame_length + len(b"FRAME\n")] ^= 1
+    return bytes(content)
+
+
+@pytest.mark.asyncio
+class TestManifestsRoutes:
+
+    async def _upload_video(self, async_client: AsyncClient, content: bytes, format="y4m") -> str:
+        metadata = {"title": "manifest", "format": format, "frameRate": 30, "resolution": "16x16", "bitDepth": 8}
+        response = await async_client.put("/infrastructure/videos", params=metadata, content=content)
+        assert response.status_code == 200, response.text
+        return response.json()["id"]
+
+    async def _upload_result(self, async_client: AsyncClient, db, experiment, filename: str, content: bytes) -> int:
+        response = await async_client.post(f"/experiments/{experiment.id}/results",
+                                           files={"file": (filename, io.BytesIO(content))})
+        assert response.status_code == 200, response.text
+        return (await db.execute(select(ExperimentResult.id).where(ExperimentResult.filename == filename))).scalar()
+
+    async def _compare(self, async_client: AsyncClient, first: dict, second: dict):
+        return await async_client.post("/manifests/compare", json={"First": first, "Second": second})
+
+    async def test_video_manifest_computed_on_ingest(self, async_client: AsyncClient, db):
+        video_id = await self._upload_video(async_client, make_y4m(frames=4))
+
+        stored = (await db.execute(select(FrameManifest).where(FrameManifest.video_id == video_id))).scalars().one()
+        assert stored.md5 == [hashlib.md5(frame).hexdigest() for frame in make_frames(frames=4)]
+
+        response = await async_client.get(f"/infrastructure/videos/{video_id}/manifest")
+        assert response.status_code == 200
+        assert response.json()["FrameCount"] == 4
+        assert response.json()["Md5"] == stored.md5
+
+    async def test_same_frames_in_different_containers_match(self, async_client: AsyncClient):
+        y4m_id = await self._upload_video(async_client, make_y4m(frames=4))
+        yuv_id = await self._upload_video(async_client, make_yuv(frames=4), format="yuv")
+
+        response = await self._compare(async_client, {"VideoId": y4m_id}, {"VideoId": yuv_id})
+
+        assert response.status_code == 200
+        assert response.json() == {"Identical": True, "FirstMismatch": None, "FirstFrameCount": 4,
+                                   "SecondFrameCount": 4, "Detail": None}
+
+    async def test_first_mismatching_result_frame(self, async_client: AsyncClient, db, experiment):
+        video_id = await self._upload_video(async_client, make_y4m(frames=5))
+        result_id = await self._upload_result(async_client, db, experiment, "decoded.y4m", with_changed_frame(5, 2))
+        # Y4M results are checksummed once they are stored
+        assert (await db.execute(select(FrameManifest).where(FrameManifest.result_id == result_id))).scalar()
+
+        response = await self._compare(async_client, {"VideoId": video_id}, {"ResultId": result_id})
+
+        assert response.json()["Identical"] is False
+        assert response.json()["FirstMismatch"] == 2
+
+    async def test_failing_result_manifest_does_not_fail_upload(self, async_client: AsyncClient, db, experiment,
+                                                                 monkeypatch):
+        def fail(*args):
+            raise OSError("disk error")
+
+        monkeypatch.setattr("app.services.manifests.frame_md5s", fail)
+
+        result_id = await self._upload_result(async_client, db, experiment, "decoded.y4m", make_y4m(frames=2))
+
+        assert result_id is not None
+        assert not (await db.execute(select(FrameManifest).where(FrameManifest.result_id == result_id))).scalar()
+
+    async def test_raw_result_uses_counterpart_layout(self, async_client: AsyncClient, db, experiment):
+        video_id = await self._upload_video(async_client, make_y4m(frames=5))
+        result_id = await self._upload_result(async_client, db, experiment, "decoded.yuv", make_yuv(frames=3))
+
+        response = await self._compare(async_client, {"ResultId": result_id}, {"VideoId": video_id})
+
+        assert response.json()["FirstMismatch"] == 3
+        assert (response.json()["FirstFrameCount"], response.json()["SecondFrameCount"]) == (3, 5)
+
+    async def test_layout_mismatch(self, async_client: AsyncClient):
+        first = await self._upload_video(async_client, make_y4m(frames=2))
+        metadata = {"title": "small", "format": "y4m", "resolution": "16x8", "bitDepth": 8}
+        second = (await async_client.put("/infrastructure/videos", params=metadata,
+                                         content=make_y4m(height=8, frames=2))).json()["id"]
+
+        response = await self._compare(async_client, {"VideoId": first}, {"VideoId": second})
+
+        assert response.json()["Identical"] is False
+        assert response.json()["FirstMismatch"] == 0
+        assert "16x16 420 8-bit and 16x8 420 8-bit" in response.json()["Detail"]
+
+    async def test_invalid_comparisons(self, async_client: AsyncClient, db, experiment):
+        first = await self._upload_result(async_client, db, experiment, "a.yuv", make_yuv())
+        second = await self._upload_result(async_client, db, experiment, "b.yuv", make_yuv())
+        text = await self._upload_result(async_client, db, experiment, "log.txt", b"not a video")
+
+        assert (await self._compare(async_client, {"ResultId": first}, {"ResultId": second})).status_code == 400
+        assert (await self._compare(async_client, {"ResultId": text}, {"ResultId": second})).status_code == 400
+        assert (await self._compare(async_client, {"VideoId": "missing"}, {"ResultId": first})).status_code == 404
+        assert (await self._compare(async_client, {"VideoId": "x", "ResultId": first},
+                                    {"ResultId": first})).status_code == 422
+
+    async def test_deleting_video_removes_manifest(self, async_client: AsyncClient, db):
+        video_id = await self._upload_video(async_client, make_y4m())
+
+        await async_client.delete(f"/infrastructure/videos/{video_id}")
+
+        assert (await db.execute(select(FrameManifest))).scalars().first() is None
@@ -0,0 +1,82 @@
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import inspect, select, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.database.migrations import sync_schema
+from app.database.tables.experiments import Experiment
+from app.database.tables.videos import InputVideo
+
+
+@pytest.mark.asyncio
+async def test_sync_schema_adds_missing_columns():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE TABLE experiment_results (id INTEGER PRIMARY KEY, filename VARCHAR NOT NULL, "
+                                "path VARCHAR, experiment_id INTEGER NOT NULL)"))
+        await conn.execute(text("INSERT INTO experiment_results (filename, path, experiment_id) VALUES ('a', 'b', 1)"))
+
+        await conn.run_sync(sync_schema)
+        columns = await conn.run_sync(lambda c: {col["name"] for col in inspect(c).get_columns("experiment_results")})
+        rows = (await conn.execute(text("SELECT filename, size, sha256 FROM experiment_results"))).all()
+        indexes = await conn.run_sync(lambda c: {ix["name"] for ix in inspect(c).get_indexes("experiment_results")})
+    await engine.dispose()
+
+    assert {"size", "sha256"} <= columns
+    assert rows == [("a", None, None)]
+    assert "ix_experiment_results_sha256" in indexes
+
+
+@pytest.mark.asyncio
+async def test_backfill_timestamps_converts_legacy_values():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE TABLE experiments (id INTEGER PRIMARY KEY, experiment_name VARCHAR(50), "
+                                "description VARCHAR(250), owner_id INTEGER, status VARCHAR, "
+                                "created_at VARCHAR(250))"))
+        await conn.execute(text("INSERT INTO experiments (experiment_name, description, created_at) "
+                                "VALUES ('a', '', '2025-03-01 09:30:00.250000'), ('b', '', 'not a date'), "
+                                "('c', '', NULL)"))
+        await conn.execute(text("CREATE TABLE input_videos (id VARCHAR PRIMARY KEY, title VARCHAR NOT NULL, "
+                                "createdDate VARCHAR)"))
+        await conn.execute(text("INSERT INTO input_videos VALUES ('v', 'video', '03/01/2025, 09:30:00')"))
+
+        await conn.run_sync(sync_schema)
+        experiments = (await conn.execute(select(Experiment.created_at, Experiment.updated_at)
+                                          .order_by(Experiment.id))).all()
+        video = (await conn.execute(select(InputVideo.createdDate, InputVideo.updatedDate))).one()
+        applied = (await conn.execute(text("SELECT name FROM schema_migrations"))).scalars().all()
+
+        # applied migrations are recorded and not run again
+        await conn.execute(text("UPDATE experiments SET updated_at = NULL"))
+        await conn.run_sync(sync_schema)
+        rerun = (await conn.execute(text("SELECT updated_at FROM experiments"))).scalars().all()
+    await engine.dispose()
+
+    expected = datetime(2025, 3, 1, 9, 30, 0, 250000).astimezone(timezone.utc)
+    assert experiments == [(expected, expected), (None, None), (None, None)]
+    assert video == (expected.replace(microsecond=0), expected.replace(microsecond=0))
+    assert applied == ["0001_utc_timestamps", "0002_seed_change_log"]
+    assert rerun == [None, None, None]
+
+
+@pytest.mark.asyncio
+async def test_seed_change_log_lists_existing_entities():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE TABLE experiments (id INTEGER PRIMARY KEY, experiment_name VARCHAR(50), "
+                                "description VARCHAR(250), owner_id INTEGER, status VARCHAR, "
+                                "created_at VARCHAR(250))"))
+        await conn.execute(text("INSERT INTO experiments (id, experiment_name, description, owner_id) "
+                                "VALUES (7, 'a', '', 3)"))
+        await conn.execute(text("CREATE TABLE experiment_results (id INTEGER PRIMARY KEY, filename VARCHAR NOT NULL, "
+                                "path VARCHAR, experiment_id INTEGER NOT NULL)"))
+        await conn.execute(text("INSERT INTO experiment_results VALUES (4, 'a', 'b', 7)"))
+
+        await conn.run_sync(sync_schema)
+        seeded = (await conn.execute(text("SELECT entity, entity_id, operation, owner_id FROM change_log "
+                                          "ORDER BY id"))).all()
+    await engine.dispose()
+
+    assert seeded == [("experiment", "7", "insert", 3), ("result", "4", "insert", 3)]
@@ -0,0 +1,179 @@
+import io
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import select
+
+from app.config.settings import Settings
+from app.database.tables.experiments import Experiment
+from app.database.tables.quality import QualityMetric
+from app.database.tables.results import ExperimentResult
+from app.database.tables.videos import InputVideo
+from app.models.experiment import ExperimentStatus
+from app.services.experiments import ExperimentsService
+from app.services.utility.quality_metrics import PSNR_CAP
+from tests.utility.video_samples import make_frames, make_y4m, make_yuv
+
+
+@pytest_asyncio.fixture
+async def experiment(db):
+    async def _create():
+        exp = Experiment(experiment_name="QualityTest", description="Test quality metrics", owner_id=1,
+                         status=ExperimentStatus.COMPLETE, created_at=datetime.now(timezone.utc))
+        db.add(exp)
+        await db.commit()
+        await db.refresh(exp)
+        return exp
+    return _create
+
+
+def brighten_luma(width=16, height=16, frames=3, offset=2) -> bytes:
+    """Raw 4:2:0 frames matching ``make_yuv`` except that every luma sample is ``offset`` brighter."""
+    luma = width * height
+    result = []
+    for frame in make_frames(width, height, frames):
+        samples = np.frombuffer(frame, dtype=np.uint8).copy()
+        samples[:luma] += offset
+        result.append(samples.tobytes())
+    return b"".join(result)
+
+
+@pytest.mark.asyncio
+class TestQualityRoutes:
+
+    async def _upload(self, async_client: AsyncClient, content: bytes, format="y4m", resolution="16x16") -> str:
+        metadata = {"title": "quality", "format": format, "frameRate": 30, "resolution": resolution,
+                    "description": "quality test", "bitDepth": 8}
+        response = await async_client.post("/infrastructure/videos", data=metadata,
+                                           files={"video_file": (f"video.{format}", io.BytesIO(content))})
+        assert response.status_code == 200, response.text
+        return response.json()["id"]
+
+    async def _measure(self, async_client: AsyncClient, experiment_id: int, **body) -> dict:
+        response = await async_client.post(f"/experiments/{experiment_id}/quality", json=body)
+        assert response.status_code == 202, response.text
+        assert response.json()["Status"] == "PENDING"
+
+        # the background task has finished by the time the test client returns
+        response = await async_client.get(f"/experiments/{experiment_id}/quality/{response.json()['Id']}")
+        assert response.status_code == 200
+        return response.json()
+
+    async def test_identical_videos(self, async_client: AsyncClient, experiment):
+        exp = await experiment()
+        video_id = await self._upload(async_client, make_y4m(frames=3))
+
+        metric = await self._measure(async_client, exp.id, ReferenceVideoId=video_id, DistortedVideoId=video_id)
+
+        assert metric["Status"] == "COMPLETE"
+        assert metric["FrameCount"] == 3
+        assert metric["PsnrY"] == metric["PsnrU"] == metric["PsnrV"] == PSNR_CAP
+        assert metric["Ssim"] == pytest.approx(1.0)
+        assert metric["PerFrame"]["psnr_y"] == [PSNR_CAP] * 3
+
+    async def test_mono_videos(self, async_client: AsyncClient, experiment):
+        exp = await experiment()
+        luma = np.arange(3 * 16 * 16, dtype=np.uint8).tobytes()
+        metadata = {"title": "mono", "format": "yuv", "frameRate": 30, "resolution": "16x16",
+                    "description": "mono", "bitDepth": 8, "chromaFormat": "mono"}
+        response = await async_client.post("/infrastructure/videos", data=metadata,
+                                           files={"video_file": ("video.yuv", io.BytesIO(luma))})
+        video_id = response.json()["id"]
+
+        metric = await self._measure(async_client, exp.id, ReferenceVideoId=video_id, DistortedVideoId=video_id)
+
+        assert metric["Status"] == "COMPLETE"
+        assert metric["PsnrY"] == PSNR_CAP
+        assert metric["PsnrU"] is None and metric["PsnrV"] is None
+        assert set(metric["PerFrame"]) == {"psnr_y", "ssim"}
+
+    async def test_zero_frame_video_rejected(self, async_client: AsyncClient, db, experiment):
+        exp = await experiment()
+        video_id = await self._upload(async_client, make_y4m(frames=3))
+        video = await db.get(InputVideo, video_id)
+        video.frameCount = 0
+        await db.commit()
+
+        response = await async_client.post(f"/experiments/{exp.id}/quality",
+                                           json={"ReferenceVideoId": video_id, "DistortedVideoId": video_id})
+
+        assert response.status_code == 422
+        assert "no frames" in response.json()["detail"]
+
+    async def test_distorted_video(self, async_client: AsyncClient, experiment):
+        exp = await experiment()
+        reference_id = await self._upload(async_client, make_y4m(frames=3))
+        distorted_id = await self._upload(async_client, brighten_luma(frames=3), format="yuv")
+
+        metric = await self._measure(async_client, exp.id, ReferenceVideoId=reference_id,
+                                     DistortedVideoId=distorted_id)
+
+        assert metric["Status"] == "COMPLETE"
+        # every luma sample is off by 2: MSE 4
+        assert metric["PsnrY"] == pytest.approx(10 * np.log10(255 ** 2 / 4))
+        assert metric["PsnrU"] == metric["PsnrV"] == PSNR_CAP
+        assert 0 < metric["Ssim"] < 1
+
+        listing = await async_client.get(f"/experiments/{exp.id}/quality")
+        assert [m["Id"] for m in listing.json()] == [metric["Id"]]
+        assert "PerFrame" not in listing.json()[0]
+
+    async def test_distorted_result_file(self, async_client: AsyncClient, db, experiment):
+        exp = await experiment()
+        reference_id = await self._upload(async_client, make_yuv(frames=4), format="yuv")
+        upload = await async_client.post(f"/experiments/{exp.id}/results",
+                                         files={"file": ("decoded.yuv", io.BytesIO(brighten_luma(frames=3)))})
+        assert upload.status_code == 200
+        result = (await db.execute(select(ExperimentResult))).scalars().first()
+
+        metric = await self._measure(async_client, exp.id, ReferenceVideoId=reference_id,
+                                     DistortedResultId=result.id)
+
+        assert metric["Status"] == "COMPLETE"
+        assert metric["FrameCount"] == 3
+        assert metric["PsnrY"] == pytest.approx(10 * np.log10(255 ** 2 / 4))
+
+    async def test_layout_mismatch(self, async_client: AsyncClient, experiment):
+        exp = await experiment()
+        reference_id = await self._upload(async_client, make_y4m(frames=3))
+        distorted_id = await self._upload(async_client, make_y4m(width=16, height=8, frames=3),
+                                           resolution="16x8")
+
+        metric = await self._measure(async_client, exp.id, ReferenceVideoId=reference_id,
+                                     DistortedVideoId=distorted_id)
+
+        assert metric["Status"] == "ERROR"
+        assert "does not match the reference" in metric["Error"]
+        assert metric["PsnrY"] is None
+
+    async def test_invalid_requests(self, async_client: AsyncClient, db, experiment):
+        exp = await experiment()
+        video_id = await self._upload(async_client, make_y4m())
+
+        response = await async_client.post(f"/experiments/{exp.id}/quality", json={"ReferenceVideoId": video_id})
+        assert response.status_code == 422
+
+        response = await async_client.post(f"/experiments/{exp.id}/quality",
+                                           json={"ReferenceVideoId": video_id, "DistortedResultId": 12345})
+        assert response.status_code == 404
+
+        response = await async_client.post("/experiments/12345/quality",
+                                           json={"ReferenceVideoId": video_id, "DistortedVideoId": video_id})
+        assert response.status_code == 404
+
+        assert (await db.execute(select(QualityMetric))).scalars().first() is None
+
+    async def test_deleting_experiment_removes_metrics(self, async_client: AsyncClient, db, experiment,
+                                                      isolate_upload_dir):
+        exp = await experiment()
+        video_id = await self._upload(async_client, make_y4m())
+        await self._measure(async_client, exp.id, ReferenceVideoId=video_id, DistortedVideoId=video_id)
+
+        response = await ExperimentsService().delete_experiment(exp.id, exp.owner_id, db,
+                                                                Settings(uploads_directory=isolate_upload_dir))
+        assert response.status_code == 200
+
+        assert (await db.execute(select(QualityMetric))).scalars().first() is None
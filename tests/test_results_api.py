@@ -1,7 +1,11 @@
+import hashlib
 import io
 import os
+import subprocess
+import sys
+import textwrap
 import zipfile
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
 
 import pytest
@@ -14,7 +18,10 @@ from app.database.tables.experiments import Experiment as ExperimentTable, Exper
 from app.database.tables.results import ExperimentResult
 from app.models.experiment import ExperimentStatus
 from app.models.user import User
+from app.config.settings import Settings
 from app.routers.results import user_dependency
+from app.services.utility.archive_cache import ArchiveCache
+from app.services.utility.blobs import BlobStore
 
 
 @pytest.fixture(autouse=True)
@@ -39,7 +46,7 @@ async def create_experiment(db):
             description="Test upload results",
             owner_id=1,
             status=ExperimentStatus.COMPLETE,
-            created_at=datetime.now().isoformat()
+            created_at=datetime.now(timezone.utc)
         )
         db.add(exp)
         await db.commit()
@@ -71,9 +78,77 @@ class TestResultsRoutes:
         ).scalars().first()
 
         assert db_result.filename == "result1.txt"
+        assert db_result.size == len(file_content)
+        assert db_result.sha256 == hashlib.sha256(file_content).hexdigest()
 
-        expected_path = Path(isolate_upload_dir) / "results" / str(experiment.id) / "result1.txt"
-        assert expected_path.exists()
+        expected_path = BlobStore(Path(isolate_upload_dir) / "blobs").path_for(db_result.sha256)
+        assert db_result.path == str(expected_path)
+        assert expected_path.read_bytes() == file_content
+
+    async def test_upload_results_raw_body(self, async_client: AsyncClient, db, isolate_upload_dir, create_experiment):
+        experiment = await create_experiment()
+        content = b"raw result body" * 1000
+
+        response = await async_client.put(f"/experiments/{experiment.id}/results/raw.log", content=content,
+                                          headers={"Content-Type": "application/octet-stream"})
+
+        assert response.status_code == HTTP_200_OK
+        db_result = (await db.execute(select(ExperimentResult))).scalars().one()
+        assert db_result.sha256 == hashlib.sha256(content).hexdigest()
+        assert Path(db_result.path).read_bytes() == content
+
+        bad_name = await async_client.put(f"/experiments/{experiment.id}/results/%2E%2E", content=b"x")
+        assert bad_name.status_code == HTTP_400_BAD_REQUEST
+
+    async def test_identical_results_share_one_blob(self, async_client: AsyncClient, db, isolate_upload_dir,
+                                                    create_experiment):
+        experiment = await create_experiment()
+        content = b"identical log output"
+        sha256 = hashlib.sha256(content).hexdigest()
+
+        assert (await async_client.head(f"/blobs/{sha256}")).status_code == HTTP_404_NOT_FOUND
+        unknown = await async_client.post(f"/experiments/{experiment.id}/results/by-hash",
+                                          json={"filename": "b.log", "sha256": sha256})
+        assert unknown.status_code == HTTP_404_NOT_FOUND
+
+        await async_client.put(f"/experiments/{experiment.id}/results/a.log", content=content)
+        assert (await async_client.head(f"/blobs/{sha256}")).status_code == HTTP_200_OK
+        by_hash = await async_client.post(f"/experiments/{experiment.id}/results/by-hash",
+                                          json={"filename": "b.log", "sha256": sha256})
+        assert by_hash.status_code == HTTP_200_OK
+
+        results = (await db.execute(select(ExperimentResult))).scalars().all()
+        assert {r.filename for r in results} == {"a.log", "b.log"}
+        assert len({r.path for r in results}) == 1
+        blobs = [p for p in (Path(isolate_upload_dir) / "blobs").rglob("*") if p.is_file()]
+        assert len(blobs) == 1
+
+        archive = zipfile.ZipFile(io.BytesIO((await async_client.get(f"/experiments/{experiment.id}/results")).content))
+        assert archive.read("a.log") == archive.read("b.log") == content
+
+    async def test_other_users_results_cannot_be_attached_by_hash(self, app, async_client: AsyncClient, db,
+                                                                   isolate_upload_dir, create_experiment):
+        experiment = await create_experiment()
+        content = b"private log output"
+        sha256 = hashlib.sha256(content).hexdigest()
+        await async_client.put(f"/experiments/{experiment.id}/results/private.log", content=content)
+
+        other_user = User(id=3, username="other", password="fake", role="user", email="other@example.com",
+                          first_name="Other", last_name="User")
+        app.dependency_overrides[user_dependency] = lambda: other_user
+        other_experiment = ExperimentTable(experiment_name="Other", description="Another user's experiment",
+                                           owner_id=3, status=ExperimentStatus.COMPLETE)
+        db.add(other_experiment)
+        await db.commit()
+
+        assert (await async_client.head(f"/blobs/{sha256}")).status_code == HTTP_404_NOT_FOUND
+        by_hash = await async_client.post(f"/experiments/{other_experiment.id}/results/by-hash",
+                                          json={"filename": "stolen.log", "sha256": sha256})
+        assert by_hash.status_code == HTTP_404_NOT_FOUND
+
+        uploaded = await async_client.put(f"/experiments/{other_experiment.id}/results/own.log", content=content)
+        assert uploaded.status_code == HTTP_200_OK
+        assert (await async_client.head(f"/blobs/{sha256}")).status_code == HTTP_200_OK
 
     async def test_get_experiment_results(self, async_client: AsyncClient, db, isolate_upload_dir):
         exp = Experiment(
@@ -82,7 +157,7 @@ class TestResultsRoutes:
             description="Test get results",
             owner_id=1,
             status=ExperimentStatus.COMPLETE,
-            created_at=datetime.now().isoformat()
+            created_at=datetime.now(timezone.utc)
         )
         db.add(exp)
         await db.commit()
@@ -145,7 +220,7 @@ class TestResultsRoutes:
             description="No files here",
             owner_id=1,
             status=ExperimentStatus.COMPLETE,
-            created_at=datetime.now().isoformat()
+            created_at=datetime.now(timezone.utc)
         )
         db.add(exp)
         await db.commit()
@@ -154,3 +229,92 @@ class TestResultsRoutes:
         response = await async_client.get(f"/experiments/{exp.id}/results")
         assert response.status_code == HTTP_404_NOT_FOUND
         assert response.json()["detail"] == "No result files found for experiment"
+
+    async def test_repeat_download_served_from_archive_cache(self, async_client: AsyncClient, db, isolate_upload_dir,
+                                                             create_experiment):
+        experiment = await create_experiment()
+        await async_client.post(f"/experiments/{experiment.id}/results",
+                                files={"file": ("a.txt", io.BytesIO(b"first result"), "text/plain")})
+
+        first = await async_client.get(f"/experiments/{experiment.id}/results")
+        cached = list((Path(isolate_upload_dir) / "cache" / "results" / str(experiment.id)).glob("*.zip"))
+        second = await async_client.get(f"/experiments/{experiment.id}/results")
+
+        assert first.status_code == second.status_code == HTTP_200_OK
+        assert len(cached) == 1
+        assert second.content == first.content == cached[0].read_bytes()
+        assert second.headers["etag"] == first.headers["etag"]
+
+        not_modified = await async_client.get(f"/experiments/{experiment.id}/results",
+                                              headers={"If-None-Match": first.headers["etag"]})
+        assert not_modified.status_code == 304
+
+    async def test_upload_invalidates_archive_cache(self, async_client: AsyncClient, db, isolate_upload_dir,
+                                                    create_experiment):
+        experiment = await create_experiment()
+        await async_client.post(f"/experiments/{experiment.id}/results",
+                                files={"file": ("a.txt", io.BytesIO(b"first result"), "text/plain")})
+        first = await async_client.get(f"/experiments/{experiment.id}/results")
+
+        await async_client.post(f"/experiments/{experiment.id}/results",
+                                files={"file": ("b.txt", io.BytesIO(b"second result"), "text/plain")})
+        assert not (Path(isolate_upload_dir) / "cache" / "results" / str(experiment.id)).exists()
+
+        second = await async_client.get(f"/experiments/{experiment.id}/results",
+                                        headers={"If-None-Match": first.headers["etag"]})
+        assert second.status_code == HTTP_200_OK
+        with zipfile.ZipFile(io.BytesIO(second.content)) as z:
+            assert set(z.namelist()) == {"a.txt", "b.txt"}
+
+
+def test_archive_cache_evicts_least_recently_used(tmp_path):
+    cache = ArchiveCache.for_settings(Settings(uploads_directory=str(tmp_path), result_archive_cache_bytes=20))
+    for experiment_id, age in ((1, 300), (2, 200), (3, 100)):
+        directory = cache.directory / str(experiment_id)
+        directory.mkdir(parents=True)
+        archive = directory / "digest.zip"
+        archive.write_bytes(b"x" * 10)
+        os.utime(archive, (0, 1_000_000 - age))
+
+    cache.lookup(1, "digest")
+    cache.evict()
+
+    assert cache.lookup(1, "digest") is not None
+    assert cache.lookup(2, "digest") is None
+    assert cache.lookup(3, "digest") is not None
+
+
+ARCHIVE_RSS_SCRIPT = textwrap.dedent("""
+    import asyncio, os, resource, sys
+    from app.services.utility.zip_stream import stream_zip
+
+    directory, file_count, file_mb = sys.argv[1], int(sys.argv[2]), int(sys.argv[3])
+    entries = []
+    for i in range(file_count):
+        path = os.path.join(directory, f"result{i}.bin")
+        with open(path, "wb") as f:
+            for _ in range(file_mb):
+                f.write(os.urandom(1024 * 1024))
+        entries.append((path, f"result{i}.bin"))
+
+    async def consume():
+        total = 0
+        async for chunk in stream_zip(entries):
+            total += len(chunk)
+        return total
+
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    total = asyncio.run(consume())
+    after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(total, after - before)
+""")
+
+
+def test_results_archive_streams_in_bounded_memory(tmp_path):
+    """Peak RSS while streaming a 96 MiB incompressible result set must stay far below the archive size."""
+    output = subprocess.run([sys.executable, "-c", ARCHIVE_RSS_SCRIPT, str(tmp_path), "3", "32"],
+                            cwd=Path(__file__).resolve().parent.parent, capture_output=True, text=True, check=True)
+    archive_bytes, rss_growth_kib = map(int, output.stdout.split())
+
+    assert archive_bytes > 96 * 1024 * 1024
+    assert rss_growth_kib < 24 * 1024
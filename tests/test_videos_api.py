@@ -1,14 +1,32 @@
+import asyncio
 import pytest
+import hashlib
 import io
 import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import cv2
+import numpy as np
 from httpx import AsyncClient
+from sqlalchemy import select
+
+from app.config.settings import Settings, get_settings
+from app.database.tables.uploads import UploadSession
+from app.database.tables.videos import InputVideo
+from app.services.uploads import VideoUploadsService
+from app.services.utility.blobs import BlobStore
+from app.services.utility.frame_cache import frame_cache
+from app.services.utility.workers import analysis_pool
+from tests.utility.video_samples import make_frames, make_y4m, make_yuv
 
 
 @pytest.mark.asyncio
 class TestVideosRoutes:
 
     async def test_create_video_success(self, async_client: AsyncClient, test_video_data):
-        file = io.BytesIO(b"YUV4MPEG2 dummy content")
+        content = make_y4m()
+        file = io.BytesIO(content)
 
         response = await async_client.post(
             "/infrastructure/videos",
@@ -21,6 +39,78 @@ class TestVideosRoutes:
 
         assert data["title"] == test_video_data["title"]
         assert data["format"] == test_video_data["format"]
+        assert data["size"] == len(content)
+        assert data["sha256"] == hashlib.sha256(content).hexdigest()
+        assert datetime.fromisoformat(data["createdDate"]).utcoffset() == timedelta(0)
+
+    async def test_create_video_raw_body(self, async_client: AsyncClient, test_video_data):
+        content = make_y4m(frames=5)
+
+        response = await async_client.put("/infrastructure/videos", params=test_video_data, content=content,
+                                          headers={"Content-Type": "application/octet-stream"})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["title"] == test_video_data["title"]
+        assert data["sha256"] == hashlib.sha256(content).hexdigest()
+
+        download = await async_client.get(f"/infrastructure/videos/{data['id']}")
+        assert download.content == content
+
+    async def test_create_video_indexes_y4m_frames(self, async_client: AsyncClient, test_video_data):
+        content = make_y4m(width=16, height=8, frames=4, frame_rate="25:1")
+        metadata = {"title": "probed", "format": "y4m", "description": "header only"}
+
+        response = await async_client.put("/infrastructure/videos", params=metadata, content=content)
+
+        assert response.status_code == 200
+        data = response.json()
+        header_length = content.index(b"\n") + 1
+        assert (data["resolution"], data["frameRate"], data["bitDepth"]) == ("16x8", 25, 8)
+        assert (data["frameCount"], data["chromaFormat"]) == (4, "420")
+        assert data["frameOffset"] == header_length + len(b"FRAME\n")
+        assert data["frameStride"] == len(b"FRAME\n") + 16 * 8 * 3 // 2
+
+    async def test_create_video_indexes_irregular_frame_headers(self, async_client: AsyncClient, db,
+                                                                test_video_data):
+        headers = [b"FRAME\n", b"FRAME Ib\n", b"FRAME\n"]
+        content = make_y4m(frames=3, frame_headers=headers)
+
+        response = await async_client.put("/infrastructure/videos", params=test_video_data, content=content)
+
+        assert response.status_code == 200
+        assert response.json()["frameStride"] is None
+        frame_index = await db.scalar(select(InputVideo.frameIndex).where(InputVideo.id == response.json()["id"]))
+        frame_size = 16 * 16 * 3 // 2
+        assert [content[offset:offset + frame_size] for offset in frame_index] == make_frames(frames=3)
+
+    async def test_create_raw_yuv_derives_frame_count(self, async_client: AsyncClient, test_video_data):
+        params = {**test_video_data, "format": "yuv", "bitDepth": 10}
+
+        response = await async_client.put("/infrastructure/videos", params=params,
+                                          content=make_yuv(frames=7, bit_depth=10))
+
+        assert response.status_code == 200
+        assert (response.json()["frameCount"], response.json()["frameStride"]) == (7, 16 * 16 * 3)
+
+    async def test_create_video_rejects_truncated_or_inconsistent_files(self, async_client: AsyncClient,
+                                                                        isolate_upload_dir, test_video_data):
+        truncated = await async_client.put("/infrastructure/videos", params=test_video_data,
+                                           content=make_y4m(frames=3)[:-10])
+        wrong_resolution = await async_client.put("/infrastructure/videos",
+                                                  params={**test_video_data, "resolution": "32x16"},
+                                                  content=make_y4m())
+        partial_yuv = await async_client.put("/infrastructure/videos", params={**test_video_data, "format": "yuv"},
+                                             content=make_yuv()[:-1])
+        not_y4m = await async_client.put("/infrastructure/videos", params=test_video_data, content=make_yuv())
+
+        assert truncated.status_code == 422
+        assert "truncated" in truncated.json()["detail"]
+        assert wrong_resolution.status_code == 422
+        assert "16x16" in wrong_resolution.json()["detail"]
+        assert partial_yuv.status_code == 422
+        assert not_y4m.status_code == 422
+        assert not [p for p in (Path(isolate_upload_dir) / "blobs").rglob("*") if p.is_file()]
 
     async def test_create_video_invalid_bit_depth(self, async_client: AsyncClient, test_video_data):
         bad_data = test_video_data.copy()
@@ -60,12 +150,243 @@ class TestVideosRoutes:
         assert response.status_code == 200
         assert response.headers["content-type"] in ["video/x-yuv4mpeg", "application/octet-stream"]
 
+    async def test_get_video_byte_range(self, async_client: AsyncClient, test_video_data):
+        content = make_y4m(frames=3)
+        created = await async_client.put("/infrastructure/videos", params=test_video_data, content=content)
+
+        response = await async_client.get(f"/infrastructure/videos/{created.json()['id']}",
+                                          headers={"Range": "bytes=100-199"})
+
+        assert response.status_code == 206
+        assert response.headers["content-range"] == f"bytes 100-199/{len(content)}"
+        assert response.content == content[100:200]
+
+    async def test_get_video_offloaded_to_proxy(self, app, async_client: AsyncClient, isolate_upload_dir,
+                                               test_video_data):
+        app.dependency_overrides[get_settings] = lambda: Settings(uploads_directory=isolate_upload_dir,
+                                                                  download_offload="x-accel-redirect")
+        content = make_y4m(frames=3)
+        created = await async_client.put("/infrastructure/videos", params=test_video_data, content=content)
+
+        response = await async_client.get(f"/infrastructure/videos/{created.json()['id']}")
+
+        assert response.status_code == 200
+        assert response.content == b""
+        sha256 = hashlib.sha256(content).hexdigest()
+        assert response.headers["x-accel-redirect"].startswith("/protected-uploads/blobs/")
+        assert response.headers["x-accel-redirect"].endswith(sha256)
+        assert response.headers["content-type"] == "video/x-yuv4mpeg"
+
     async def test_get_videos_list(self, async_client: AsyncClient):
         response = await async_client.get("/infrastructure/videos")
 
         assert response.status_code == 200
         assert isinstance(response.json(), list)
 
+    async def test_list_videos_in_pages(self, async_client: AsyncClient, db):
+        si_values = [3.0, 1.0, None, 3.0, 2.0, None, 1.0]
+        db.add_all(InputVideo(id=f"video-{n}", title=f"video {n}", siMax=si) for n, si in enumerate(si_values))
+        await db.commit()
+
+        pages, params = [], {"sort": "-siMax", "limit": 2}
+        while True:
+            response = await async_client.get("/infrastructure/videos", params=params)
+            assert response.status_code == 200
+            pages.append([video["id"] for video in response.json()])
+            if "x-next-cursor" not in response.headers:
+                break
+            params["cursor"] = response.headers["x-next-cursor"]
+
+        assert pages == [["video-0", "video-3"], ["video-4", "video-1"], ["video-6", "video-2"], ["video-5"]]
+        reused = await async_client.get("/infrastructure/videos", params={"sort": "title", "cursor": params["cursor"]})
+        assert reused.status_code == 400
+        assert (await async_client.get("/infrastructure/videos", params={"cursor": "garbage"})).status_code == 400
+        assert (await async_client.get("/infrastructure/videos", params={"limit": 5000})).status_code == 422
+
+    async def test_list_videos_newest_first(self, async_client: AsyncClient, db):
+        db.add_all(InputVideo(id=f"video-{n}", title=f"video {n}",
+                              createdDate=datetime(2025, 1, day, tzinfo=timezone.utc))
+                   for n, day in enumerate((2, 3, 1)))
+        await db.commit()
+
+        first = await async_client.get("/infrastructure/videos", params={"sort": "-createdDate", "limit": 2})
+        rest = await async_client.get("/infrastructure/videos", params={"sort": "-createdDate", "limit": 2,
+                                                                          "cursor": first.headers["x-next-cursor"]})
+
+        assert rest.status_code == 200
+        assert [video["id"] for video in first.json() + rest.json()] == ["video-1", "video-0", "video-2"]
+
+    async def test_upload_computes_siti(self, async_client: AsyncClient, test_video_data):
+        flat = await async_client.put("/infrastructure/videos", params={**test_video_data, "title": "flat"},
+                                      content=make_y4m(frames=1))
+        rng = np.random.default_rng(0)
+        noise = rng.integers(0, 256, 4 * (16 * 16 + 2 * 8 * 8), dtype=np.uint8).tobytes()
+        busy = await async_client.put("/infrastructure/videos",
+                                      params={**test_video_data, "title": "busy", "format": "yuv"}, content=noise)
+
+        # analysis runs in the background, which the test client waits for
+        analysis = (await async_client.get(f"/infrastructure/videos/{busy.json()['id']}/analysis")).json()
+        assert analysis["analysisStatus"] == "COMPLETE"
+        assert (len(analysis["si"]), len(analysis["ti"])) == (4, 3)
+        assert analysis["siMax"] == max(analysis["si"]) > 0
+        assert analysis["tiMean"] == pytest.approx(sum(analysis["ti"]) / 3)
+
+        flat_analysis = (await async_client.get(f"/infrastructure/videos/{flat.json()['id']}/analysis")).json()
+        assert flat_analysis["ti"] == [] and flat_analysis["tiMax"] is None
+
+        listed = (await async_client.get("/infrastructure/videos", params={"sort": "-siMax"})).json()
+        assert [video["title"] for video in listed] == ["busy", "flat"]
+        assert listed[0]["siMax"] == analysis["siMax"]
+
+        filtered = await async_client.get("/infrastructure/videos", params={"minSi": analysis["siMax"] - 1})
+        assert [video["title"] for video in filtered.json()] == ["busy"]
+        filtered = await async_client.get("/infrastructure/videos", params={"maxTi": 0})
+        assert filtered.json() == []
+
+        assert (await async_client.get("/infrastructure/videos", params={"sort": "path"})).status_code == 400
+
+    async def test_reanalyze_legacy_video(self, async_client: AsyncClient, db, video_factory, test_video_data):
+        created = await video_factory(**test_video_data)
+        analysis = (await async_client.get(f"/infrastructure/videos/{created.id}/analysis")).json()
+        assert analysis["analysisStatus"] == "PENDING" and analysis["si"] == []
+
+        response = await async_client.post(f"/infrastructure/videos/{created.id}/analysis")
+        assert response.status_code == 202
+
+        analysis = (await async_client.get(f"/infrastructure/videos/{created.id}/analysis")).json()
+        assert analysis["analysisStatus"] == "COMPLETE"
+        assert len(analysis["si"]) == 3
+        assert (await async_client.post("/infrastructure/videos/missing/analysis")).status_code == 404
+
+    async def test_upload_renders_thumbnails(self, async_client: AsyncClient, isolate_upload_dir,
+                                             test_video_data):
+        created = await async_client.put("/infrastructure/videos", params={**test_video_data, "resolution": "16x8"},
+                                         content=make_y4m(width=16, height=8, frames=20))
+        video_id = created.json()["id"]
+        cache_directory = Path(isolate_upload_dir) / "cache" / "thumbnails" / video_id
+        assert sorted(p.name for p in cache_directory.iterdir()) == ["0.jpg", "1.jpg", "2.jpg", "3.jpg", "4.jpg",
+                                                                     "5.jpg", "6.jpg", "7.jpg", "contact.jpg"]
+
+        thumbnail = await async_client.get(f"/infrastructure/videos/{video_id}/thumbnails/7")
+        assert thumbnail.status_code == 200
+        assert thumbnail.headers["content-type"] == "image/jpeg"
+        assert "immutable" in thumbnail.headers["cache-control"]
+        assert cv2.imdecode(np.frombuffer(thumbnail.content, np.uint8), cv2.IMREAD_COLOR).shape == (8, 16, 3)
+        assert (await async_client.get(f"/infrastructure/videos/{video_id}/thumbnails/8")).status_code == 404
+
+        sheet = await async_client.get(f"/infrastructure/videos/{video_id}/contact-sheet")
+        assert cv2.imdecode(np.frombuffer(sheet.content, np.uint8), cv2.IMREAD_COLOR).shape == (16, 64, 3)
+
+        await async_client.delete(f"/infrastructure/videos/{video_id}")
+        assert not cache_directory.exists()
+
+    async def test_contact_sheet_rendered_on_demand(self, async_client: AsyncClient, video_factory,
+                                                    test_video_data):
+        created = await video_factory(**test_video_data)
+
+        sheet = await async_client.get(f"/infrastructure/videos/{created.id}/contact-sheet")
+
+        assert sheet.status_code == 200
+        # three frames, so a single row of three thumbnails
+        assert cv2.imdecode(np.frombuffer(sheet.content, np.uint8), cv2.IMREAD_COLOR).shape == (16, 48, 3)
+        assert (await async_client.get("/infrastructure/videos/missing/contact-sheet")).status_code == 404
+
+    async def test_concurrent_preview_requests_share_one_render(self, async_client: AsyncClient, video_factory,
+                                                                test_video_data, monkeypatch):
+        created = await video_factory(**test_video_data)
+        renders = []
+        run = analysis_pool.run
+
+        async def counting_run(fn, *args):
+            renders.append(fn.__name__)
+            await asyncio.sleep(0.1)
+            return await run(fn, *args)
+
+        monkeypatch.setattr(analysis_pool, "run", counting_run)
+
+        responses = await asyncio.gather(
+            async_client.get(f"/infrastructure/videos/{created.id}/contact-sheet"),
+            async_client.get(f"/infrastructure/videos/{created.id}/thumbnails/0"))
+
+        assert [response.status_code for response in responses] == [200, 200]
+        assert renders == ["render_previews"]
+        assert responses[1].headers["cache-control"] == "private, max-age=31536000, immutable"
+
+    async def test_generate_proxy(self, async_client: AsyncClient, test_video_data):
+        source = await async_client.put("/infrastructure/videos",
+                                        params={**test_video_data, "format": "yuv", "bitDepth": 10},
+                                        content=make_yuv(frames=5, bit_depth=10))
+        source_id = source.json()["id"]
+
+        job = await async_client.post(f"/infrastructure/videos/{source_id}/proxies", json={"scale": 2, "bitDepth": 8})
+        assert job.status_code == 202
+        job = (await async_client.get(f"/infrastructure/videos/{source_id}/proxies/jobs/{job.json()['id']}")).json()
+        assert (job["status"], job["framesDone"], job["frameCount"]) == ("COMPLETE", 5, 5)
+
+        proxies = (await async_client.get(f"/infrastructure/videos/{source_id}/proxies")).json()
+        assert [proxy["id"] for proxy in proxies] == [job["proxyId"]]
+        assert (proxies[0]["resolution"], proxies[0]["bitDepth"], proxies[0]["format"]) == ("8x8", 8, "y4m")
+        assert (proxies[0]["parentId"], proxies[0]["proxyScale"]) == (source_id, 2)
+
+        # each proxy sample is the mean of a 2x2 block, rounded from 10 to 8 bits
+        download = await async_client.get(f"/infrastructure/videos/{job['proxyId']}", params={"format": "yuv"})
+        expected = []
+        for frame in make_frames(frames=5, bit_depth=10):
+            samples = np.frombuffer(frame, dtype="<u2")
+            planes = (samples[:256].reshape(16, 16), samples[256:320].reshape(8, 8), samples[320:].reshape(8, 8))
+            for plane in planes:
+                height, width = plane.shape
+                means = plane.reshape(height // 2, 2, width // 2, 2).mean(axis=(1, 3))
+                expected.append(np.floor(means / 4 + 0.5).astype(np.uint8).tobytes())
+        assert download.content == b"".join(expected)
+
+        await async_client.delete(f"/infrastructure/videos/{source_id}")
+        assert (await async_client.get(f"/infrastructure/videos/{job['proxyId']}")).status_code == 404
+
+    async def test_proxy_cannot_raise_bit_depth(self, async_client: AsyncClient, video_factory, test_video_data):
+        created = await video_factory(**test_video_data)
+
+        response = await async_client.post(f"/infrastructure/videos/{created.id}/proxies", json={"bitDepth": 10})
+        assert response.status_code == 400
+        response = await async_client.post(f"/infrastructure/videos/{created.id}/proxies", json={"scale": 3})
+        assert response.status_code == 422
+
+    async def test_duplicate_uploads_are_flagged(self, async_client: AsyncClient, test_video_data):
+        first = await async_client.put("/infrastructure/videos", params=test_video_data,
+                                       content=make_y4m(frames=6))
+        assert first.json()["duplicateOf"] is None
+
+        # the same frames in another container under another title
+        copy = await async_client.put("/infrastructure/videos",
+                                      params={**test_video_data, "title": "copy", "format": "yuv"},
+                                      content=make_yuv(frames=6))
+        assert copy.status_code == 200
+        assert copy.json()["duplicateOf"] == first.json()["id"]
+
+        noise = np.random.default_rng(0).integers(0, 256, 6 * 384, dtype=np.uint8).tobytes()
+        other = await async_client.put("/infrastructure/videos",
+                                       params={**test_video_data, "title": "other", "format": "yuv"}, content=noise)
+        assert other.json()["duplicateOf"] is None
+
+        await async_client.delete(f"/infrastructure/videos/{first.json()['id']}")
+        assert (await async_client.get("/infrastructure/videos", params={"sort": "title"})).json()[0]["duplicateOf"] \
+            is None
+
+    async def test_duplicate_uploads_can_be_rejected(self, app, async_client: AsyncClient, isolate_upload_dir,
+                                                     test_video_data):
+        app.dependency_overrides[get_settings] = lambda: Settings(uploads_directory=isolate_upload_dir,
+                                                                  duplicate_policy="reject")
+        first = await async_client.put("/infrastructure/videos", params=test_video_data, content=make_y4m(frames=6))
+
+        content = make_yuv(frames=6)
+        copy = await async_client.put("/infrastructure/videos", params={**test_video_data, "format": "yuv"},
+                                      content=content)
+
+        assert copy.status_code == 409
+        assert first.json()["id"] in copy.json()["detail"]
+        blob = BlobStore(Path(isolate_upload_dir) / "blobs").path_for(hashlib.sha256(content).hexdigest())
+        assert not blob.exists()
+
     async def test_delete_video(self, async_client: AsyncClient, video_factory, test_video_data):
         created = await video_factory(**test_video_data)
 
@@ -74,6 +395,142 @@ class TestVideosRoutes:
         assert response.status_code == 200
         assert response.json()["message"] == "Video deleted"
 
+    async def test_identical_videos_share_one_blob(self, async_client: AsyncClient, isolate_upload_dir,
+                                                   test_video_data):
+        content = make_y4m(frames=2)
+        sha256 = hashlib.sha256(content).hexdigest()
+        blob_path = BlobStore(Path(isolate_upload_dir) / "blobs").path_for(sha256)
+
+        first = await async_client.put("/infrastructure/videos", params=test_video_data, content=content)
+        second = await async_client.put("/infrastructure/videos", params={**test_video_data, "title": "copy"},
+                                        content=content)
+        assert first.json()["path"] == second.json()["path"] == str(blob_path)
+
+        await async_client.delete(f"/infrastructure/videos/{first.json()['id']}")
+        assert blob_path.exists()
+        assert (await async_client.get(f"/infrastructure/videos/{second.json()['id']}")).content == content
+
+        await async_client.delete(f"/infrastructure/videos/{second.json()['id']}")
+        assert not blob_path.exists()
+
+    async def test_create_video_by_hash_skips_upload(self, async_client: AsyncClient, test_video_data):
+        content = make_y4m(frames=4)
+        sha256 = hashlib.sha256(content).hexdigest()
+
+        unknown = await async_client.post("/infrastructure/videos/by-hash", json={**test_video_data, "sha256": sha256})
+        assert unknown.status_code == 404
+
+        await async_client.put("/infrastructure/videos", params=test_video_data, content=content)
+        assert (await async_client.head(f"/blobs/{sha256}")).status_code == 200
+
+        response = await async_client.post("/infrastructure/videos/by-hash",
+                                           json={**test_video_data, "title": "again", "sha256": sha256})
+        assert response.status_code == 200
+        assert response.json()["title"] == "again"
+        assert response.json()["size"] == len(content)
+        assert (await async_client.get(f"/infrastructure/videos/{response.json()['id']}")).content == content
+
+    async def test_get_video_frame_renders_requested_frame(self, async_client: AsyncClient, test_video_data):
+        created = await async_client.put("/infrastructure/videos", params=test_video_data,
+                                         content=make_y4m(frames=10))
+        video_id = created.json()["id"]
+        frame_cache.clear()
+
+        response = await async_client.get(f"/infrastructure/videos/{video_id}/frames/7")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "image/png"
+        image = cv2.imdecode(np.frombuffer(response.content, np.uint8), cv2.IMREAD_COLOR)
+        y, u, v = np.split(np.frombuffer(make_frames(frames=8)[7], np.uint8), [256, 320])
+        expected = 1.164 * (y.reshape(16, 16).astype(float) - 16) + 1.596 * (v[0] - 128.0)
+        assert np.abs(image[:, :, 2] - np.clip(expected, 0, 255)).max() <= 2
+
+        jpeg = await async_client.get(f"/infrastructure/videos/{video_id}/frames/7", params={"format": "jpeg"})
+        assert jpeg.headers["content-type"] == "image/jpeg"
+        assert (await async_client.get(f"/infrastructure/videos/{video_id}/frames/7")).content == response.content
+        assert frame_cache.stats()["hits"] == 1
+        assert (await async_client.get(f"/infrastructure/videos/{video_id}/frames/10")).status_code == 404
+
+    async def test_get_video_frame_converts_ten_bit_yuv(self, async_client: AsyncClient, test_video_data):
+        params = {**test_video_data, "format": "yuv", "bitDepth": 10}
+        created = await async_client.put("/infrastructure/videos", params=params,
+                                         content=make_yuv(width=16, height=16, frames=3, bit_depth=10))
+
+        response = await async_client.get(f"/infrastructure/videos/{created.json()['id']}/frames/2")
+
+        assert response.status_code == 200
+        image = cv2.imdecode(np.frombuffer(response.content, np.uint8), cv2.IMREAD_COLOR)
+        assert image.shape == (16, 16, 3)
+
+    async def test_get_video_frame_indexes_legacy_videos(self, async_client: AsyncClient, db, video_factory,
+                                                        test_video_data):
+        created = await video_factory(**test_video_data)
+        video = await db.get(InputVideo, created.id)
+        video.frameCount = video.frameOffset = video.frameStride = None
+        await db.commit()
+
+        response = await async_client.get(f"/infrastructure/videos/{created.id}/frames/2")
+
+        assert response.status_code == 200
+        await db.refresh(video)
+        assert video.frameCount == 3
+
+    async def test_get_video_clip_streams_frame_range(self, async_client: AsyncClient, test_video_data):
+        content = make_y4m(frames=10)
+        created = await async_client.put("/infrastructure/videos", params=test_video_data, content=content)
+        video_id = created.json()["id"]
+        frames = make_frames(frames=10)
+
+        clip = await async_client.get(f"/infrastructure/videos/{video_id}/clip",
+                                      params={"start": 2, "end": 8, "step": 2})
+        raw = await async_client.get(f"/infrastructure/videos/{video_id}/clip", params={"start": 8, "format": "yuv"})
+
+        assert clip.status_code == 200
+        assert clip.headers["content-type"] == "video/x-yuv4mpeg"
+        assert int(clip.headers["content-length"]) == len(clip.content)
+        assert clip.content == content[:content.index(b"\n") + 1] + b"".join(b"FRAME\n" + frames[n] for n in (2, 4, 6))
+        assert raw.content == frames[8] + frames[9]
+        invalid = await async_client.get(f"/infrastructure/videos/{video_id}/clip", params={"start": 5, "end": 11})
+        assert invalid.status_code == 400
+
+    async def test_get_video_clip_keeps_frame_parameters(self, async_client: AsyncClient, test_video_data):
+        headers = [b"FRAME\n", b"FRAME Ib\n", b"FRAME Xkey=1\n", b"FRAME\n"]
+        content = make_y4m(frames=4, frame_headers=headers)
+        created = await async_client.put("/infrastructure/videos", params=test_video_data, content=content)
+        frames = make_frames(frames=4)
+
+        clip = await async_client.get(f"/infrastructure/videos/{created.json()['id']}/clip",
+                                      params={"start": 1, "end": 3})
+
+        assert clip.content.split(b"\n", 1)[1] == headers[1] + frames[1] + headers[2] + frames[2]
+
+    async def test_get_video_clip_wraps_raw_yuv_in_y4m(self, async_client: AsyncClient, test_video_data):
+        params = {**test_video_data, "format": "yuv", "resolution": "1024x1024"}
+        frames = make_frames(width=1024, height=1024, frames=3)
+        created = await async_client.put("/infrastructure/videos", params=params, content=b"".join(frames))
+
+        clip = await async_client.get(f"/infrastructure/videos/{created.json()['id']}/clip",
+                                      params={"start": 1, "format": "y4m"})
+
+        assert clip.content.startswith(b"YUV4MPEG2 W1024 H1024 F30:1 Ip A1:1 C420jpeg\n")
+        assert clip.content.split(b"\n", 1)[1] == b"FRAME\n" + frames[1] + b"FRAME\n" + frames[2]
+
+    async def test_get_video_converts_container_format(self, async_client: AsyncClient, test_video_data):
+        frames = make_frames(frames=4)
+        y4m = await async_client.put("/infrastructure/videos", params=test_video_data, content=make_y4m(frames=4))
+        yuv = await async_client.put("/infrastructure/videos", params={**test_video_data, "format": "yuv"},
+                                     content=make_yuv(frames=4))
+
+        stripped = await async_client.get(f"/infrastructure/videos/{y4m.json()['id']}", params={"format": "yuv"})
+        wrapped = await async_client.get(f"/infrastructure/videos/{yuv.json()['id']}", params={"format": "y4m"})
+        unchanged = await async_client.get(f"/infrastructure/videos/{y4m.json()['id']}", params={"format": "y4m"})
+
+        assert stripped.headers["content-type"] == "application/octet-stream"
+        assert stripped.content == b"".join(frames)
+        assert wrapped.headers["content-type"] == "video/x-yuv4mpeg"
+        assert wrapped.content == make_y4m(frames=4)
+        assert unchanged.content == make_y4m(frames=4)
+
     async def test_get_nonexistent_video(self, async_client: AsyncClient):
         response = await async_client.get(f"/infrastructure/videos/{uuid.uuid4()}")
 
@@ -83,3 +540,105 @@ class TestVideosRoutes:
         response = await async_client.delete(f"/infrastructure/videos/{uuid.uuid4()}")
 
         assert response.status_code == 404
+
+    async def test_resumable_upload_round_trip(self, async_client: AsyncClient, test_video_data):
+        content = make_y4m(frames=6)
+        create = await async_client.post("/infrastructure/videos/uploads",
+                                         json={**test_video_data, "length": len(content)})
+        assert create.status_code == 201
+        location = create.headers["location"]
+
+        first = await async_client.patch(location, content=content[:300], headers={"Upload-Offset": "0"})
+        assert first.status_code == 204
+        assert first.headers["upload-offset"] == "300"
+
+        head = await async_client.head(location)
+        assert head.headers["upload-offset"] == "300"
+        assert head.headers["upload-length"] == str(len(content))
+
+        incomplete = await async_client.post(f"{location}/complete")
+        assert incomplete.status_code == 409
+
+        second = await async_client.patch(location, content=content[300:], headers={"Upload-Offset": "300"})
+        assert second.headers["upload-offset"] == str(len(content))
+
+        complete = await async_client.post(f"{location}/complete")
+        assert complete.status_code == 200
+        video = complete.json()
+        assert video["id"] == create.json()["id"]
+        assert video["sha256"] == hashlib.sha256(content).hexdigest()
+
+        download = await async_client.get(f"/infrastructure/videos/{video['id']}")
+        assert download.content == content
+        assert (await async_client.get(location)).status_code == 404
+
+    async def test_resumable_upload_hashes_chunks_as_they_arrive(self, async_client: AsyncClient, monkeypatch,
+                                                                 test_video_data):
+        content = make_y4m(frames=6)
+        location = (await async_client.post("/infrastructure/videos/uploads",
+                                            json={**test_video_data, "length": len(content)})).headers["location"]
+        await async_client.patch(location, content=content[:300], headers={"Upload-Offset": "0"})
+        await async_client.patch(location, content=content[300:], headers={"Upload-Offset": "300"})
+
+        def reread(path):
+            raise AssertionError("the upload was read again to hash it")
+
+        monkeypatch.setattr("app.services.uploads.checksum_file", reread)
+        complete = await async_client.post(f"{location}/complete")
+
+        assert complete.status_code == 200
+        assert complete.json()["sha256"] == hashlib.sha256(content).hexdigest()
+
+    async def test_resumable_upload_rejects_concurrent_chunks(self, async_client: AsyncClient, test_video_data):
+        content = make_y4m(frames=6)
+        location = (await async_client.post("/infrastructure/videos/uploads",
+                                            json={**test_video_data, "length": len(content)})).headers["location"]
+        started, release = asyncio.Event(), asyncio.Event()
+
+        async def slow_body():
+            yield content[:100]
+            started.set()
+            await release.wait()
+            yield content[100:200]
+
+        first = asyncio.create_task(async_client.patch(location, content=slow_body(), headers={"Upload-Offset": "0"}))
+        await started.wait()
+        retry = await async_client.patch(location, content=content[:200], headers={"Upload-Offset": "0"})
+        assert retry.status_code == 423
+        assert (await async_client.post(f"{location}/complete")).status_code == 423
+
+        release.set()
+        assert (await first).headers["upload-offset"] == "200"
+        rest = await async_client.patch(location, content=content[200:], headers={"Upload-Offset": "200"})
+        assert rest.headers["upload-offset"] == str(len(content))
+        complete = await async_client.post(f"{location}/complete")
+        assert complete.json()["sha256"] == hashlib.sha256(content).hexdigest()
+
+    async def test_resumable_upload_rejects_wrong_offset_and_overflow(self, async_client: AsyncClient, db,
+                                                                      test_video_data):
+        create = await async_client.post("/infrastructure/videos/uploads", json={**test_video_data, "length": 10})
+        location = create.headers["location"]
+        partial_path = Path((await db.get(UploadSession, create.json()["id"])).path)
+
+        mismatch = await async_client.patch(location, content=b"abc", headers={"Upload-Offset": "5"})
+        assert mismatch.status_code == 409
+
+        overflow = await async_client.patch(location, content=b"x" * 11, headers={"Upload-Offset": "0"})
+        assert overflow.status_code == 413
+        assert (await async_client.head(location)).headers["upload-offset"] == "0"
+
+        cancel = await async_client.delete(location)
+        assert cancel.status_code == 204
+        assert not partial_path.exists()
+
+    async def test_abandoned_uploads_are_collected(self, async_client: AsyncClient, db, test_video_data):
+        create = await async_client.post("/infrastructure/videos/uploads", json={**test_video_data, "length": 10})
+        session = await db.get(UploadSession, create.json()["id"])
+        session.last_activity = datetime.now(timezone.utc) - timedelta(days=2)
+        await db.commit()
+
+        collected = await VideoUploadsService().collect_abandoned_uploads(db, Settings())
+
+        assert collected == 1
+        assert not Path(session.path).exists()
+        assert (await async_client.head(create.headers["location"])).status_code == 404
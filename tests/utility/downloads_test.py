@@ -0,0 +1,80 @@
+import asyncio
+import tempfile
+import unittest
+from pathlib import Path
+
+from app.services.utility.downloads import PATH_SEND, ZEROCOPY_SEND, SendfileResponse, parse_byte_range
+
+
+class Test_downloads(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / "video.yuv"
+        self.path.write_bytes(bytes(range(256)) * 16)
+
+    def serve(self, headers, extension=ZEROCOPY_SEND, method="GET"):
+        scope = {"type": "http", "method": method, "headers": headers, "extensions": {extension: {}}}
+        messages = []
+
+        async def send(message):
+            if message["type"] == ZEROCOPY_SEND:
+                file = message["file"]
+                file.seek(message.get("offset", 0))
+                message = {**message, "body": file.read(message.get("count", -1))}
+            messages.append(message)
+
+        asyncio.run(SendfileResponse(self.path, media_type="application/octet-stream")(scope, None, send))
+        return messages
+
+    def test_zerocopy_send_of_whole_file_and_range(self):
+        start, body = self.serve([])
+        self.assertEqual(start["status"], 200)
+        self.assertEqual(body["type"], ZEROCOPY_SEND)
+        self.assertEqual(body["body"], self.path.read_bytes())
+
+        start, body = self.serve([(b"range", b"bytes=1000-1099")])
+        self.assertEqual(start["status"], 206)
+        self.assertIn((b"content-range", b"bytes 1000-1099/4096"), start["headers"])
+        self.assertEqual((body["offset"], body["count"]), (1000, 100))
+        self.assertEqual(body["body"], self.path.read_bytes()[1000:1100])
+
+        start, body = self.serve([(b"range", b"bytes=-96")])
+        self.assertIn((b"content-range", b"bytes 4000-4095/4096"), start["headers"])
+        self.assertEqual(body["body"], self.path.read_bytes()[4000:])
+
+    def test_path_send_of_whole_file_reads_ranges(self):
+        start, body = self.serve([], extension=PATH_SEND)
+        self.assertEqual(start["status"], 200)
+        self.assertEqual(body, {"type": PATH_SEND, "path": str(self.path)})
+
+        start, body = self.serve([(b"range", b"bytes=0-9")], extension=PATH_SEND)
+        self.assertEqual(start["status"], 206)
+        self.assertEqual(body["body"], self.path.read_bytes()[:10])
+
+    def test_requests_zero_copy_cannot_serve_fall_back(self):
+        start, *parts = self.serve([(b"range", b"bytes=0-9,20-29")])
+        self.assertEqual(start["status"], 206)
+        self.assertTrue(all(part["type"] == "http.response.body" for part in parts))
+
+        start, _ = self.serve([(b"range", b"bytes=5000-")])
+        self.assertEqual(start["status"], 416)
+
+        start, body = self.serve([(b"range", b"bytes=0-9"), (b"if-range", b'"stale"')])
+        self.assertEqual(start["status"], 200)
+        self.assertEqual(body["body"], self.path.read_bytes())
+
+        start, body = self.serve([], method="HEAD")
+        self.assertIn((b"content-length", b"4096"), start["headers"])
+        self.assertEqual(body["body"], b"")
+
+    def test_parse_byte_range(self):
+        self.assertEqual(parse_byte_range("bytes=0-", 100), (0, 100))
+        self.assertEqual(parse_byte_range("bytes=10-200", 100), (10, 100))
+        self.assertEqual(parse_byte_range("bytes=-200", 100), (0, 100))
+        for header in ("bytes=100-", "bytes=20-10", "bytes=-0", "bytes=-", "bytes=a-b", "lines=0-1", "bytes=0-1,3-4"):
+            self.assertIsNone(parse_byte_range(header, 100), header)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from app.services.utility.fingerprint import FINGERPRINT_BYTES, band_keys, distance, video_fingerprint
+from app.services.utility.video_probe import probe_video
+
+
+def textured_luma(frames: int, scale: int, seed: int) -> np.ndarray:
+    """Random 12x12 patterns per frame, enlarged ``scale`` times, so copies can be made at other resolutions."""
+    patterns = np.random.default_rng(seed).integers(16, 236, (frames, 12, 12))
+    return np.kron(patterns, np.ones((scale, scale))).astype(np.uint16)
+
+
+class Test_fingerprint(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+
+    def fingerprint(self, name, luma, bit_depth=8):
+        frames, height, width = luma.shape
+        dtype = np.uint8 if bit_depth == 8 else "<u2"
+        chroma = np.full(2 * (height // 2) * (width // 2), 1 << (bit_depth - 1)).astype(dtype).tobytes()
+        path = self.directory / name
+        path.write_bytes(b"".join(frame.astype(dtype).tobytes() + chroma for frame in luma))
+        return video_fingerprint(path, probe_video(path, "yuv", f"{width}x{height}", "420", bit_depth))
+
+    def test_copies_at_other_resolutions_and_depths_match(self):
+        original = self.fingerprint("a.yuv", textured_luma(20, 2, seed=0))
+        larger = self.fingerprint("b.yuv", textured_luma(20, 4, seed=0))
+        ten_bit = self.fingerprint("c.yuv", (textured_luma(20, 2, seed=0) + 2) * 4, bit_depth=10)
+        other = self.fingerprint("d.yuv", textured_luma(20, 2, seed=1))
+
+        self.assertEqual(len(original), FINGERPRINT_BYTES)
+        self.assertEqual(distance(original, larger), 0)
+        self.assertEqual(distance(original, ten_bit), 0)
+        self.assertGreater(distance(original, other), 20)
+
+    def test_short_videos_repeat_frames(self):
+        fingerprint = self.fingerprint("a.yuv", textured_luma(3, 2, seed=0))
+
+        self.assertEqual(len(fingerprint), FINGERPRINT_BYTES)
+        self.assertEqual(len(band_keys(fingerprint)), 64)
+        self.assertEqual(fingerprint[:8], fingerprint[8:16])
+
+
+if __name__ == '__main__':
+    unittest.main()
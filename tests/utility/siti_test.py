@@ -0,0 +1,46 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from app.services.utility.siti import siti_frames, summarize_siti
+from app.services.utility.video_probe import probe_video
+
+
+class Test_siti(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        rng = np.random.default_rng(1)
+        self.luma = rng.integers(0, 256, (7, 12, 20), dtype=np.uint8)
+        chroma = np.full(2 * 6 * 10, 128, dtype=np.uint8).tobytes()
+        self.path = Path(directory.name) / "a.yuv"
+        self.path.write_bytes(b"".join(frame.tobytes() + chroma for frame in self.luma))
+        self.layout = probe_video(self.path, "yuv", "20x12", "420", 8)
+
+    def test_matches_p910_definition(self):
+        siti = siti_frames(self.path, self.layout, range(7))
+
+        expected_si = []
+        for frame in self.luma.astype(np.float32):
+            gx = cv2.Sobel(frame, cv2.CV_32F, 1, 0)[1:-1, 1:-1]
+            gy = cv2.Sobel(frame, cv2.CV_32F, 0, 1)[1:-1, 1:-1]
+            expected_si.append(np.hypot(gx, gy).std())
+        expected_ti = np.diff(self.luma.astype(np.float32), axis=0).std(axis=(1, 2))
+
+        np.testing.assert_allclose(siti["si"], expected_si, rtol=1e-4)
+        np.testing.assert_allclose(siti["ti"], expected_ti, rtol=1e-4)
+        self.assertEqual(summarize_siti(siti)["tiMax"], max(siti["ti"]))
+
+    def test_chunks_join_up(self):
+        whole = siti_frames(self.path, self.layout, range(7))
+        chunks = [siti_frames(self.path, self.layout, frames) for frames in (range(0, 1), range(1, 5), range(5, 7))]
+
+        self.assertEqual([v for chunk in chunks for v in chunk["si"]], whole["si"])
+        self.assertEqual([v for chunk in chunks for v in chunk["ti"]], whole["ti"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -11,6 +11,21 @@ def validate_video(db_obj):
         "resolution": str(db_obj.resolution),
         "description": str(db_obj.description),
         "bitDepth": db_obj.bitDepth,
-        "createdDate": str(db_obj.createdDate),
+        "createdDate": db_obj.createdDate,
+        "updatedDate": db_obj.updatedDate,
         "lastUpdatedBy": str(db_obj.lastUpdatedBy),
+        "size": db_obj.size,
+        "sha256": db_obj.sha256,
+        "frameCount": db_obj.frameCount,
+        "chromaFormat": db_obj.chromaFormat,
+        "frameOffset": db_obj.frameOffset,
+        "frameStride": db_obj.frameStride,
+        "analysisStatus": db_obj.analysisStatus,
+        "siMax": db_obj.siMax,
+        "siMean": db_obj.siMean,
+        "tiMax": db_obj.tiMax,
+        "tiMean": db_obj.tiMean,
+        "parentId": db_obj.parentId,
+        "proxyScale": db_obj.proxyScale,
+        "duplicateOf": db_obj.duplicateOf,
     })
@@ -0,0 +1,27 @@
+import numpy as np
+
+
+def make_frames(width=16, height=16, frames=3, bit_depth=8):
+    """Planar 4:2:0 frames whose samples encode the frame number and position, so any frame can be recognised."""
+    dtype = np.uint8 if bit_depth == 8 else np.uint16
+    maximum = (1 << bit_depth) - 1
+    chroma_width, chroma_height = (width + 1) // 2, (height + 1) // 2
+    result = []
+    for n in range(frames):
+        y = (np.add.outer(np.arange(height), np.arange(width)) * 4 + n * 16) % (maximum + 1)
+        u = np.full((chroma_height, chroma_width), (64 + n * 8) % (maximum + 1))
+        v = np.full((chroma_height, chroma_width), (192 - n * 8) % (maximum + 1))
+        result.append(b"".join(plane.astype(dtype).tobytes() for plane in (y, u, v)))
+    return result
+
+
+def make_yuv(width=16, height=16, frames=3, bit_depth=8) -> bytes:
+    return b"".join(make_frames(width, height, frames, bit_depth))
+
+
+def make_y4m(width=16, height=16, frames=3, bit_depth=8, frame_rate="30:1", frame_headers=None) -> bytes:
+    """A 4:2:0 Y4M file; ``frame_headers`` optionally gives the FRAME line of each frame, parameters included."""
+    colorspace = "420jpeg" if bit_depth == 8 else f"420p{bit_depth}"
+    header = f"YUV4MPEG2 W{width} H{height} F{frame_rate} Ip A1:1 C{colorspace}\n".encode()
+    headers = frame_headers or [b"FRAME\n"] * frames
+    return header + b"".join(h + f for h, f in zip(headers, make_frames(width, height, frames, bit_depth)))
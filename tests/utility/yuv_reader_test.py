@@ -0,0 +1,64 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from app.services.utility.video_probe import probe_video
+from app.services.utility.yuv_reader import YuvReader
+from tests.utility.video_samples import make_frames, make_y4m, make_yuv
+
+
+class Test_yuv_reader(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def write(self, name, content):
+        path = Path(self.directory.name) / name
+        path.write_bytes(content)
+        return path
+
+    def test_frame_planes_are_views(self):
+        path = self.write("a.y4m", make_y4m(width=18, height=10, frames=4))
+        with YuvReader(path, probe_video(path, "y4m")) as reader:
+            y, u, v = reader.frame(3)
+            self.assertEqual((y.shape, u.shape, v.shape), ((10, 18), (5, 9), (5, 9)))
+            self.assertFalse(y.flags.owndata or y.flags.writeable)
+            self.assertEqual(b"".join(p.tobytes() for p in (y, u, v)), make_frames(18, 10, 4)[3])
+            del y, u, v
+
+    def test_ten_bit_samples(self):
+        path = self.write("a.yuv", make_yuv(frames=2, bit_depth=10))
+        with YuvReader(path, probe_video(path, "yuv", "16x16", "420", 10)) as reader:
+            y, _, _ = reader.frame(1)
+            self.assertEqual(y.dtype, np.dtype("<u2"))
+            self.assertEqual(int(y[3, 5]), (3 + 5) * 4 + 16)
+            del y
+
+    def test_batches_match_single_frames(self):
+        for chroma_format, name, content in (("420", "a.y4m", make_y4m(frames=9)),
+                                             ("444", "b.yuv", make_yuv(frames=3) * 2),
+                                             ("422", "c.yuv", make_yuv(frames=8, bit_depth=10))):
+            path = self.write(name, content)
+            layout = probe_video(path, name[-3:], "16x16" if chroma_format != "444" else "8x16", chroma_format,
+                                 10 if name == "c.yuv" else 8)
+            with YuvReader(path, layout) as reader:
+                seen = []
+                for batch, planes in reader.batches(batch_size=2, frames=range(1, len(reader), 2)):
+                    self.assertFalse(planes[0].flags.owndata)
+                    for i, n in enumerate(batch):
+                        for plane, single in zip(planes, reader.frame(n)):
+                            np.testing.assert_array_equal(plane[i], single)
+                    seen.extend(batch)
+                self.assertEqual(seen, list(range(1, len(reader), 2)))
+                del planes, plane, single
+
+    def test_batches_with_irregular_frame_headers(self):
+        headers = [b"FRAME\n", b"FRAME Ib\n", b"FRAME\n"]
+        path = self.write("a.y4m", make_y4m(frames=3, frame_headers=headers))
+        with YuvReader(path, probe_video(path, "y4m")) as reader:
+            (batch, (y, u, v)), = reader.batches(batch_size=4)
+            self.assertEqual(list(batch), [0, 1, 2])
+            np.testing.assert_array_equal(y[1], reader.frame(1)[0])
+            del y, u, v